@@ -0,0 +1,7 @@
+"""
+Local benchmarks for Supplier360 backend components.
+
+Run from the `backend/` directory, e.g.:
+
+    python -m benchmarks.bench_name_index --sizes 1000 100000
+"""
@@ -0,0 +1,66 @@
+"""
+Benchmark: bulk compliance scoring throughput.
+
+    python -m benchmarks.bench_compliance_scores --cert-rows 10000 1000000
+
+Compares the columnar path used by jobs.compliance_scores with calling the
+Lambda's per-supplier score_certificates on the same rows, and checks both
+give the same score for every supplier. Database time is not included; the
+"round trips" columns show what each approach costs against the database
+(bulk: one query per page plus the required set; Lambda: one combined query
+per supplier).
+"""
+
+import argparse
+import time
+from itertools import groupby
+
+from common.compliance import score_certificates
+from jobs.compliance_scores import decode_columns, score_columns
+
+from .synthetic import INDUSTRIES, certificate_rows
+
+
+def _per_supplier(records, required):
+    out = {}
+    for sid, rows in groupby(records, key=lambda r: r[0]["stringValue"]):
+        rows = list(rows)
+        industry = rows[0][1]["stringValue"]
+        latest = {r[2]["stringValue"]: {"valid_status": r[3]["stringValue"]} for r in rows}
+        out[sid] = score_certificates(required[industry], latest)[2]
+    return out
+
+
+def run(cert_rows, page_size):
+    required = {k: sorted(v) for k, v in INDUSTRIES.items()}
+    records = certificate_rows(cert_rows)
+
+    t0 = time.perf_counter()
+    bulk = score_columns(*decode_columns(records), required)
+    bulk_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    single = _per_supplier(records, required)
+    single_s = time.perf_counter() - t0
+
+    mismatches = sum(1 for row in bulk if single[row[0]] != row[2])
+    n = len(bulk)
+    print(
+        f"{cert_rows:>10,} cert rows | {n:>8,} suppliers | "
+        f"bulk {n / bulk_s:>10,.0f} suppliers/s, {-(-n // page_size) + 1:>6,} round trips | "
+        f"per-supplier _score {n / single_s:>10,.0f} suppliers/s, {n:>8,} round trips | "
+        f"mismatches {mismatches}"
+    )
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--cert-rows", type=int, nargs="+", default=[10000, 1000000])
+    ap.add_argument("--page-size", type=int, default=2000)
+    args = ap.parse_args()
+    for n in args.cert_rows:
+        run(n, args.page_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Benchmark: the compliance, deduplication and performance Lambdas end to end
+against a local Postgres.
+
+    python -m benchmarks.bench_lambdas --dsn postgresql://localhost/s360_bench \
+        --suppliers 1000 100000 --orders-per-supplier 10 --calls 500
+
+For every scale the database behind --dsn is wiped (point it at a scratch
+database), db/schema/schema.sql is loaded and synthetic data is bulk-copied
+in (--orders overrides the per-supplier order count, e.g. 10000000). Each
+lambda_handler then runs in-process on the Data API code path, with
+benchmarks.local_db.LocalDataApi standing in for the boto3 "rds-data"
+client. Events mix direct invocations and Bedrock Agent action group events
+(--bedrock-share), over exact, id and misspelled supplier inputs.
+
+Reported per Lambda: the first (cold-container) call, p50/p95/p99 latency of
+the remaining calls, Data API round trips per call, request + response JSON
+per call, and calls that failed (anything but a result or "not found").
+The Lambda response caches are off unless --response-cache is given, so
+every call runs its queries.
+"""
+
+import argparse
+import importlib.util
+import os
+import random
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from common import rds_client
+
+from .local_db import LocalDataApi, load_synthetic, reset_schema
+from .synthetic import query_names, supplier_records
+
+LAMBDAS_DIR = os.path.join(os.path.dirname(__file__), "..", "lambdas")
+
+
+def _compliance(rng, sid, name, fuzzy):
+    pick = rng.random()
+    if pick < 0.6:
+        return {"supplier_name": name}
+    if pick < 0.8:
+        return {"supplier_id": sid}
+    return {"supplier_name": fuzzy}
+
+
+def _deduplication(rng, sid, name, fuzzy):
+    return {"supplier_name": fuzzy}
+
+
+def _performance(rng, sid, name, fuzzy):
+    return {"supplier_name": name if rng.random() < 0.8 else fuzzy}
+
+
+# Lambda -> (action group, apiPath, request parameters for one call)
+EVENTS: Dict[str, Tuple[str, str, Callable]] = {
+    "compliance": ("compliance", "/compliance", _compliance),
+    "deduplication": ("deduplication", "/deduplication", _deduplication),
+    "performance": ("performance", "/performance", _performance),
+}
+
+
+def bedrock_event(action_group: str, api_path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "messageVersion": "1.0",
+        "agent": {"name": "Supplier360Agent", "version": "DRAFT"},
+        "sessionId": "bench",
+        "actionGroup": action_group,
+        "apiPath": api_path,
+        "httpMethod": "GET",
+        "parameters": [{"name": k, "type": "string", "value": v} for k, v in params.items()],
+    }
+
+
+def build_events(name: str, records: List[Tuple[str, str]], calls: int,
+                 bedrock_share: float, seed: int) -> List[Dict[str, Any]]:
+    action_group, api_path, make = EVENTS[name]
+    rng = random.Random(seed)
+    fuzzy = query_names(records, calls, seed)
+    events = []
+    for i in range(calls):
+        sid, sname = rng.choice(records)
+        params = make(rng, sid, sname, fuzzy[i])
+        events.append(bedrock_event(action_group, api_path, params)
+                      if rng.random() < bedrock_share else params)
+    return events
+
+
+def load_lambda(name: str):
+    """
+    A fresh copy of lambdas/<name>/lambda_function.py (cold module state).
+    """
+    path = os.path.join(LAMBDAS_DIR, name, "lambda_function.py")
+    spec = importlib.util.spec_from_file_location(f"bench_{name}_lambda", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _failed(resp: Dict[str, Any]) -> bool:
+    if "response" in resp:
+        return resp["response"]["httpStatusCode"] not in (200, 404)
+    error = resp.get("error")
+    return bool(error) and error != "Supplier not found"
+
+
+def _percentiles(values: List[float]) -> Tuple[float, float, float]:
+    if len(values) < 2:
+        v = values[0] if values else 0.0
+        return v, v, v
+    q = statistics.quantiles(values, n=100, method="inclusive")
+    return q[49], q[94], q[98]
+
+
+def bench_lambda(name: str, events: List[Dict[str, Any]], api: LocalDataApi) -> Dict[str, Any]:
+    module = load_lambda(name)
+    latencies, trips, kbytes = [], [], []
+    failed = 0
+    for event in events:
+        api.reset_counters()
+        t0 = time.perf_counter()
+        resp = module.lambda_handler(event, None)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        trips.append(api.round_trips)
+        kbytes.append((api.bytes_sent + api.bytes_received) / 1024)
+        failed += _failed(resp)
+
+    p50, p95, p99 = _percentiles(latencies[1:])
+    return {
+        "cold_ms": latencies[0],
+        "p50_ms": p50,
+        "p95_ms": p95,
+        "p99_ms": p99,
+        "round_trips": statistics.mean(trips),
+        "kb": statistics.mean(kbytes),
+        "failed": failed,
+    }
+
+
+def run(dsn, suppliers, orders, lambdas, calls, bedrock_share, seed, load=True):
+    api = LocalDataApi(dsn)
+    if load:
+        t0 = time.perf_counter()
+        with api.backend.pool.connection() as conn:
+            reset_schema(conn)
+            counts = load_synthetic(conn, suppliers, orders, seed)
+        print(
+            f"loaded {counts['supplier_master']:,} suppliers, "
+            f"{counts['compliance_certificates']:,} certificates, "
+            f"{counts['supplier_performance_history']:,} orders "
+            f"in {time.perf_counter() - t0:.1f}s"
+        )
+    rds_client.set_backend(rds_client.DataApiBackend(client=api))
+
+    records = supplier_records(suppliers, seed)
+    for name in lambdas:
+        r = bench_lambda(name, build_events(name, records, calls, bedrock_share, seed), api)
+        print(
+            f"{suppliers:>9,} suppliers {orders:>11,} orders | {name:<13} | "
+            f"cold {r['cold_ms']:8.1f} ms | p50 {r['p50_ms']:7.2f} p95 {r['p95_ms']:7.2f} "
+            f"p99 {r['p99_ms']:7.2f} ms | {r['round_trips']:5.2f} round trips/call | "
+            f"{r['kb']:8.2f} KB/call | failed {r['failed']}"
+        )
+    api.backend.pool.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--dsn", default=os.getenv("DB_DSN"), help="scratch Postgres database (default: DB_DSN)")
+    ap.add_argument("--suppliers", type=int, nargs="+", default=[1000, 100000])
+    ap.add_argument("--orders-per-supplier", type=int, default=10)
+    ap.add_argument("--orders", type=int, help="total orders (overrides --orders-per-supplier)")
+    ap.add_argument("--lambdas", nargs="+", choices=list(EVENTS), default=list(EVENTS))
+    ap.add_argument("--calls", type=int, default=300, help="calls per Lambda and scale")
+    ap.add_argument("--bedrock-share", type=float, default=0.5,
+                    help="fraction of calls sent as Bedrock action group events")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--response-cache", action="store_true",
+                    help="keep the Lambda response caches (common.response_cache) on")
+    ap.add_argument("--no-load", action="store_true",
+                    help="reuse the data already loaded for the (single) --suppliers scale")
+    args = ap.parse_args()
+
+    if not args.dsn:
+        ap.error("--dsn or DB_DSN is required")
+    if args.no_load and len(args.suppliers) != 1:
+        ap.error("--no-load takes a single --suppliers value")
+
+    # The Lambdas log every event at INFO; keep that out of the timings.
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ["RESPONSE_CACHE"] = "true" if args.response_cache else "false"
+
+    for n in args.suppliers:
+        orders = args.orders if args.orders is not None else n * args.orders_per_supplier
+        run(args.dsn, n, orders, args.lambdas, args.calls, args.bedrock_share, args.seed,
+            load=not args.no_load)
+
+
+if __name__ == "__main__":
+    main()
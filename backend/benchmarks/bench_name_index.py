@@ -0,0 +1,73 @@
+"""
+Benchmark: trigram NameIndex vs. the original full difflib scan.
+
+    python -m benchmarks.bench_name_index --sizes 1000 100000 1000000
+
+For every size it reports index build time, mean per-lookup latency of both
+paths and how often they agree on the deduplication decision.
+"""
+
+import argparse
+import time
+from difflib import SequenceMatcher, get_close_matches
+
+from common.name_index import NameIndex
+
+from .synthetic import query_names, supplier_records
+
+
+def _similarity(query, best):
+    return int(SequenceMatcher(None, query, best).ratio() * 100) if best else 0
+
+
+def run(size, queries, difflib_queries):
+    records = supplier_records(size)
+    names = [name for _, name in records]
+    inputs = query_names(records, queries)
+
+    t0 = time.perf_counter()
+    index = NameIndex.from_records(records)
+    build_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    indexed = [index.best_match(q, cutoff=0.5) for q in inputs]
+    index_ms = (time.perf_counter() - t0) * 1000 / len(inputs)
+
+    sample = inputs[:difflib_queries]
+    t0 = time.perf_counter()
+    scanned = []
+    for q in sample:
+        m = get_close_matches(q, names, n=1, cutoff=0.5)
+        scanned.append(m[0] if m else None)
+    scan_ms = (time.perf_counter() - t0) * 1000 / max(1, len(sample))
+
+    same_decision = sum(
+        (_similarity(q, a) >= 90) == (_similarity(q, b) >= 90)
+        for q, a, b in zip(sample, indexed, scanned)
+    )
+    same_score = sum(
+        _similarity(q, a) == _similarity(q, b)
+        for q, a, b in zip(sample, indexed, scanned)
+    )
+
+    print(
+        f"{size:>9,} | build {build_s:8.2f}s | index {index_ms:8.3f} ms/q | "
+        f"difflib {scan_ms:10.3f} ms/q | speedup {scan_ms / max(index_ms, 1e-9):8.1f}x | "
+        f"same decision {same_decision}/{len(sample)} | same score {same_score}/{len(sample)}"
+    )
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    ap.add_argument("--queries", type=int, default=200, help="lookups per size for the index")
+    ap.add_argument("--difflib-queries", type=int, default=20,
+                    help="lookups per size for the full scan (slow at 1M)")
+    args = ap.parse_args()
+
+    for size in args.sizes:
+        run(size, args.queries, args.difflib_queries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark: scoring a large SQL_SUPPLIER_HISTORY result set.
+
+    python -m benchmarks.bench_performance_scores --rows 1000 100000
+
+Times common.performance.compute_scores (columnar decoding, see
+common.columnar) against the previous row-at-a-time loop on the same Data
+API records, plus the formattedRecords path (json.loads included), and
+checks all three give identical results. Database time is not included.
+"peak" is the extra memory a path allocates on top of the result set
+(tracemalloc, measured in a separate untimed run).
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from common.columnar import decode_formatted
+from common.performance import HISTORY_COLUMNS, HISTORY_NAMES, compute_scores, scores_from_columns
+from common.rds_client import cell_value
+
+from .synthetic import history_records
+
+
+def _compute_scores_rows(rows):
+    # compute_scores before the columnar rewrite
+    if not rows:
+        return compute_scores([])
+
+    delivery_scores, quality_scores, invoice_scores, notes_list = [], [], [], []
+    for r in rows:
+        on_time = r[0].get("booleanValue") if r[0] else None
+        delay_days = int(r[1].get("longValue", 0)) if r[1] else 0
+        quality_pct = float(r[2].get("doubleValue") or r[2].get("stringValue"))
+        invoice_pct = float(r[3].get("doubleValue") or r[3].get("stringValue"))
+        notes = r[5]["stringValue"] if r[5] else ""
+        if notes:
+            notes_list.append(notes)
+        if on_time:
+            delivery_scores.append(100)
+        else:
+            delivery_scores.append(max(0, 100 - min(delay_days * 5, 100)))
+        quality_scores.append(quality_pct)
+        invoice_scores.append(invoice_pct)
+
+    avg_del = sum(delivery_scores) / len(delivery_scores)
+    avg_qual = sum(quality_scores) / len(quality_scores)
+    avg_inv = sum(invoice_scores) / len(invoice_scores)
+    final = avg_del * 0.40 + avg_qual * 0.35 + avg_inv * 0.25
+    return {
+        "delivery_score": round(avg_del, 2),
+        "quality_score": round(avg_qual, 2),
+        "invoice_score": round(avg_inv, 2),
+        "performance_score": round(final, 2),
+        "notes": notes_list
+    }
+
+
+def _score_formatted(formatted):
+    on_time, delay, quality, invoice, _, notes = decode_formatted(formatted, HISTORY_NAMES, HISTORY_COLUMNS)
+    return scores_from_columns(on_time, delay, quality, invoice, notes)
+
+
+def _best(fn, arg, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(arg)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def _peak_mb(fn, arg):
+    tracemalloc.start()
+    try:
+        fn(arg)
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def run(rows, repeat):
+    records = history_records(rows)
+    formatted = json.dumps([
+        {name: cell_value(cell) for name, cell in zip(HISTORY_NAMES, r)} for r in records
+    ])
+
+    rows_s, expected = _best(_compute_scores_rows, records, repeat)
+    cols_s, columnar = _best(compute_scores, records, repeat)
+    json_s, from_json = _best(_score_formatted, formatted, repeat)
+
+    print(
+        f"{rows:>10,} rows | row loop {rows / rows_s:>12,.0f} rows/s, "
+        f"peak {_peak_mb(_compute_scores_rows, records):>7.1f} MB | "
+        f"columnar {rows / cols_s:>12,.0f} rows/s ({rows_s / cols_s:.1f}x), "
+        f"peak {_peak_mb(compute_scores, records):>7.1f} MB | "
+        f"formattedRecords {rows / json_s:>12,.0f} rows/s | "
+        f"identical {columnar == expected and from_json == expected}"
+    )
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rows", type=int, nargs="+", default=[1000, 100000])
+    ap.add_argument("--repeat", type=int, default=5, help="runs per path; the fastest counts")
+    args = ap.parse_args()
+    for n in args.rows:
+        run(n, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Benchmark: the portfolio risk ranking Lambda against a local Postgres.
+
+    python -m benchmarks.bench_portfolio --dsn postgresql://localhost/s360_bench \
+        --suppliers 1000 100000 --calls 200
+
+For every scale the database behind --dsn is wiped (point it at a scratch
+database) and loaded with synthetic data as in bench_lambdas. The duplicate
+clusters (jobs.dedup_clusters, skipped with --no-clusters) and every
+supplier_scorecard row (jobs.refresh_scorecards --full) are then built by
+the production jobs on the psycopg backend, so the ranked scores come from
+the real scoring code.
+
+Each ranking below runs through lambda_handler in-process on the Data API
+code path (benchmarks.local_db.LocalDataApi). Reported per ranking: p50 /
+p95 / max latency of the whole call, the database time of the page
+statement alone (p50) and Data API round trips per call. First pages also
+run the total count; "deep page" starts from the cursor of page --depth.
+"""
+
+import argparse
+import os
+import statistics
+import time
+from typing import Any, Dict, Optional
+
+from common import rds_client
+from jobs import dedup_clusters, refresh_scorecards
+
+from .bench_lambdas import _percentiles, load_lambda
+from .local_db import LocalDataApi, load_synthetic, reset_schema
+from .synthetic import INDUSTRIES
+
+# label -> direct invocation event
+RANKINGS: Dict[str, Dict[str, Any]] = {
+    "trust_score": {"rank_by": "trust_score"},
+    "trust_score deep page": {"rank_by": "trust_score"},
+    "trust_score industry": {"rank_by": "trust_score", "industry": sorted(INDUSTRIES)[0]},
+    "delivery_score": {"rank_by": "delivery_score"},
+    "data_integrity_score": {"rank_by": "data_integrity_score"},
+    "duplicate_count": {"rank_by": "duplicate_count"},
+}
+
+
+def deep_cursor(module, event: Dict[str, Any], depth: int) -> Optional[str]:
+    """
+    The cursor after `depth` pages of `event`'s ranking.
+    """
+    cursor = None
+    for _ in range(depth):
+        resp = module.lambda_handler(dict(event, cursor=cursor), None)
+        cursor = resp.get("next_cursor")
+        if cursor is None:
+            break
+    return cursor
+
+
+def bench_ranking(module, event: Dict[str, Any], api: LocalDataApi, calls: int) -> Dict[str, Any]:
+    latencies, page_ms, trips = [], [], []
+    failed = 0
+    for _ in range(calls):
+        api.reset_counters()
+        t0 = time.perf_counter()
+        resp = module.lambda_handler(event, None)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        trips.append(api.round_trips)
+        page_ms.append(api.page_seconds * 1000)
+        failed += "error" in resp
+
+    p50, p95, _ = _percentiles(latencies)
+    return {
+        "p50_ms": p50,
+        "p95_ms": p95,
+        "max_ms": max(latencies),
+        "page_ms": statistics.median(page_ms),
+        "round_trips": statistics.mean(trips),
+        "failed": failed,
+    }
+
+
+class _PageTimingApi(LocalDataApi):
+    """
+    LocalDataApi that also records the time of the first statement of each
+    call (the ranking page; the total count follows it).
+    """
+
+    def reset_counters(self) -> None:
+        super().reset_counters()
+        self.page_seconds = None
+
+    def _count(self, request, response, seconds):
+        super()._count(request, response, seconds)
+        if self.page_seconds is None:
+            self.page_seconds = seconds
+
+
+def run(dsn, suppliers, orders, calls, depth, workers, clusters, seed):
+    api = _PageTimingApi(dsn, max_size=max(4, workers))
+    t0 = time.perf_counter()
+    with api.backend.pool.connection() as conn:
+        reset_schema(conn)
+        load_synthetic(conn, suppliers, orders, seed)
+    # The jobs write in transactions, which LocalDataApi does not offer.
+    rds_client.set_backend(api.backend)
+    if clusters:
+        dedup_clusters.refresh_db(rds_client.exec_sql, workers)
+    refreshed = refresh_scorecards.refresh(rds_client.exec_sql, full=True, workers=workers)
+    with api.backend.pool.connection() as conn:
+        conn.execute("ANALYZE supplier_scorecard")
+    print(f"loaded {suppliers:,} suppliers, {refreshed:,} scorecards in {time.perf_counter() - t0:.1f}s")
+    rds_client.set_backend(rds_client.DataApiBackend(client=api))
+
+    module = load_lambda("portfolio")
+    for label, event in RANKINGS.items():
+        if label.endswith("deep page"):
+            event = dict(event, cursor=deep_cursor(module, event, depth))
+        r = bench_ranking(module, event, api, calls)
+        print(
+            f"{suppliers:>9,} suppliers | {label:<22} | p50 {r['p50_ms']:7.2f} p95 {r['p95_ms']:7.2f} "
+            f"max {r['max_ms']:7.2f} ms | page statement {r['page_ms']:7.2f} ms | "
+            f"{r['round_trips']:4.2f} round trips/call | failed {r['failed']}"
+        )
+    api.backend.pool.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--dsn", default=os.getenv("DB_DSN"), help="scratch Postgres database (default: DB_DSN)")
+    ap.add_argument("--suppliers", type=int, nargs="+", default=[1000, 100000])
+    ap.add_argument("--orders-per-supplier", type=int, default=10)
+    ap.add_argument("--calls", type=int, default=200, help="calls per ranking and scale")
+    ap.add_argument("--depth", type=int, default=20, help="pages skipped for the deep page ranking")
+    ap.add_argument("--workers", type=int, default=8, help="scorecard refresh / clustering workers")
+    ap.add_argument("--no-clusters", action="store_true",
+                    help="skip jobs.dedup_clusters (every supplier ranks with integrity 100)")
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    if not args.dsn:
+        ap.error("--dsn or DB_DSN is required")
+
+    # The Lambda logs every event at INFO; keep that out of the timings.
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    for n in args.suppliers:
+        run(args.dsn, n, n * args.orders_per_supplier, args.calls, args.depth,
+            args.workers, not args.no_clusters, args.seed)
+
+
+if __name__ == "__main__":
+    main()
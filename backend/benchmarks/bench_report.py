@@ -0,0 +1,102 @@
+"""
+Benchmark: rendered report sections vs the prompt-only report.
+
+    python -m benchmarks.bench_report --suppliers 200
+
+Builds trust-score results for synthetic suppliers (duplicate check against
+a synthetic name index, compliance and performance scoring as in the
+Lambdas) and renders their report data sections with common.report.
+
+Prompt-only, the model writes all seven sections, including the four data
+sections with their arithmetic and table. Rendered, it writes only the
+narrative (Executive Summary, Recommendations, Helpful Links). The
+difference in output tokens is what the renderer takes off the model;
+generation time is estimated from --output-tps. Token counts are
+approximate (words and punctuation marks, not the model's tokenizer), and
+the narrative length is an assumption (--narrative-tokens). The rendered
+report also adds its tokens to the trust_score result the model reads.
+"""
+
+import argparse
+import random
+import re
+import statistics
+import time
+
+from common.compliance import compliance_body
+from common.dedup import duplicate_check
+from common.name_index import NameIndex
+from common.performance import compute_scores, performance_body
+from common.report import render_report
+
+from .synthetic import INDUSTRIES, STATUSES, history_records, query_names, supplier_records
+
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+
+def approx_tokens(text: str) -> int:
+    return len(_TOKEN.findall(text))
+
+
+def build_results(suppliers: int, orders: int, seed: int = 5):
+    """
+    (dedup, certification, operational) per synthetic supplier.
+    """
+    rng = random.Random(seed)
+    records = supplier_records(max(suppliers * 10, 1000))
+    index = NameIndex.from_records(records)
+    industries = sorted(INDUSTRIES)
+    results = []
+    for i, name in enumerate(query_names(records, suppliers)):
+        sid, sname = records[i]
+        industry = industries[i % len(industries)]
+        required = sorted(INDUSTRIES[industry])
+        latest = {
+            t: {"valid_status": rng.choice(STATUSES), "expiry_date": "2026-01-31"}
+            for t in required if rng.random() < 0.85
+        }
+        results.append((
+            duplicate_check(name, index),
+            compliance_body(sid, sname, industry, required, latest),
+            performance_body(sid, sname, compute_scores(history_records(orders, seed=i))),
+        ))
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--suppliers", type=int, default=200)
+    ap.add_argument("--orders", type=int, default=40, help="performance history rows per supplier")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--narrative-tokens", type=int, default=300,
+                    help="assumed length of the model-written narrative sections")
+    ap.add_argument("--output-tps", type=float, default=50.0,
+                    help="assumed model output tokens per second")
+    args = ap.parse_args()
+
+    results = build_results(args.suppliers, args.orders)
+
+    best = None
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        reports = [render_report(*r) for r in results]
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+
+    section_tokens = [approx_tokens(r) for r in reports]
+    data_tokens = statistics.mean(section_tokens)
+    prompt_only = data_tokens + args.narrative_tokens
+    rendered = args.narrative_tokens
+    saved_s = (prompt_only - rendered) / args.output_tps
+
+    print(f"{len(reports)} reports | render {best / len(reports) * 1e6:,.0f} us/report")
+    print(f"data sections: {data_tokens:,.0f} tokens avg (min {min(section_tokens)}, max {max(section_tokens)})")
+    print(
+        f"output tokens per report: prompt-only {prompt_only:,.0f}, rendered {rendered:,.0f} "
+        f"({1 - rendered / prompt_only:.0%} fewer) | "
+        f"est. generation time saved {saved_s:.1f} s at {args.output_tps:.0f} tokens/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
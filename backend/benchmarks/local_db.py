@@ -0,0 +1,145 @@
+"""
+Local Postgres stand-in for Aurora, used by the Lambda benchmarks.
+
+- reset_schema / load_synthetic build a scratch database from
+  db/schema/schema.sql and the generators in benchmarks.synthetic.
+- LocalDataApi replaces the boto3 "rds-data" client: it runs statements on
+  the local database through common.rds_client.PsycopgBackend and returns
+  Data API shaped responses, counting round trips and the JSON bytes that
+  would have crossed the wire.
+
+Requires `psycopg` and `psycopg_pool`. The schema uses PL/pgSQL, JSONB and
+generated columns, so SQLite cannot stand in for it.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from common.rds_client import Param, PsycopgBackend
+
+from . import synthetic
+
+SCHEMA_SQL = os.path.join(os.path.dirname(__file__), "..", "..", "db", "schema", "schema.sql")
+
+# Bulk-loaded tables and their COPY column lists.
+_COLUMNS = {
+    "required_certificates_master": (
+        "requirement_id", "industry", "required_certificate_type", "description",
+    ),
+    "supplier_master": (
+        "supplier_id", "supplier_name", "registration_number", "country", "industry",
+        "annual_revenue", "employees", "onboarding_date",
+    ),
+    "compliance_certificates": (
+        "certificate_id", "supplier_id", "certificate_type", "certificate_number",
+        "issuing_body", "issue_date", "expiry_date", "valid_status", "required", "notes",
+    ),
+    "supplier_performance_history": (
+        "order_id", "supplier_id", "order_date", "promised_delivery_date",
+        "actual_delivery_date", "on_time", "delivery_delay_days",
+        "quality_compliance_pct", "invoice_match_pct", "incidents", "notes",
+    ),
+}
+
+
+def reset_schema(conn) -> None:
+    """
+    Drop everything in the public schema and load db/schema/schema.sql.
+    """
+    conn.execute("DROP SCHEMA public CASCADE")
+    conn.execute("CREATE SCHEMA public")
+    with open(SCHEMA_SQL, encoding="utf-8") as f:
+        conn.execute(f.read())
+
+
+def _copy(conn, table: str, rows) -> int:
+    count = 0
+    with conn.cursor() as cur:
+        with cur.copy(f"COPY {table} ({', '.join(_COLUMNS[table])}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+                count += 1
+    return count
+
+
+def load_synthetic(conn, suppliers: int, orders: int, seed: int = 42) -> Dict[str, int]:
+    """
+    Bulk-load synthetic data into a freshly reset schema and return the row
+    count per table. Row triggers are disabled during the load; the
+    performance buckets are rebuilt in one pass afterwards and
+    supplier_scorecard is left empty, so every Lambda call takes the live
+    query path.
+    """
+    tables = list(_COLUMNS)
+    for table in tables:
+        conn.execute(f"ALTER TABLE {table} DISABLE TRIGGER USER")
+    try:
+        counts = {
+            "required_certificates_master": _copy(
+                conn, "required_certificates_master", synthetic.required_certificate_rows()),
+            "supplier_master": _copy(
+                conn, "supplier_master", synthetic.supplier_master_rows(suppliers, seed)),
+            "compliance_certificates": _copy(
+                conn, "compliance_certificates", synthetic.compliance_certificate_rows(suppliers)),
+            "supplier_performance_history": _copy(
+                conn, "supplier_performance_history",
+                synthetic.performance_history_rows(suppliers, orders)),
+        }
+    finally:
+        for table in tables:
+            conn.execute(f"ALTER TABLE {table} ENABLE TRIGGER USER")
+    conn.execute("SELECT rebuild_performance_buckets()")
+    conn.execute("ANALYZE")
+    return counts
+
+
+class LocalDataApi:
+    """
+    Drop-in for the boto3 "rds-data" client backed by a local Postgres.
+
+    Pass it to common.rds_client.DataApiBackend(client=...). Counters are
+    cumulative; call reset_counters() between measurements.
+    """
+
+    def __init__(self, dsn: str, max_size: int = 4):
+        self.backend = PsycopgBackend(dsn, min_size=1, max_size=max_size)
+        self._lock = threading.Lock()
+        self.reset_counters()
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.round_trips = 0
+            self.bytes_sent = 0
+            self.bytes_received = 0
+            self.db_seconds = 0.0
+
+    def _count(self, request: Dict[str, Any], response: Dict[str, Any], seconds: float) -> None:
+        sent = len(json.dumps(request, default=str))
+        received = len(json.dumps(response, default=str))
+        with self._lock:
+            self.round_trips += 1
+            self.bytes_sent += sent
+            self.bytes_received += received
+            self.db_seconds += seconds
+
+    def execute_statement(self, sql: str, parameters: Optional[List[Param]] = None,
+                          formatRecordsAs: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        params = parameters or []
+        start = time.perf_counter()
+        if formatRecordsAs == "JSON":
+            response = {"formattedRecords": json.dumps(self.backend.query_dicts(sql, params))}
+        else:
+            response = self.backend.execute(sql, params, **kwargs)
+        self._count({"sql": sql, "parameters": params}, response, time.perf_counter() - start)
+        return response
+
+    def batch_execute_statement(self, sql: str, parameterSets: List[List[Param]],
+                                **kwargs) -> Dict[str, Any]:
+        start = time.perf_counter()
+        response = self.backend.batch_execute(sql, parameterSets)
+        self._count({"sql": sql, "parameterSets": parameterSets}, response,
+                    time.perf_counter() - start)
+        return response
@@ -0,0 +1,242 @@
+"""
+Synthetic supplier data generators used by the benchmarks.
+
+Everything is driven by a seeded `random.Random`, so runs at the same scale
+are reproducible.
+"""
+
+import datetime
+import random
+from typing import Iterator, List, Optional, Tuple
+
+_PREFIXES = [
+    "Acme", "Global", "United", "Pacific", "Atlantic", "Northern", "Southern",
+    "Summit", "Pioneer", "Apex", "Vertex", "Sterling", "Precision", "Allied",
+    "Continental", "Dynamic", "Premier", "Integrated", "Advanced", "National",
+    "Eastern", "Western", "Liberty", "Horizon", "Quantum", "Titan", "Crown",
+]
+_CORES = [
+    "Motor", "Steel", "Chemical", "Aerospace", "Electronics", "Semiconductor",
+    "Logistics", "Plastics", "Textile", "Foods", "Pharma", "Energy", "Metals",
+    "Components", "Systems", "Materials", "Machinery", "Packaging", "Optics",
+    "Polymers", "Devices", "Instruments", "Robotics", "Coatings", "Glass",
+]
+_SUFFIXES = [
+    "Inc.", "Corporation", "Company", "Co.", "Group", "Holdings", "Ltd",
+    "LLC", "SE", "AG", "GmbH", "PLC", "Industries", "International", "",
+]
+_SYLLABLES = ["ka", "to", "ri", "mo", "zen", "vel", "tra", "lon", "qu", "dex",
+              "sa", "ni", "bor", "ex", "ul", "pha", "cor", "vin", "ta", "gro"]
+
+
+def _brand(rng: random.Random) -> str:
+    return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+
+def supplier_name(rng: random.Random) -> str:
+    parts = [rng.choice(_PREFIXES) if rng.random() < 0.5 else _brand(rng), rng.choice(_CORES)]
+    suffix = rng.choice(_SUFFIXES)
+    if suffix:
+        parts.append(suffix)
+    return " ".join(parts)
+
+
+def supplier_id(i: int) -> str:
+    return f"S{i:011X}"
+
+
+def supplier_records(n: int, seed: int = 42) -> List[Tuple[str, str]]:
+    """
+    `n` (supplier_id, supplier_name) pairs, roughly the shape of supplier_master.
+    """
+    rng = random.Random(seed)
+    return [(supplier_id(i), supplier_name(rng)) for i in range(n)]
+
+
+def perturb(name: str, rng: random.Random) -> str:
+    """
+    A near-duplicate spelling of `name`: a typo, a dropped suffix or a case change.
+    """
+    choice = rng.random()
+    if choice < 0.4 and len(name) > 4:
+        i = rng.randrange(1, len(name) - 1)
+        return name[:i] + name[i + 1:]
+    if choice < 0.7 and " " in name:
+        return name.rsplit(" ", 1)[0]
+    if choice < 0.85:
+        return name.upper()
+    return name + " Inc"
+
+
+def query_names(records: List[Tuple[str, str]], n: int, seed: int = 7) -> List[str]:
+    """
+    Lookup inputs: mostly perturbed existing names plus some unseen ones.
+    """
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        if records and rng.random() < 0.8:
+            out.append(perturb(rng.choice(records)[1], rng))
+        else:
+            out.append(supplier_name(rng))
+    return out
+
+
+INDUSTRIES = {
+    "Automotive": ["IATF 16949", "ISO 14001", "ISO 45001", "ISO 9001"],
+    "Aerospace & Defense": ["AS9100", "ISO 14001", "ITAR", "NADCAP"],
+    "Electronics & Semiconductors": ["IPC-A-610", "ISO 14001", "ISO 9001", "RoHS"],
+    "Chemicals": ["ISO 14001", "ISO 45001", "REACH", "Responsible Care"],
+    "Consumer Goods": ["FSC", "ISO 22000", "ISO 9001", "SA8000"],
+}
+STATUSES = ["Valid", "Valid", "Valid", "Pending", "Expired"]
+
+
+def certificate_rows(cert_rows: int, certs_per_supplier: int = 4, seed: int = 11):
+    """
+    Rows shaped like the bulk compliance page query: supplier_id, industry,
+    certificate_type, valid_status as Data API cells, sorted by supplier_id.
+    Some required certificates are left out so suppliers have Missing ones.
+    """
+    rng = random.Random(seed)
+    industries = list(INDUSTRIES)
+    records = []
+    i = 0
+    while len(records) < cert_rows:
+        sid = supplier_id(i)
+        industry = industries[i % len(industries)]
+        types = INDUSTRIES[industry] + ["ISO 27001", "ISO 50001"]
+        for ctype in rng.sample(types, min(certs_per_supplier, len(types))):
+            records.append([
+                {"stringValue": sid},
+                {"stringValue": industry},
+                {"stringValue": ctype},
+                {"stringValue": rng.choice(STATUSES)},
+            ])
+        i += 1
+    return records[:cert_rows]
+
+
+def history_records(orders: int, seed: int = 17):
+    """
+    `orders` rows of one supplier shaped like SQL_SUPPLIER_HISTORY as Data
+    API cells (NUMERIC percentages arrive as stringValue).
+    """
+    records = []
+    for row in performance_history_rows(1, orders, seed):
+        records.append([
+            {"booleanValue": row[5]},
+            {"longValue": row[6]},
+            {"stringValue": f"{row[7]:.2f}"},
+            {"stringValue": f"{row[8]:.2f}"},
+            {"longValue": row[9]},
+            {"stringValue": row[10]},
+        ])
+    return records
+
+
+# Required certificate set per industry, as loaded by db/data/data.sql.
+REQUIRED_CERTIFICATES = {
+    "Automotive": ["IATF 16949", "ISO 9001", "ISO 14001"],
+    "Aerospace & Defense": ["AS9100", "ISO 9001", "ISO 14001"],
+    "Electronics & Semiconductors": ["ISO 9001", "ISO 27001", "RoHS"],
+    "Chemicals": ["ISO 14001", "REACH", "ISO 9001"],
+    "Consumer Goods": ["ISO 9001", "ISO 22000", "HACCP", "GMP"],
+}
+COUNTRIES = ["United States", "Germany", "Japan", "France", "South Korea", "Taiwan",
+             "Switzerland", "Netherlands", "United Kingdom", "India", "Mexico", "Brazil"]
+ORDER_NOTES = ["On time", "Early delivery", "Minor delay", "Carrier delay",
+               "Weather delay", "Customs hold", "Partial shipment", ""]
+
+
+def required_certificate_rows() -> List[Tuple]:
+    """
+    required_certificates_master rows.
+    """
+    rows = []
+    for n, (industry, types) in enumerate(REQUIRED_CERTIFICATES.items(), start=1):
+        for m, ctype in enumerate(types, start=1):
+            rows.append((f"R{n}{m:02d}", industry, ctype, f"{ctype} ({industry})"))
+    return rows
+
+
+def _base36(i: int, width: int) -> str:
+    digits = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    out = ""
+    while i:
+        i, r = divmod(i, 36)
+        out = digits[r] + out
+    return out.rjust(width, "0")
+
+
+def supplier_master_rows(n: int, seed: int = 42) -> Iterator[Tuple]:
+    """
+    supplier_master rows. Names and ids are the same as supplier_records(n, seed).
+    """
+    names = random.Random(seed)
+    rng = random.Random(seed + 1)
+    industries = list(REQUIRED_CERTIFICATES)
+    start = datetime.date(2020, 1, 1)
+    for i in range(n):
+        yield (
+            supplier_id(i),
+            supplier_name(names),
+            _base36(i, 6),
+            rng.choice(COUNTRIES),
+            industries[i % len(industries)],
+            rng.randrange(10 ** 7, 4 * 10 ** 11),
+            rng.randrange(50, 700000),
+            start + datetime.timedelta(days=rng.randrange(2000)),
+        )
+
+
+def compliance_certificate_rows(n: int, seed: int = 13,
+                                today: Optional[datetime.date] = None) -> Iterator[Tuple]:
+    """
+    compliance_certificates rows for suppliers 0..n-1: most required types
+    present (some expired, pending or superseded by a renewal), plus the
+    occasional certificate outside the required set.
+    """
+    rng = random.Random(seed)
+    today = today or datetime.date.today()
+    industries = list(REQUIRED_CERTIFICATES)
+    cert = 0
+    for i in range(n):
+        sid = supplier_id(i)
+        required = REQUIRED_CERTIFICATES[industries[i % len(industries)]]
+        types = [(t, True) for t in required if rng.random() < 0.85]
+        if rng.random() < 0.3:
+            types.append(("ISO 45001", False))
+        for ctype, is_required in types:
+            issue = today - datetime.timedelta(days=rng.randrange(30, 1500))
+            versions = [issue - datetime.timedelta(days=1095), issue] if rng.random() < 0.2 else [issue]
+            for issued in versions:
+                expiry = issued + datetime.timedelta(days=1095)
+                status = "Expired" if expiry < today else ("Pending" if rng.random() < 0.05 else "Valid")
+                cert += 1
+                yield (
+                    f"C{cert:011X}", sid, ctype,
+                    f"{ctype.replace(' ', '')[:10]}-{cert:08X}",
+                    ctype.split()[0], issued, expiry, status, is_required, "",
+                )
+
+
+def performance_history_rows(n: int, orders: int, seed: int = 17,
+                             today: Optional[datetime.date] = None) -> Iterator[Tuple]:
+    """
+    `orders` supplier_performance_history rows spread evenly over suppliers
+    0..n-1, with order dates in the last three years.
+    """
+    rng = random.Random(seed)
+    today = today or datetime.date.today()
+    delays = [-3, -2, -1, 0, 0, 0, 0, 1, 2, 3, 5, 8]
+    for j in range(orders):
+        ordered = today - datetime.timedelta(days=rng.randrange(1, 1095))
+        promised = ordered + datetime.timedelta(days=rng.randrange(14, 31))
+        delay = rng.choice(delays)
+        yield (
+            f"O{j:011X}", supplier_id(j % n), ordered, promised,
+            promised + datetime.timedelta(days=delay), delay <= 0, delay,
+            round(rng.uniform(85, 100), 2), round(rng.uniform(88, 100), 2),
+            1 if rng.random() < 0.05 else 0, rng.choice(ORDER_NOTES),
+        )
@@ -2,16 +2,39 @@
 Common backend utilities for Supplier360.
 
 Currently exposes:
-- RDS Data API helpers (exec_sql, make_param)
+- Database helpers (exec_sql, batch_exec_sql, query, query_dicts,
+  make_param, make_params)
 - Bedrock Agent helpers (from_bedrock_event, bedrock_response)
+
+Submodules are imported on first use of one of these names, so a Lambda
+importing `common.rds_client` does not also load the Bedrock helpers on a
+cold start.
 """
 
-from .rds_client import exec_sql, make_param
-from .bedrock_utils import from_bedrock_event, bedrock_response
+import importlib
+
+_EXPORTS = {
+    "exec_sql": "rds_client",
+    "batch_exec_sql": "rds_client",
+    "query": "rds_client",
+    "query_dicts": "rds_client",
+    "make_param": "rds_client",
+    "make_params": "rds_client",
+    "from_bedrock_event": "bedrock_utils",
+    "bedrock_response": "bedrock_utils",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = [
-    "exec_sql",
-    "make_param",
-    "from_bedrock_event",
-    "bedrock_response",
-]
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
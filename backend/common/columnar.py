@@ -0,0 +1,137 @@
+"""
+Columnar decoding of RDS Data API result sets.
+
+exec_sql returns `records`: one list of typed cells per row. Code that
+aggregates many rows (performance scoring) reads them column by column
+instead: decode_records turns each column into a compact typed array from
+the standard library `array` module, so the scoring loops run over machine
+values with C-level builtins (sum, map, itertools) rather than a dict lookup
+per cell. Each column is one comprehension over the records; transposing
+with zip(*records) is several times slower on large result sets.
+
+    BOOL   array("b")  1 for true, 0 for false and NULL
+    INT    array("q")  NULL = 0
+    FLOAT  array("d")  NULL = NaN; DECIMAL cells arrive as stringValue
+    TEXT   list        NULL = None
+
+A None column type skips the column (decoded as None).
+
+decode_formatted does the same for a `formattedRecords` JSON document
+(formatRecordsAs="JSON").
+"""
+
+import json
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+BOOL = "bool"
+INT = "int"
+FLOAT = "float"
+TEXT = "text"
+
+NAN = float("nan")
+
+Column = Union[array, List[Optional[str]]]
+
+
+# ---------- Data API cells ----------
+def _bool_cells(records, i: int) -> array:
+    return array("b", [r[i].get("booleanValue") is True for r in records])
+
+
+def _int_cells(records, i: int) -> array:
+    return array("q", [r[i].get("longValue", 0) for r in records])
+
+
+def _float_value(cell: Dict[str, Any]) -> float:
+    if "doubleValue" in cell:
+        return cell["doubleValue"]
+    return float(cell.get("stringValue", cell.get("longValue", NAN)))
+
+
+def _float_cells(records, i: int) -> array:
+    # A column's values normally all come back under one key (doubleValue
+    # for double precision, stringValue for NUMERIC, longValue for
+    # integers), so read that key directly. A NaN in the result means NULLs
+    # or mixed keys: decode cell by cell instead.
+    key = next((k for r in records for k in r[i] if k != "isNull"), "doubleValue")
+    if key == "stringValue":
+        values = array("d", map(float, [r[i].get(key, "nan") for r in records]))
+    else:
+        values = array("d", [r[i].get(key, NAN) for r in records])
+    total = sum(values)
+    if total != total:
+        values = array("d", [_float_value(r[i]) for r in records])
+    return values
+
+
+def _text_cells(records, i: int) -> List[Optional[str]]:
+    return [r[i].get("stringValue") for r in records]
+
+
+_FROM_CELLS = {BOOL: _bool_cells, INT: _int_cells, FLOAT: _float_cells, TEXT: _text_cells}
+
+
+# ---------- JSON values ----------
+def _bool_values(values) -> array:
+    return array("b", [v is True for v in values])
+
+
+def _int_values(values) -> array:
+    return array("q", [0 if v is None else int(v) for v in values])
+
+
+def _float_values(values) -> array:
+    return array("d", [NAN if v is None else float(v) for v in values])
+
+
+def _text_values(values) -> List[Optional[str]]:
+    return list(values)
+
+
+_FROM_VALUES = {BOOL: _bool_values, INT: _int_values, FLOAT: _float_values, TEXT: _text_values}
+
+
+def _empty(kind: Optional[str]) -> Optional[Column]:
+    if kind is None:
+        return None
+    return [] if kind == TEXT else array({BOOL: "b", INT: "q", FLOAT: "d"}[kind])
+
+
+def decode_records(records: List[List[Dict[str, Any]]],
+                   types: Sequence[Optional[str]]) -> List[Optional[Column]]:
+    """
+    One column per entry of `types` from Data API records.
+    """
+    if not records:
+        return [_empty(kind) for kind in types]
+    return [
+        None if kind is None else _FROM_CELLS[kind](records, i)
+        for i, kind in enumerate(types)
+    ]
+
+
+def decode_formatted(formatted: Union[str, List[Dict[str, Any]]], names: Sequence[str],
+                     types: Sequence[Optional[str]]) -> List[Optional[Column]]:
+    """
+    One column per (name, type) from a formattedRecords document (or the
+    list it decodes to).
+    """
+    rows = json.loads(formatted or "[]") if isinstance(formatted, str) else formatted
+    return [
+        None if kind is None else _FROM_VALUES[kind]([r.get(name) for r in rows])
+        for name, kind in zip(names, types)
+    ]
+
+
+def decode(resp: Dict[str, Any], types: Sequence[Optional[str]],
+           names: Optional[Sequence[str]] = None) -> List[Optional[Column]]:
+    """
+    Columns of an exec_sql response, whichever of records /
+    formattedRecords it carries (`names` is needed for the latter).
+    """
+    if "formattedRecords" in resp:
+        if names is None:
+            raise ValueError("column names are required to decode formattedRecords")
+        return decode_formatted(resp["formattedRecords"], names, types)
+    return decode_records(resp.get("records", []), types)
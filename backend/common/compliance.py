@@ -0,0 +1,271 @@
+"""
+Compliance lookup and scoring shared by the compliance Lambda and jobs.
+
+Each required certificate has equal weight:
+  - Valid   => full weight
+  - Pending => half weight
+  - Missing / Expired / other => 0
+"""
+
+import json
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from . import metrics
+
+STATUS_WEIGHTS = {"Valid": 1.0, "Pending": 0.5}
+
+# Supplier, required set for its industry and latest cert per type, in one
+# round trip. The two JSON columns decode to exactly what the three-query
+# path builds. Names are resolved to :sid first (common.suppliers).
+SQL_COMPLIANCE_COMBINED = """
+WITH supplier AS (
+  SELECT supplier_id, supplier_name, industry
+  FROM supplier_master
+  WHERE supplier_id = :sid
+),
+ranked AS (
+  SELECT
+    c.certificate_type,
+    c.certificate_number,
+    c.issuing_body,
+    c.issue_date,
+    c.expiry_date,
+    c.valid_status,
+    ROW_NUMBER() OVER (
+      PARTITION BY c.certificate_type
+      ORDER BY COALESCE(c.expiry_date, DATE '9999-12-31') DESC,
+               c.issue_date DESC
+    ) rn
+  FROM compliance_certificates c
+  JOIN supplier s ON s.supplier_id = c.supplier_id
+)
+SELECT
+  s.supplier_id,
+  s.supplier_name,
+  s.industry,
+  COALESCE((
+    SELECT json_agg(r.required_certificate_type ORDER BY r.required_certificate_type)
+    FROM required_certificates_master r
+    WHERE r.industry = s.industry
+  ), '[]'::json)::text AS required_set,
+  COALESCE((
+    SELECT json_agg(json_build_object(
+      'certificate_type',   k.certificate_type,
+      'certificate_number', k.certificate_number,
+      'issuing_body',       k.issuing_body,
+      'issue_date',         k.issue_date,
+      'expiry_date',        k.expiry_date,
+      'valid_status',       k.valid_status
+    ))
+    FROM ranked k
+    WHERE k.rn = 1
+  ), '[]'::json)::text AS latest_certs
+FROM supplier s;
+"""
+
+# SQL_COMPLIANCE_COMBINED as of the end of day :as_of: only certificates
+# issued by then are considered, and valid_status is derived from the
+# certificate's dates with certificate_status_as_of() (schema.sql) instead
+# of the stored status, which goes stale once expiry_date passes. Same
+# ix_certs_supplier_type_latest scan as the current-state query, with
+# certificates issued after :as_of filtered out of it.
+SQL_COMPLIANCE_AS_OF = """
+WITH supplier AS (
+  SELECT supplier_id, supplier_name, industry
+  FROM supplier_master
+  WHERE supplier_id = :sid
+),
+ranked AS (
+  SELECT
+    c.certificate_type,
+    c.certificate_number,
+    c.issuing_body,
+    c.issue_date,
+    c.expiry_date,
+    certificate_status_as_of(c.valid_status, c.expiry_date, CAST(:as_of AS DATE)) AS valid_status,
+    ROW_NUMBER() OVER (
+      PARTITION BY c.certificate_type
+      ORDER BY COALESCE(c.expiry_date, DATE '9999-12-31') DESC,
+               c.issue_date DESC
+    ) rn
+  FROM compliance_certificates c
+  WHERE c.supplier_id = :sid
+    AND c.issue_date <= CAST(:as_of AS DATE)
+)
+SELECT
+  s.supplier_id,
+  s.supplier_name,
+  s.industry,
+  COALESCE((
+    SELECT json_agg(r.required_certificate_type ORDER BY r.required_certificate_type)
+    FROM required_certificates_master r
+    WHERE r.industry = s.industry
+  ), '[]'::json)::text AS required_set,
+  COALESCE((
+    SELECT json_agg(json_build_object(
+      'certificate_type',   k.certificate_type,
+      'certificate_number', k.certificate_number,
+      'issuing_body',       k.issuing_body,
+      'issue_date',         k.issue_date,
+      'expiry_date',        k.expiry_date,
+      'valid_status',       k.valid_status
+    ))
+    FROM ranked k
+    WHERE k.rn = 1
+  ), '[]'::json)::text AS latest_certs
+FROM supplier s;
+"""
+
+# Certificates expiring in the next :days days (today included), read with a
+# range scan on ix_certs_expiry. A certificate is only reported while it is
+# the latest of its type for the supplier (same ordering as
+# SQL_LATEST_CERTS); one that has already been renewed is skipped.
+# :industry = '' and :required_only = false disable those filters.
+SQL_EXPIRING_CERTS = """
+SELECT
+  c.supplier_id,
+  sm.supplier_name,
+  sm.industry,
+  c.certificate_id,
+  c.certificate_type,
+  c.certificate_number,
+  c.issuing_body,
+  c.expiry_date,
+  c.expiry_date - CURRENT_DATE AS days_left,
+  c.valid_status,
+  EXISTS (
+    SELECT 1
+    FROM required_certificates_master r
+    WHERE r.industry = sm.industry
+      AND r.required_certificate_type = c.certificate_type
+  ) AS required
+FROM compliance_certificates c
+JOIN supplier_master sm ON sm.supplier_id = c.supplier_id
+WHERE c.expiry_date >= CURRENT_DATE
+  AND c.expiry_date <= CURRENT_DATE + CAST(:days AS INT)
+  AND (:industry = '' OR sm.industry = :industry)
+  AND NOT EXISTS (
+    SELECT 1
+    FROM compliance_certificates n
+    WHERE n.supplier_id = c.supplier_id
+      AND n.certificate_type = c.certificate_type
+      AND (COALESCE(n.expiry_date, DATE '9999-12-31'), n.issue_date) > (c.expiry_date, c.issue_date)
+  )
+  AND (NOT :required_only OR EXISTS (
+    SELECT 1
+    FROM required_certificates_master r
+    WHERE r.industry = sm.industry
+      AND r.required_certificate_type = c.certificate_type
+  ))
+ORDER BY c.expiry_date, c.supplier_id, c.certificate_type
+LIMIT :limit;
+"""
+
+EXPIRING_FIELDS = (
+    "supplier_id", "supplier_name", "industry", "certificate_id", "certificate_type",
+    "certificate_number", "issuing_body", "expiry_date", "days_left", "valid_status", "required",
+)
+
+
+def score_statuses(statuses: Sequence[Optional[str]]) -> int:
+    """
+    Compliance score from the latest status of each required certificate,
+    in required-set order (None for a missing certificate).
+
+    Accumulates in the same order and with the same per-certificate weight
+    as score_certificates, so both produce the same rounded score.
+    """
+    per = 100 / max(1, len(statuses))
+    total = 0.0
+    for status in statuses:
+        weight = STATUS_WEIGHTS.get((status or "").strip())
+        if weight:
+            total += weight * per
+    return int(round(total))
+
+
+@metrics.timed("score")
+def score_certificates(
+    required: List[str],
+    latest: Mapping[str, Dict[str, Any]],
+) -> Tuple[Dict[str, List[str]], List[Dict[str, str]], int, str]:
+    """
+    Full scoring for one supplier: (breakdown, issues, score, summary).
+    `latest` maps certificate_type to its latest certificate row.
+    """
+    breakdown = {"Valid": [], "Expired": [], "Missing": [], "Pending": []}
+    issues = []
+    n = max(1, len(required))
+    per = 100 / n
+    total = 0.0
+
+    for req in required:
+        info = latest.get(req)
+        if not info:
+            breakdown["Missing"].append(req)
+            issues.append({"type": "Missing", "detail": f"{req} is missing"})
+            continue
+
+        status = (info.get("valid_status") or "").strip()
+        if status == "Valid":
+            breakdown["Valid"].append(req)
+            total += per
+        elif status == "Pending":
+            breakdown["Pending"].append(req)
+            total += 0.5 * per
+            issues.append({"type": "Pending", "detail": f"{req} is pending"})
+        else:
+            breakdown["Expired"].append(req)
+            detail = f"{req} {status.lower() or 'non-compliant'}"
+            if info.get("expiry_date"):
+                detail += f" (expiry {info['expiry_date']})"
+            issues.append({"type": status or "NonCompliant", "detail": detail})
+
+    score = round(total)
+    if not breakdown["Expired"] and not breakdown["Missing"] and not breakdown["Pending"]:
+        summary = f"Fully compliant: {n}/{n} required certificates valid"
+    else:
+        summary = (
+            f"Mixed: {len(breakdown['Valid'])} valid, "
+            f"{len(breakdown['Expired'])} expired, "
+            f"{len(breakdown['Missing'])} missing, "
+            f"{len(breakdown['Pending'])} pending"
+        )
+
+    return breakdown, issues, int(score), summary
+
+
+def parse_combined_row(row: List[Dict[str, Any]]):
+    """
+    Decode one SQL_COMPLIANCE_COMBINED record into
+    (supplier_id, supplier_name, industry, required, latest).
+    """
+    required = json.loads(row[3]["stringValue"])
+    latest = {}
+    for c in json.loads(row[4]["stringValue"]):
+        latest[c["certificate_type"]] = {
+            "certificate_number": c["certificate_number"],
+            "issuing_body":       c["issuing_body"],
+            "issue_date":         c["issue_date"],
+            "expiry_date":        c["expiry_date"],
+            "valid_status":       c["valid_status"]
+        }
+    return row[0]["stringValue"], row[1]["stringValue"], row[2]["stringValue"], required, latest
+
+
+def compliance_body(supplier_id, supplier_name, industry, required, latest, mode="aurora") -> Dict[str, Any]:
+    """
+    The compliance Lambda's response document.
+    """
+    breakdown, issues, score, summary = score_certificates(required, latest)
+    return {
+        "supplier_id": supplier_id,
+        "supplier_name": supplier_name,
+        "industry": industry,
+        "required_set": required,
+        "status_breakdown": breakdown,
+        "issues": issues,
+        "compliance_score": score,
+        "summary": summary,
+        "mode": mode
+    }
@@ -0,0 +1,212 @@
+"""
+Supplier duplicate detection shared by the deduplication Lambda and the
+offline dedup jobs.
+
+`duplicate_check` builds the exact result document the Lambda returns, so
+single, batch and offline callers all report the same fields.
+`record_integrity_score` is the Data Integrity Score of a stored supplier
+record (scorecard, snapshots, exports) and `record_duplicate_check` the
+matching result document.
+`name_index_cache` builds the warm-container index cache used by the
+deduplication and trust-score Lambdas.
+"""
+
+from difflib import SequenceMatcher
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from . import metrics
+from .name_cache import NameIndexCache
+from .name_index import NameIndex
+from .rds_client import make_param
+
+# A match counts as a duplicate at or above this similarity (0-100).
+DUPLICATE_THRESHOLD = 90
+# difflib cutoff for considering a name at all (0-1).
+MATCH_CUTOFF = 0.5
+
+SQL_SUPPLIER_PAGE = """
+SELECT supplier_id, supplier_name
+FROM supplier_master
+WHERE supplier_id > :after
+ORDER BY supplier_id
+LIMIT :page_size;
+"""
+
+
+SQL_DUPLICATE_MATCHES = """
+SELECT d.supplier_id, d.best_match_id, m.supplier_name, d.similarity_score
+FROM supplier_duplicate_clusters d
+JOIN supplier_master m ON m.supplier_id = d.best_match_id;
+"""
+
+SQL_DUPLICATE_MATCH = """
+SELECT d.best_match_id, m.supplier_name, d.similarity_score
+FROM supplier_duplicate_clusters d
+JOIN supplier_master m ON m.supplier_id = d.best_match_id
+WHERE d.supplier_id = :sid;
+"""
+
+
+# Ordered so a name shared by several suppliers maps to the lowest
+# supplier_id, as on the scorecard fast path (NameIndex keeps the first id).
+SQL_NAME_INDEX_ALL = """
+SELECT supplier_id, supplier_name, updated_at
+FROM supplier_master
+ORDER BY supplier_id;
+"""
+
+# Small overlap so rows committed just behind the watermark are not missed;
+# re-applying a row is harmless.
+SQL_NAME_INDEX_CHANGED = """
+SELECT supplier_id, supplier_name, updated_at
+FROM supplier_master
+WHERE updated_at >= CAST(:since AS TIMESTAMP) - INTERVAL '1 minute';
+"""
+
+
+def similarity(a: str, b: Optional[str]) -> int:
+    """
+    Similarity in percent, as the deduplication Lambda reports it.
+    """
+    return int(SequenceMatcher(None, a, b).ratio() * 100) if b else 0
+
+
+def record_integrity_score(duplicate_score: Optional[int]) -> int:
+    """
+    Data Integrity Score of a supplier_master record.
+
+    For a typed name the deduplication Lambda scores how closely it matches
+    a record. A stored record always matches itself, so its score reflects
+    whether another record looks like the same supplier instead:
+    `duplicate_score` is the similarity of its closest other supplier
+    (supplier_duplicate_clusters.similarity_score, None when it is in no
+    cluster).
+
+    100 up to the match cutoff (names that are not compared at all), then
+    falling linearly to 0 for an identical name: 90 gives 20, 95 gives 10.
+    The mapping is continuous, so a supplier does not drop from 100 to 10
+    when its closest match crosses DUPLICATE_THRESHOLD.
+    """
+    floor = MATCH_CUTOFF * 100
+    if duplicate_score is None or duplicate_score <= floor:
+        return 100
+    return round(100 * (100 - min(int(duplicate_score), 100)) / (100 - floor))
+
+
+@metrics.timed("match")
+def duplicate_check(supplier_input: str, index: NameIndex, mode: str = "aurora") -> Dict[str, Any]:
+    best_match = index.best_match(supplier_input, cutoff=MATCH_CUTOFF)
+    score = similarity(supplier_input, best_match)
+    is_duplicate = score >= DUPLICATE_THRESHOLD
+
+    return {
+        "input_supplier": supplier_input,
+        "is_duplicate": is_duplicate,
+        "matched_supplier": best_match if is_duplicate else None,
+        "matched_supplier_id": index.id_for(best_match) if is_duplicate else None,
+        "similarity_score": score,
+        "message": (
+            f"Potential duplicate found: '{best_match}' ({score}% match)"
+            if is_duplicate
+            else "No duplicate supplier found."
+        ),
+        "mode": mode,
+    }
+
+
+def record_duplicate_check(supplier_name: str, match: Optional[Tuple[str, str, int]],
+                           mode: str = "record") -> Dict[str, Any]:
+    """
+    duplicate_check's document for a supplier_master record, from its
+    supplier_duplicate_clusters row: `match` is (best_match_id,
+    best_match_name, similarity_score), None when the supplier is in no
+    cluster. The record is never matched with itself, and
+    data_integrity_score is record_integrity_score.
+    """
+    score = match[2] if match else None
+    is_duplicate = score is not None and score >= DUPLICATE_THRESHOLD
+
+    return {
+        "input_supplier": supplier_name,
+        "is_duplicate": is_duplicate,
+        "matched_supplier": match[1] if is_duplicate else None,
+        "matched_supplier_id": match[0] if is_duplicate else None,
+        "similarity_score": score,
+        "data_integrity_score": record_integrity_score(score),
+        "message": (
+            f"Potential duplicate found: '{match[1]}' ({score}% match)"
+            if is_duplicate
+            else "No duplicate supplier found."
+        ),
+        "mode": mode,
+    }
+
+
+def duplicate_matches(exec_sql: Callable[..., Dict[str, Any]]) -> Dict[str, Tuple[str, str, int]]:
+    """
+    supplier_id -> (best_match_id, best_match_name, similarity_score) for
+    every supplier in supplier_duplicate_clusters.
+    """
+    return {
+        r[0]["stringValue"]: (r[1]["stringValue"], r[2]["stringValue"], int(r[3]["longValue"]))
+        for r in exec_sql(SQL_DUPLICATE_MATCHES).get("records", [])
+    }
+
+
+def record_match(query: Callable[..., List[Tuple]], supplier_id: str) -> Optional[Tuple[str, str, int]]:
+    """
+    (best_match_id, best_match_name, similarity_score) of one supplier, as
+    in duplicate_matches. `query` is common.rds_client.query.
+    """
+    rows = query(SQL_DUPLICATE_MATCH, [make_param("sid", supplier_id)])
+    if not rows:
+        return None
+    best_id, best_name, score = rows[0]
+    return best_id, best_name, int(score)
+
+
+def iter_supplier_records(
+    exec_sql: Callable[..., Dict[str, Any]],
+    page_size: int = 5000,
+) -> Iterator[Tuple[str, str]]:
+    """
+    Page through supplier_master by supplier_id so no single Data API
+    response has to carry the whole table.
+    """
+    after = ""
+    while True:
+        resp = exec_sql(SQL_SUPPLIER_PAGE, [
+            make_param("after", after),
+            make_param("page_size", page_size),
+        ])
+        records: List = resp.get("records", [])
+        for r in records:
+            yield r[0]["stringValue"], r[1]["stringValue"]
+        if len(records) < page_size:
+            return
+        after = records[-1][0]["stringValue"]
+
+
+def name_index_cache(
+    query: Callable[..., List[Tuple]],
+    ttl_seconds: float = 3600,
+    refresh_seconds: float = 30,
+    max_bytes: int = 256 * 1024 * 1024,
+) -> NameIndexCache:
+    """
+    NameIndexCache over supplier_master. `query` is common.rds_client.query
+    (rows come back as (supplier_id, supplier_name, updated_at) tuples).
+    """
+    def load_all():
+        return query(SQL_NAME_INDEX_ALL)
+
+    def load_changed(since):
+        return query(SQL_NAME_INDEX_CHANGED, [make_param("since", since, "TIMESTAMP")])
+
+    return NameIndexCache(
+        load_all,
+        load_changed,
+        ttl_seconds=ttl_seconds,
+        refresh_seconds=refresh_seconds,
+        max_bytes=max_bytes,
+    )
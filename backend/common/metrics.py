@@ -0,0 +1,207 @@
+"""
+Per-request hot-path timers and counters for the Lambdas, written as
+CloudWatch Embedded Metric Format (EMF) log lines.
+
+    @instrument_handler("compliance")
+    def lambda_handler(event, context): ...
+
+A traced invocation collects:
+- <name>_ms and <name>_calls for every timer() block / timed() function
+  (db, decode, score, match, serialize, ...) and handler_ms in total,
+- db_rows and db_bytes (rows returned, JSON size of the database responses),
+- response_bytes and cold_start,
+and prints them as one JSON line to stdout. CloudWatch Logs turns the `_aws`
+block into metrics under METRICS_NAMESPACE with a Function dimension; the
+line is also readable as plain JSON without any service. Timers running in
+worker threads add up, so in the trust-score Lambda db_ms can exceed
+handler_ms. serialize is the json.dumps of a Bedrock response body; a direct
+invocation's return value is serialized by the runtime after the handler,
+outside the trace.
+
+METRICS_SAMPLE_RATE (0..1, default 0 = off) is the share of invocations
+that are traced. Outside a traced invocation timers do nothing and the
+payload sizes are never computed.
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+SAMPLE_RATE = float(os.getenv("METRICS_SAMPLE_RATE", "0"))
+NAMESPACE = os.getenv("METRICS_NAMESPACE", "Supplier360")
+
+
+class _Timer:
+    __slots__ = ("trace", "name", "start")
+
+    def __init__(self, trace: "_Trace", name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = (time.perf_counter() - self.start) * 1000
+        self.trace.add(self.name + "_ms", elapsed)
+        self.trace.add(self.name + "_calls", 1)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL = _NullTimer()
+
+
+class _Trace:
+    """
+    Values of one invocation. Worker threads (trust-score checks) add to the
+    same trace, hence the lock.
+    """
+
+    def __init__(self):
+        self.values: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, value: float) -> None:
+        with self._lock:
+            self.values[name] = self.values.get(name, 0) + value
+
+    def timer(self, name: str) -> _Timer:
+        return _Timer(self, name)
+
+
+# A Lambda container serves one invocation at a time, so one module-level
+# trace is enough (and is visible from the trust-score worker threads).
+_current: Optional[_Trace] = None
+
+
+def active() -> bool:
+    """
+    True inside a traced invocation (use it to skip costly measurements).
+    """
+    return _current is not None
+
+
+def timer(name: str):
+    """
+    Context manager adding <name>_ms / <name>_calls to the current trace.
+    """
+    trace = _current
+    return _NULL if trace is None else trace.timer(name)
+
+
+def count(name: str, value: float = 1) -> None:
+    trace = _current
+    if trace is not None:
+        trace.add(name, value)
+
+
+def timed(name: str) -> Callable:
+    """
+    Decorator form of timer().
+    """
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            trace = _current
+            if trace is None:
+                return fn(*args, **kwargs)
+            with trace.timer(name):
+                return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+
+def payload_bytes(value: Any) -> int:
+    return len(json.dumps(value, default=str))
+
+
+def _unit(name: str) -> str:
+    if name.endswith("_ms"):
+        return "Milliseconds"
+    if name.endswith("_bytes"):
+        return "Bytes"
+    return "Count"
+
+
+def emf_record(function: str, values: Dict[str, float], cold_start: bool,
+               request_id: Optional[str] = None) -> Dict[str, Any]:
+    values = dict(values, cold_start=int(cold_start))
+    record = {
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": NAMESPACE,
+                "Dimensions": [["Function"]],
+                "Metrics": [{"Name": k, "Unit": _unit(k)} for k in sorted(values)],
+            }],
+        },
+        "Function": function,
+    }
+    if request_id:
+        record["RequestId"] = request_id
+    for key, value in values.items():
+        record[key] = round(value, 3) if isinstance(value, float) else value
+    return record
+
+
+def _print_line(record: Dict[str, Any]) -> None:
+    sys.stdout.write(json.dumps(record) + "\n")
+    sys.stdout.flush()
+
+
+def _sampled(rate: float) -> bool:
+    if rate <= 0:
+        return False
+    if rate >= 1:
+        return True
+    # Only imported when sampling is on, to keep it off the cold-start path.
+    from random import random
+    return random() < rate
+
+
+def instrument_handler(function: str, sample_rate: Optional[float] = None,
+                       emit: Callable[[Dict[str, Any]], None] = _print_line) -> Callable:
+    """
+    Decorator for lambda_handler: traces a sampled share of invocations and
+    emits one EMF record for each.
+    """
+    def wrap(handler):
+        cold = [True]
+
+        @functools.wraps(handler)
+        def inner(event, context):
+            global _current
+            cold_start, cold[0] = cold[0], False
+            if not _sampled(SAMPLE_RATE if sample_rate is None else sample_rate):
+                return handler(event, context)
+
+            trace = _Trace()
+            _current = trace
+            start = time.perf_counter()
+            resp = None
+            try:
+                resp = handler(event, context)
+                return resp
+            finally:
+                _current = None
+                trace.add("handler_ms", (time.perf_counter() - start) * 1000)
+                trace.add("response_bytes", payload_bytes(resp))
+                emit(emf_record(function, trace.values, cold_start,
+                                getattr(context, "aws_request_id", None)))
+        return inner
+    return wrap
@@ -0,0 +1,134 @@
+"""
+Warm-container cache for the supplier NameIndex.
+
+Lambda keeps module globals alive between invocations of a warm container,
+so the deduplication Lambda holds one NameIndexCache at module level instead
+of re-reading supplier_master on every call. The cache:
+
+- does a full load on first use and again after `ttl_seconds`
+  (this is also what picks up deleted suppliers),
+- in between, pulls only rows changed since the newest change timestamp it
+  has seen, at most once every `refresh_seconds`,
+- refuses to keep an index larger than `max_bytes` across invocations.
+
+`version` changes whenever the index contents may have changed, so results
+derived from the index (cached match responses) can be checked against it.
+"""
+
+import logging
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from .name_index import NameIndex
+
+log = logging.getLogger(__name__)
+
+# (supplier_id, supplier_name, changed_at) rows; changed_at is an ISO string.
+Rows = Iterable[Tuple[str, str, Optional[str]]]
+
+
+class NameIndexCache:
+    def __init__(
+        self,
+        load_all: Callable[[], Rows],
+        load_changed: Callable[[str], Rows],
+        ttl_seconds: float = 3600,
+        refresh_seconds: float = 30,
+        max_bytes: int = 256 * 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.load_all = load_all
+        self.load_changed = load_changed
+        self.ttl_seconds = ttl_seconds
+        self.refresh_seconds = refresh_seconds
+        self.max_bytes = max_bytes
+        self.clock = clock
+
+        self._index: Optional[NameIndex] = None
+        self._watermark: Optional[str] = None
+        self._loaded_at = 0.0
+        self._refreshed_at = 0.0
+        self.version = 0
+        self._changed = False
+        self.stats: Dict[str, object] = {
+            "hits": 0,
+            "misses": 0,
+            "refreshes": 0,
+            "rows_refreshed": 0,
+            "last_load_ms": None,
+            "last_refresh_ms": None,
+            "size": 0,
+            "approx_bytes": 0,
+        }
+
+    def _apply(self, index: NameIndex, rows: Rows) -> int:
+        count = 0
+        for supplier_id, supplier_name, changed_at in rows:
+            if index.name_for(supplier_id) != supplier_name:
+                index.add(supplier_id, supplier_name)
+                self._changed = True
+            if changed_at and (self._watermark is None or changed_at > self._watermark):
+                self._watermark = changed_at
+            count += 1
+        return count
+
+    def _full_load(self, now: float) -> NameIndex:
+        start = time.perf_counter()
+        self._watermark = None
+        self.version += 1
+        index = NameIndex()
+        self._apply(index, self.load_all())
+        self.stats["misses"] += 1
+        self.stats["last_load_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        self._loaded_at = self._refreshed_at = now
+        return index
+
+    def _refresh(self, index: NameIndex, now: float) -> None:
+        start = time.perf_counter()
+        self._changed = False
+        count = self._apply(index, self.load_changed(self._watermark))
+        if self._changed:
+            self.version += 1
+        self.stats["refreshes"] += 1
+        self.stats["rows_refreshed"] += count
+        self.stats["last_refresh_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        self._refreshed_at = now
+
+    @property
+    def warm(self) -> bool:
+        """
+        True if get() can be served without a full load.
+        """
+        return self._index is not None and self.clock() - self._loaded_at <= self.ttl_seconds
+
+    def get(self) -> NameIndex:
+        """
+        Return an up-to-date index, loading or refreshing as needed.
+        """
+        now = self.clock()
+        index = self._index
+
+        if index is None or now - self._loaded_at > self.ttl_seconds:
+            index = self._full_load(now)
+        else:
+            self.stats["hits"] += 1
+            # Without a watermark there is nothing to diff against; the
+            # next TTL reload picks up changes instead.
+            if self._watermark is not None and now - self._refreshed_at >= self.refresh_seconds:
+                self._refresh(index, now)
+
+        self.stats["size"] = len(index)
+        self.stats["approx_bytes"] = index.approx_bytes()
+
+        if index.approx_bytes() > self.max_bytes:
+            log.warning(
+                "Name index (%d bytes) exceeds cache budget (%d bytes); not caching",
+                index.approx_bytes(), self.max_bytes,
+            )
+            self._index = None
+        else:
+            self._index = index
+        return index
+
+    def invalidate(self) -> None:
+        self._index = None
@@ -0,0 +1,212 @@
+"""
+Trigram candidate index for supplier name matching.
+
+Running difflib over every supplier name is O(N) SequenceMatcher comparisons
+per lookup. NameIndex keeps a character-trigram inverted index over
+normalized names so a lookup only scores the handful of names that share
+trigrams with the input. Scoring itself still uses difflib on the raw names,
+so similarity scores match the original full-scan behaviour.
+"""
+
+import heapq
+import re
+import sys
+from array import array
+from collections import Counter
+from difflib import get_close_matches
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """
+    Lowercase a supplier name and collapse punctuation / whitespace runs
+    into single spaces.
+    """
+    return _NON_ALNUM.sub(" ", (name or "").lower()).strip()
+
+
+def trigrams(normalized: str) -> set:
+    """
+    Character trigrams of an already normalized name, padded so that
+    word starts and ends produce their own grams.
+    """
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """
+    In-memory trigram index over supplier names.
+
+    Each distinct supplier name is stored once and mapped to the lowest
+    supplier_id holding it: the first one added when loading in supplier_id
+    order, and the one the deduplication Lambda's scorecard path picks.
+    When that supplier is renamed or removed, the next holder takes over.
+
+    Dropped names leave tombstoned slots in the postings; once they pass
+    `compact_ratio` of all slots the postings are rebuilt from the live
+    names, so a long-lived index does not grow with every rename.
+    """
+
+    def __init__(self, max_candidates: int = 64, max_posting_ratio: float = 0.05,
+                 compact_ratio: float = 0.25):
+        self.max_candidates = max_candidates
+        self.max_posting_ratio = max_posting_ratio
+        self.compact_ratio = compact_ratio
+        self._names: List[Optional[str]] = []
+        self._slot_by_name: Dict[str, int] = {}
+        self._id_by_name: Dict[str, str] = {}
+        # name -> the other supplier_ids holding it (shared names only)
+        self._other_ids: Dict[str, set] = {}
+        self._name_by_id: Dict[str, str] = {}
+        self._postings: Dict[str, array] = {}
+        self._live = 0
+        self._bytes = 0
+
+    @classmethod
+    def from_records(cls, records: Iterable[Tuple[str, str]], **kwargs) -> "NameIndex":
+        index = cls(**kwargs)
+        for supplier_id, supplier_name in records:
+            index.add(supplier_id, supplier_name)
+        return index
+
+    def __len__(self) -> int:
+        return self._live
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._slot_by_name
+
+    def approx_bytes(self) -> int:
+        """
+        Rough memory footprint: name strings, posting entries and a fixed
+        per-name allowance for the lookup dicts.
+        """
+        return self._bytes
+
+    def names(self) -> List[str]:
+        return [n for n in self._names if n is not None]
+
+    def id_for(self, name: Optional[str]) -> Optional[str]:
+        return self._id_by_name.get(name) if name is not None else None
+
+    def name_for(self, supplier_id: str) -> Optional[str]:
+        return self._name_by_id.get(supplier_id)
+
+    def add(self, supplier_id: str, supplier_name: str) -> None:
+        """
+        Add or update a supplier. If the supplier previously had a different
+        name, the old name is dropped from the index unless another supplier
+        still holds it.
+        """
+        old = self._name_by_id.get(supplier_id)
+        if old == supplier_name:
+            return
+        if old is not None:
+            self._release(supplier_id, old)
+
+        self._name_by_id[supplier_id] = supplier_name
+        holder = self._id_by_name.get(supplier_name)
+        if holder is not None:
+            self._id_by_name[supplier_name] = min(holder, supplier_id)
+            self._other_ids.setdefault(supplier_name, set()).add(max(holder, supplier_id))
+        else:
+            self._id_by_name[supplier_name] = supplier_id
+            self._insert(supplier_name)
+        self._maybe_compact()
+
+    def _insert(self, supplier_name: str) -> None:
+        slot = len(self._names)
+        self._names.append(supplier_name)
+        self._slot_by_name[supplier_name] = slot
+        self._live += 1
+        grams = trigrams(normalize_name(supplier_name))
+        self._bytes += sys.getsizeof(supplier_name) + 4 * len(grams) + 300
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                posting = self._postings[gram] = array("I")
+            posting.append(slot)
+
+    def remove(self, supplier_id: str) -> None:
+        name = self._name_by_id.pop(supplier_id, None)
+        if name is not None:
+            self._release(supplier_id, name)
+            self._maybe_compact()
+
+    def _release(self, supplier_id: str, name: str) -> None:
+        """
+        `supplier_id` no longer holds `name`; the lowest other holder takes
+        it over, and without one the name is dropped.
+        """
+        others = self._other_ids.get(name)
+        if self._id_by_name.get(name) == supplier_id:
+            if others:
+                successor = min(others)
+                others.discard(successor)
+                self._id_by_name[name] = successor
+            else:
+                self._drop(name)
+        elif others:
+            others.discard(supplier_id)
+        if others is not None and not others:
+            del self._other_ids[name]
+
+    def _drop(self, name: str) -> None:
+        # Postings keep the slot; candidates() skips tombstoned slots.
+        slot = self._slot_by_name.pop(name)
+        self._names[slot] = None
+        self._id_by_name.pop(name, None)
+        self._live -= 1
+
+    def _maybe_compact(self) -> None:
+        dead = len(self._names) - self._live
+        if dead and dead > self.compact_ratio * len(self._names):
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Rebuild slots, postings and approx_bytes from the live names.
+        """
+        live = self.names()
+        self._names, self._slot_by_name, self._postings = [], {}, {}
+        self._live = self._bytes = 0
+        for name in live:
+            self._insert(name)
+
+    def candidates(self, name: str, limit: Optional[int] = None) -> List[str]:
+        """
+        Names sharing the most trigrams with `name`, best first.
+
+        Very common grams ("inc", "cor", ...) are skipped when rarer grams
+        are available, since they add cost without discriminating.
+        """
+        limit = limit or self.max_candidates
+        grams = [g for g in trigrams(normalize_name(name)) if g in self._postings]
+        if not grams:
+            return []
+
+        grams.sort(key=lambda g: len(self._postings[g]))
+        cap = max(1000, int(len(self._names) * self.max_posting_ratio))
+        selected = [g for g in grams if len(self._postings[g]) <= cap] or grams[:1]
+
+        counts = Counter()
+        for gram in selected:
+            counts.update(self._postings[gram])
+
+        names = self._names
+        top = heapq.nlargest(limit * 2, counts.items(), key=itemgetter(1))
+        out = [names[slot] for slot, _ in top if names[slot] is not None]
+        return out[:limit]
+
+    def best_match(self, name: str, cutoff: float = 0.5) -> Optional[str]:
+        """
+        Drop-in replacement for `get_close_matches(name, all_names, n=1,
+        cutoff=cutoff)` that only scores indexed candidates.
+        """
+        if name in self._slot_by_name:
+            return name
+        matches = get_close_matches(name, self.candidates(name), n=1, cutoff=cutoff)
+        return matches[0] if matches else None
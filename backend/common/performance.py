@@ -0,0 +1,271 @@
+"""
+Supplier performance scoring shared by the performance Lambda and jobs.
+
+    performance_score = delivery * 0.40 + quality * 0.35 + invoice * 0.25
+
+Delivery is 100 for an on-time order, otherwise 100 minus 5 points per day
+of delay (floored at 0).
+
+SQL_PERFORMANCE_AGGREGATE computes the same averages inside Postgres over an
+optional window (last N days and/or last N orders) and returns at most
+`max_notes` of the most recent notes, so the response no longer grows with
+a supplier's order history.
+
+SQL_PERFORMANCE_BUCKETS reads the running sums kept by the
+supplier_performance_* bucket tables instead (see schema.sql section 8): the
+all-time score is a single-row read, and a last-N-days window sums the daily
+buckets of the first, partial month plus one monthly bucket per month after
+it. It cannot answer a last-N-orders window.
+
+compute_scores scores the raw history rows column-wise (common.columnar);
+NULL quality / invoice percentages are left out of their averages, as in
+the SQL paths.
+"""
+
+import json
+import os
+from collections import Counter
+from itertools import compress, filterfalse
+from math import isnan
+from operator import not_
+from typing import Any, Callable, Dict, List, Optional
+
+from . import columnar, metrics
+from .rds_client import Param, make_params
+
+# Default scoring window (0 = whole history) and the number of most recent
+# notes returned. Shared by the Lambda and the scorecard job so both score
+# the same window.
+WINDOW_DAYS = int(os.getenv("PERF_WINDOW_DAYS", "0"))
+WINDOW_ORDERS = int(os.getenv("PERF_WINDOW_ORDERS", "0"))
+MAX_NOTES = int(os.getenv("PERF_MAX_NOTES", "20"))
+
+SQL_SUPPLIER_HISTORY = """
+SELECT
+    on_time,
+    delivery_delay_days,
+    quality_compliance_pct,
+    invoice_match_pct,
+    incidents,
+    notes
+FROM supplier_performance_history
+WHERE supplier_id = :sid;
+"""
+
+# window_days / window_orders <= 0 mean "no bound".
+SQL_PERFORMANCE_AGGREGATE = """
+WITH hist AS (
+  SELECT on_time,
+         delivery_delay_days,
+         quality_compliance_pct,
+         invoice_match_pct,
+         incidents,
+         notes,
+         order_date,
+         order_id
+  FROM supplier_performance_history
+  WHERE supplier_id = :sid
+    AND (:window_days <= 0 OR order_date >= CURRENT_DATE - CAST(:window_days AS INT))
+  ORDER BY order_date DESC, order_id DESC
+  LIMIT CASE WHEN :window_orders > 0 THEN :window_orders END
+)
+SELECT
+  COUNT(*),
+  AVG(CASE WHEN on_time THEN 100
+           ELSE GREATEST(0, 100 - LEAST(COALESCE(delivery_delay_days, 0) * 5, 100))
+      END),
+  AVG(quality_compliance_pct),
+  AVG(invoice_match_pct),
+  COALESCE(SUM(incidents), 0),
+  COALESCE(array_to_json(
+    (ARRAY_AGG(notes ORDER BY order_date DESC, order_id DESC)
+       FILTER (WHERE notes IS NOT NULL AND notes <> ''))[1:CAST(:max_notes AS INT)]
+  ), '[]'::json)::text
+FROM hist;
+"""
+
+
+# Same columns as SQL_PERFORMANCE_AGGREGATE. window_days <= 0 means
+# "whole history" and reads supplier_performance_totals.
+SQL_PERFORMANCE_BUCKETS = """
+WITH b AS (
+  SELECT order_count, delivery_sum, quality_sum, quality_count,
+         invoice_sum, invoice_count, incidents_sum
+  FROM supplier_performance_totals
+  WHERE supplier_id = :sid AND :window_days <= 0
+  UNION ALL
+  SELECT order_count, delivery_sum, quality_sum, quality_count,
+         invoice_sum, invoice_count, incidents_sum
+  FROM supplier_performance_daily
+  WHERE supplier_id = :sid AND :window_days > 0
+    AND bucket_date >= CURRENT_DATE - CAST(:window_days AS INT)
+    AND bucket_date < date_trunc('month', CURRENT_DATE - CAST(:window_days AS INT)) + INTERVAL '1 month'
+  UNION ALL
+  SELECT order_count, delivery_sum, quality_sum, quality_count,
+         invoice_sum, invoice_count, incidents_sum
+  FROM supplier_performance_monthly
+  WHERE supplier_id = :sid AND :window_days > 0
+    AND bucket_month >= date_trunc('month', CURRENT_DATE - CAST(:window_days AS INT)) + INTERVAL '1 month'
+)
+SELECT
+  COALESCE(SUM(order_count), 0),
+  SUM(delivery_sum) / NULLIF(SUM(order_count), 0),
+  SUM(quality_sum) / NULLIF(SUM(quality_count), 0),
+  SUM(invoice_sum) / NULLIF(SUM(invoice_count), 0),
+  COALESCE(SUM(incidents_sum), 0),
+  (SELECT COALESCE(array_to_json(ARRAY_AGG(n.notes ORDER BY n.order_date DESC, n.order_id DESC)), '[]'::json)::text
+   FROM (
+     SELECT notes, order_date, order_id
+     FROM supplier_performance_history
+     WHERE supplier_id = :sid
+       AND notes IS NOT NULL AND notes <> ''
+       AND (:window_days <= 0 OR order_date >= CURRENT_DATE - CAST(:window_days AS INT))
+     ORDER BY order_date DESC, order_id DESC
+     LIMIT :max_notes
+   ) n)
+FROM b;
+"""
+
+
+# SQL_SUPPLIER_HISTORY column types; incidents are not scored.
+HISTORY_COLUMNS = (columnar.BOOL, columnar.INT, columnar.FLOAT, columnar.FLOAT, None, columnar.TEXT)
+HISTORY_NAMES = ("on_time", "delivery_delay_days", "quality_compliance_pct",
+                 "invoice_match_pct", "incidents", "notes")
+
+
+def _mean(values) -> float:
+    # Summed in row order, so the result is the same float as a list sum.
+    total = sum(values)
+    if total == total:
+        return total / len(values)
+    # NaN: skip NULLs
+    present = list(filterfalse(isnan, values))
+    return sum(present) / len(present) if present else 0.0
+
+
+def scores_from_columns(on_time, delay, quality, invoice, notes) -> Dict[str, Any]:
+    """
+    Score decoded SQL_SUPPLIER_HISTORY columns (see common.columnar).
+    """
+    n = len(on_time)
+    if not n:
+        return {
+            "delivery_score": 0,
+            "quality_score": 0,
+            "invoice_score": 0,
+            "performance_score": 0,
+            "notes": ["No performance records found"]
+        }
+
+    # Delivery: 100 per order, minus min(5 * delay, 100) = 5 * min(delay, 20)
+    # for each late one, summed per distinct delay. The sum stays an int, so
+    # the average is exact.
+    late_delays = Counter(compress(delay, map(not_, on_time)))
+    penalty = 5 * sum(min(days, 20) * orders for days, orders in late_delays.items())
+    avg_del = (100 * n - penalty) / n
+    avg_qual = _mean(quality)
+    avg_inv = _mean(invoice)
+
+    final = avg_del * 0.40 + avg_qual * 0.35 + avg_inv * 0.25
+
+    return {
+        "delivery_score": round(avg_del, 2),
+        "quality_score": round(avg_qual, 2),
+        "invoice_score": round(avg_inv, 2),
+        "performance_score": round(final, 2),
+        "notes": list(filter(None, notes))
+    }
+
+
+@metrics.timed("score")
+def compute_scores(rows: List[List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Score Data API records shaped like SQL_SUPPLIER_HISTORY.
+    """
+    with metrics.timer("decode"):
+        on_time, delay, quality, invoice, _, notes = columnar.decode_records(rows, HISTORY_COLUMNS)
+    return scores_from_columns(on_time, delay, quality, invoice, notes)
+
+
+def aggregate_params(supplier_id: str, window_days: int = WINDOW_DAYS,
+                     window_orders: int = WINDOW_ORDERS,
+                     max_notes: int = MAX_NOTES) -> List[Param]:
+    return make_params({
+        "sid": supplier_id,
+        "window_days": int(window_days or 0),
+        "window_orders": int(window_orders or 0),
+        "max_notes": int(max_notes),
+    })
+
+
+def bucket_params(supplier_id: str, window_days: int = WINDOW_DAYS,
+                  max_notes: int = MAX_NOTES) -> List[Param]:
+    return make_params({
+        "sid": supplier_id,
+        "window_days": int(window_days or 0),
+        "max_notes": int(max_notes),
+    })
+
+
+def _num(cell: Dict[str, Any]) -> Optional[float]:
+    if cell.get("isNull"):
+        return None
+    value = cell.get("doubleValue")
+    return float(value if value is not None else cell.get("stringValue"))
+
+
+@metrics.timed("score")
+def scores_from_aggregate(row: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Same result as compute_scores, from one SQL_PERFORMANCE_AGGREGATE or
+    SQL_PERFORMANCE_BUCKETS record.
+    """
+    if not row or not int(row[0].get("longValue", 0)):
+        return compute_scores([])
+
+    # An average over only NULLs is NULL; score it 0 like compute_scores.
+    avg_del = _num(row[1]) or 0.0
+    avg_qual = _num(row[2]) or 0.0
+    avg_inv = _num(row[3]) or 0.0
+    final = avg_del * 0.40 + avg_qual * 0.35 + avg_inv * 0.25
+
+    return {
+        "delivery_score": round(avg_del, 2),
+        "quality_score": round(avg_qual, 2),
+        "invoice_score": round(avg_inv, 2),
+        "performance_score": round(final, 2),
+        "notes": json.loads(row[5]["stringValue"])
+    }
+
+
+def score_supplier(exec_sql: Callable[..., Dict[str, Any]], supplier_id: str,
+                   window_days: int = WINDOW_DAYS, window_orders: int = WINDOW_ORDERS,
+                   max_notes: int = MAX_NOTES, use_buckets: bool = True) -> Dict[str, Any]:
+    """
+    Score one supplier in a single statement: the bucket tables when the
+    window allows it, otherwise SQL_PERFORMANCE_AGGREGATE.
+    """
+    if use_buckets and window_orders <= 0:
+        resp = exec_sql(SQL_PERFORMANCE_BUCKETS, bucket_params(supplier_id, window_days, max_notes))
+    else:
+        resp = exec_sql(SQL_PERFORMANCE_AGGREGATE, aggregate_params(
+            supplier_id, window_days, window_orders, max_notes
+        ))
+    return scores_from_aggregate((resp.get("records") or [None])[0])
+
+
+def performance_body(supplier_id: str, supplier_name: str, result: Dict[str, Any],
+                     mode: str = "performance_scoring") -> Dict[str, Any]:
+    """
+    The performance Lambda's response document.
+    """
+    return {
+        "supplier_name": supplier_name,
+        "supplier_id": supplier_id,
+        "delivery_score": result["delivery_score"],
+        "quality_score": result["quality_score"],
+        "invoice_score": result["invoice_score"],
+        "performance_score": result["performance_score"],
+        "notes": result["notes"],
+        "mode": mode
+    }
@@ -0,0 +1,202 @@
+"""
+Portfolio-wide supplier risk ranking.
+
+Ranks every supplier by its precomputed supplier_scorecard scores (trust
+score or one of its components), optionally filtered by industry and
+country, in one set-based statement. `ORDER BY ... LIMIT` lets Postgres
+keep only the best K rows in a bounded heap (top-N heapsort) or, for
+trust_score, walk the (industry, trust_score) index, so nothing beyond the
+requested page leaves the database.
+
+Pages are chained with an opaque keyset cursor (last score, last
+supplier_id, rows already returned), so page N costs the same as page 1.
+The cursor also records the ranking it belongs to (rank_by, order and a
+hash of the filters); it is rejected for any other ranking, where its
+keyset would skip or repeat rows.
+Suppliers without a score for the ranked column (never refreshed) are not
+ranked.
+"""
+
+import base64
+import hashlib
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Ranking key -> (column, default order). Lower scores are riskier; more
+# duplicates are riskier.
+RANK_COLUMNS = {
+    "trust_score": ("sc.trust_score", "asc"),
+    "data_integrity_score": ("sc.data_integrity_score", "asc"),
+    "compliance_score": ("sc.compliance_score", "asc"),
+    "performance_score": ("sc.performance_score", "asc"),
+    "delivery_score": ("sc.delivery_score", "asc"),
+    "quality_score": ("sc.quality_score", "asc"),
+    "invoice_score": ("sc.invoice_score", "asc"),
+    "duplicate_count": ("sc.duplicate_count", "desc"),
+}
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+_SELECT = """
+SELECT sc.supplier_id,
+       sc.supplier_name,
+       sc.industry,
+       sm.country,
+       sc.trust_score,
+       sc.data_integrity_score,
+       sc.compliance_score,
+       sc.performance_score,
+       sc.delivery_score,
+       sc.quality_score,
+       sc.invoice_score,
+       sc.duplicate_count,
+       sc.stale,
+       {column}
+FROM supplier_scorecard sc
+JOIN supplier_master sm ON sm.supplier_id = sc.supplier_id
+WHERE {where}
+ORDER BY {column} {order}, sc.supplier_id {order}
+LIMIT :limit;
+"""
+
+_COUNT = """
+SELECT COUNT(*)
+FROM supplier_scorecard sc
+JOIN supplier_master sm ON sm.supplier_id = sc.supplier_id
+WHERE {where};
+"""
+
+_FIELDS = (
+    "supplier_id", "supplier_name", "industry", "country", "trust_score",
+    "data_integrity_score", "compliance_score", "performance_score",
+    "delivery_score", "quality_score", "invoice_score", "duplicate_count", "stale",
+)
+_NUMERIC = {"trust_score", "performance_score", "delivery_score", "quality_score", "invoice_score"}
+
+
+class RankingError(ValueError):
+    """
+    Invalid ranking request (unknown rank_by / order, bad cursor).
+    """
+
+
+def ranking_scope(rank_by: str, order: str, industry: Optional[str] = None,
+                  country: Optional[str] = None) -> List[str]:
+    """
+    [rank_by, order, filters hash]: the ranking a cursor belongs to.
+    """
+    filters = json.dumps([industry or None, country or None])
+    return [rank_by, order, hashlib.sha256(filters.encode()).hexdigest()[:16]]
+
+
+def encode_cursor(value: Any, supplier_id: str, offset: int, scope: List[str]) -> str:
+    raw = json.dumps([str(value), supplier_id, offset, *scope], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, scope: List[str]) -> Tuple[str, str, int]:
+    """
+    (value, supplier_id, offset). RankingError if the cursor is malformed
+    or was issued for a different ranking than `scope`.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, supplier_id, offset, *cursor_scope = json.loads(raw)
+        value, supplier_id, offset = str(value), str(supplier_id), int(offset)
+    except (ValueError, TypeError) as e:
+        raise RankingError("Invalid cursor") from e
+    if cursor_scope != scope:
+        raise RankingError(
+            "cursor belongs to a different ranking; repeat rank_by, order, industry "
+            "and country from the request that returned it"
+        )
+    return value, supplier_id, offset
+
+
+def build_ranking_sql(rank_by: str = "trust_score", order: Optional[str] = None,
+                      industry: Optional[str] = None, country: Optional[str] = None,
+                      cursor: Optional[str] = None,
+                      limit: int = DEFAULT_LIMIT) -> Tuple[str, str, Dict[str, Any], int]:
+    """
+    Returns (page_sql, count_sql, params, offset). Only whitelisted column
+    names and directions are interpolated; every value is a parameter.
+    """
+    if rank_by not in RANK_COLUMNS:
+        raise RankingError(f"rank_by must be one of {', '.join(RANK_COLUMNS)}")
+    column, default_order = RANK_COLUMNS[rank_by]
+    order = (order or default_order).lower()
+    if order not in ("asc", "desc"):
+        raise RankingError("order must be asc or desc")
+
+    where = [f"{column} IS NOT NULL"]
+    params: Dict[str, Any] = {"limit": max(1, min(int(limit), MAX_LIMIT))}
+    if industry:
+        where.append("sc.industry = :industry")
+        params["industry"] = industry
+    if country:
+        where.append("sm.country = :country")
+        params["country"] = country
+    filters = " AND ".join(where)
+
+    offset = 0
+    page_where = filters
+    if cursor:
+        value, after_id, offset = decode_cursor(cursor, ranking_scope(rank_by, order, industry, country))
+        op = ">" if order == "asc" else "<"
+        page_where += f" AND ({column}, sc.supplier_id) {op} (CAST(:after_value AS NUMERIC), :after_id)"
+        params["after_value"] = value
+        params["after_id"] = after_id
+
+    page_sql = _SELECT.format(column=column, where=page_where, order=order)
+    count_sql = _COUNT.format(where=filters)
+    return page_sql, count_sql, params, offset
+
+
+def _decode(row: Tuple) -> Dict[str, Any]:
+    out = dict(zip(_FIELDS, row))
+    for key in _NUMERIC:
+        if out[key] is not None:
+            out[key] = float(out[key])
+    return out
+
+
+def rank_suppliers(query: Callable[..., List[Tuple]], rank_by: str = "trust_score",
+                   order: Optional[str] = None, industry: Optional[str] = None,
+                   country: Optional[str] = None, cursor: Optional[str] = None,
+                   limit: int = DEFAULT_LIMIT) -> Dict[str, Any]:
+    """
+    One page of the ranking. `query` is common.rds_client.query. `total`
+    (number of ranked suppliers matching the filters) is only computed for
+    the first page.
+    """
+    page_sql, count_sql, params, offset = build_ranking_sql(
+        rank_by, order, industry, country, cursor, limit
+    )
+    order = (order or RANK_COLUMNS[rank_by][1]).lower()
+    rows = query(page_sql, params)
+
+    results = []
+    for i, row in enumerate(rows, start=offset + 1):
+        item = _decode(row[:-1])
+        item["rank"] = i
+        results.append(item)
+
+    next_cursor = None
+    if len(rows) == params["limit"]:
+        last = rows[-1]
+        scope = ranking_scope(rank_by, order, industry, country)
+        next_cursor = encode_cursor(last[-1], last[0], offset + len(rows), scope)
+
+    body = {
+        "rank_by": rank_by,
+        "order": order,
+        "filters": {"industry": industry, "country": country},
+        "count": len(results),
+        "results": results,
+        "next_cursor": next_cursor,
+    }
+    if not cursor:
+        count_params = {k: v for k, v in params.items() if k in ("industry", "country")}
+        body["total"] = query(count_sql, count_params)[0][0]
+    return body
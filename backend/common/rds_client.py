@@ -1,46 +1,456 @@
 """
-Common Aurora RDS Data API helper for Supplier360.
+Common Aurora database access helpers for Supplier360.
 
-This module centralizes the RDS Data API client and simple helper functions
-so Lambdas can reuse the same pattern.
+This module centralizes database access so Lambdas and jobs share one
+pattern:
+
+- make_param / make_params build typed Data API parameters (long, double,
+  bool, date, timestamp, decimal, JSON, NULL) so Postgres compares typed
+  columns against typed values instead of casting text.
+- exec_sql / batch_exec_sql return the Data API response shape (records of
+  typed cells) whatever the backend, so existing callers keep working.
+- query / query_dicts return decoded rows (tuples / dicts of plain Python
+  values) for new code.
+- transaction() runs the statements of a block, from the calling thread,
+  in one transaction.
+
+Every call is timed into common.metrics (db / decode timers, db_rows,
+db_bytes) when the invocation is traced.
+
+The backend is chosen with DB_BACKEND:
+
+- "data_api" (default): RDS Data API through boto3.
+- "psycopg": a psycopg 3 connection pool on DB_DSN (for example an RDS Proxy
+  endpoint), which avoids the Data API's per-request HTTPS overhead.
+  Requires `psycopg` and `psycopg_pool` in the deployment package.
 """
 
+import datetime
+import decimal
+import json
 import os
-import boto3
-from typing import Any, Dict, List, Optional
+import re
+import sys
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from . import metrics
 
 AURORA_ARN = os.getenv("AURORA_ARN")
 SECRET_ARN = os.getenv("DB_SECRET_ARN")
 DB_NAME = os.getenv("DB_NAME", "supplier360")
 
-rds = boto3.client("rds-data")
+DB_BACKEND = os.getenv("DB_BACKEND", "data_api").lower()
+DB_DSN = os.getenv("DB_DSN")
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "1"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "4"))
+
+Param = Dict[str, Any]
+Params = Union[None, List[Param], Mapping[str, Any]]
+
+
+# ---------- Parameters ----------
+def _is_uuid(value: Any) -> bool:
+    # uuid (and the platform module it loads) is not imported at cold start;
+    # a value can only be a UUID once something else has imported it.
+    module = sys.modules.get("uuid")
+    return module is not None and isinstance(value, module.UUID)
+
+
+def _timestamp(value: datetime.datetime) -> str:
+    # Data API TIMESTAMP format: YYYY-MM-DD HH:MM:SS[.FFFFFF]
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f").rstrip("0").rstrip(".")
+
+
+def make_param(name: str, value: Any, type_hint: Optional[str] = None) -> Param:
+    """
+    Create a typed Data API parameter from a Python value.
+
+    None becomes SQL NULL; bool, int and float map to booleanValue,
+    longValue and doubleValue; date, datetime, time, Decimal, UUID and
+    dict/list values are sent as strings with the matching typeHint.
+    `type_hint` forces a hint for string values (e.g. "TIMESTAMP").
+    """
+    if value is None:
+        return {"name": name, "value": {"isNull": True}}
+    if isinstance(value, bool):
+        return {"name": name, "value": {"booleanValue": value}}
+    if isinstance(value, int):
+        return {"name": name, "value": {"longValue": value}}
+    if isinstance(value, float):
+        return {"name": name, "value": {"doubleValue": value}}
+    if isinstance(value, (bytes, bytearray)):
+        return {"name": name, "value": {"blobValue": bytes(value)}}
+
+    if isinstance(value, datetime.datetime):
+        text, hint = _timestamp(value), "TIMESTAMP"
+    elif isinstance(value, datetime.date):
+        text, hint = value.isoformat(), "DATE"
+    elif isinstance(value, datetime.time):
+        text, hint = value.strftime("%H:%M:%S.%f"), "TIME"
+    elif isinstance(value, decimal.Decimal):
+        text, hint = str(value), "DECIMAL"
+    elif _is_uuid(value):
+        text, hint = str(value), "UUID"
+    elif isinstance(value, (dict, list)):
+        text, hint = json.dumps(value, default=str), "JSON"
+    else:
+        text, hint = str(value), None
+
+    param = {"name": name, "value": {"stringValue": text}}
+    if type_hint or hint:
+        param["typeHint"] = type_hint or hint
+    return param
 
 
-def make_param(name: str, value: Any) -> Dict[str, Any]:
+def make_params(values: Mapping[str, Any]) -> List[Param]:
     """
-    Create a simple string parameter for the Data API.
-    Extend this if you need other types (long, bool, double, etc.).
+    make_param for every item of a mapping.
     """
-    return {
-        "name": name,
-        "value": {
-            "stringValue": "" if value is None else str(value)
-        },
-    }
+    return [make_param(name, value) for name, value in values.items()]
 
 
+def _as_params(params: Params) -> List[Param]:
+    if not params:
+        return []
+    if isinstance(params, Mapping):
+        return make_params(params)
+    return list(params)
+
+
+# ---------- Decoding ----------
+def _plain(value: Any) -> Any:
+    """
+    Render a driver value the way the Data API returns it.
+    """
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, datetime.datetime):
+        return _timestamp(value)
+    if isinstance(value, (datetime.date, datetime.time, decimal.Decimal)) or _is_uuid(value):
+        return str(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def _cell(value: Any) -> Dict[str, Any]:
+    value = _plain(value)
+    if value is None:
+        return {"isNull": True}
+    if isinstance(value, bool):
+        return {"booleanValue": value}
+    if isinstance(value, int):
+        return {"longValue": value}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {"blobValue": bytes(value)}
+    return {"stringValue": str(value)}
+
+
+def cell_value(cell: Dict[str, Any]) -> Any:
+    """
+    The Python value held by one Data API cell (None for NULL).
+    """
+    if cell.get("isNull"):
+        return None
+    for value in cell.values():
+        return value
+    return None
+
+
+def rows(resp: Dict[str, Any]) -> List[Tuple[Any, ...]]:
+    """
+    Decode the records of an exec_sql response into tuples.
+    """
+    return [tuple(map(cell_value, r)) for r in resp.get("records", [])]
+
+
+# ---------- Backends ----------
+class DataApiBackend:
+    """
+    RDS Data API backend. The boto3 client is created on first use.
+    """
+
+    def __init__(self, resource_arn: Optional[str] = AURORA_ARN,
+                 secret_arn: Optional[str] = SECRET_ARN,
+                 database: str = DB_NAME, client: Any = None):
+        self.resource_arn = resource_arn
+        self.secret_arn = secret_arn
+        self.database = database
+        self._client = client
+        self._lock = threading.Lock()
+        self._tx = threading.local()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    import boto3
+                    self._client = boto3.client("rds-data")
+        return self._client
+
+    def _transaction_args(self) -> Dict[str, str]:
+        tx = getattr(self._tx, "id", None)
+        return {"transactionId": tx} if tx else {}
+
+    @contextmanager
+    def transaction(self):
+        tx = self.client.begin_transaction(
+            resourceArn=self.resource_arn,
+            secretArn=self.secret_arn,
+            database=self.database,
+        )["transactionId"]
+        self._tx.id = tx
+        try:
+            yield
+        except BaseException:
+            self.client.rollback_transaction(
+                resourceArn=self.resource_arn, secretArn=self.secret_arn, transactionId=tx)
+            raise
+        else:
+            self.client.commit_transaction(
+                resourceArn=self.resource_arn, secretArn=self.secret_arn, transactionId=tx)
+        finally:
+            self._tx.id = None
+
+    def execute(self, sql: str, params: List[Param], database: Optional[str] = None,
+                **kwargs) -> Dict[str, Any]:
+        kwargs.update(self._transaction_args())
+        resp = self.client.execute_statement(
+            resourceArn=self.resource_arn,
+            secretArn=self.secret_arn,
+            database=database or self.database,
+            sql=sql,
+            parameters=params,
+            **kwargs
+        )
+        if metrics.active():
+            metrics.count("db_bytes", metrics.payload_bytes(resp))
+        return resp
+
+    def batch_execute(self, sql: str, param_sets: List[List[Param]],
+                      database: Optional[str] = None) -> Dict[str, Any]:
+        return self.client.batch_execute_statement(
+            resourceArn=self.resource_arn,
+            secretArn=self.secret_arn,
+            database=database or self.database,
+            sql=sql,
+            parameterSets=param_sets,
+            **self._transaction_args()
+        )
+
+    def query(self, sql: str, params: List[Param]) -> List[Tuple[Any, ...]]:
+        resp = self.execute(sql, params)
+        with metrics.timer("decode"):
+            return rows(resp)
+
+    def query_dicts(self, sql: str, params: List[Param]) -> List[Dict[str, Any]]:
+        # The Data API decodes the result set server side into a JSON
+        # document; one json.loads replaces a lookup per cell.
+        resp = self.execute(sql, params, formatRecordsAs="JSON")
+        with metrics.timer("decode"):
+            return json.loads(resp.get("formattedRecords") or "[]")
+
+
+# `:name` placeholders, skipping `::type` casts.
+_NAMED_PARAM = re.compile(r"(?<![:\w]):([A-Za-z_]\w*)")
+
+def _parse_uuid(text: str):
+    import uuid
+    return uuid.UUID(text)
+
+
+_HINT_PARSERS = {
+    "DATE": datetime.date.fromisoformat,
+    "TIMESTAMP": datetime.datetime.fromisoformat,
+    "TIME": datetime.time.fromisoformat,
+    "DECIMAL": decimal.Decimal,
+    "UUID": _parse_uuid,
+}
+
+
+@lru_cache(maxsize=256)
+def pyformat_sql(sql: str) -> str:
+    """
+    Rewrite Data API `:name` placeholders as psycopg `%(name)s`.
+    """
+    return _NAMED_PARAM.sub(r"%(\1)s", sql.replace("%", "%%"))
+
+
+def param_values(params: List[Param]) -> Dict[str, Any]:
+    """
+    Data API parameters as a name -> Python value mapping for psycopg.
+    """
+    out = {}
+    for p in params:
+        value = cell_value(p["value"])
+        parse = _HINT_PARSERS.get(p.get("typeHint"))
+        out[p["name"]] = parse(value) if parse and value is not None else value
+    return out
+
+
+class PsycopgBackend:
+    """
+    psycopg 3 connection-pool backend (direct Aurora or RDS Proxy).
+
+    Statements run in autocommit mode, like Data API calls without a
+    transaction id, except inside transaction(), where the thread keeps one
+    connection. `database` arguments are ignored; the DSN picks the
+    database.
+    """
+
+    def __init__(self, dsn: Optional[str] = DB_DSN, min_size: int = DB_POOL_MIN,
+                 max_size: int = DB_POOL_MAX):
+        if not dsn:
+            raise ValueError("DB_DSN is required for the psycopg backend")
+        from psycopg_pool import ConnectionPool
+
+        self.pool = ConnectionPool(
+            dsn, min_size=min_size, max_size=max_size,
+            kwargs={"autocommit": True}, open=True,
+        )
+        self._tx = threading.local()
+
+    @contextmanager
+    def transaction(self):
+        with self.pool.connection() as conn, conn.transaction():
+            self._tx.conn = conn
+            try:
+                yield
+            finally:
+                self._tx.conn = None
+
+    @contextmanager
+    def _connection(self):
+        conn = getattr(self._tx, "conn", None)
+        if conn is not None:
+            yield conn
+        else:
+            with self.pool.connection() as conn:
+                yield conn
+
+    def _run(self, sql: str, params: List[Param]):
+        with self._connection() as conn:
+            cur = conn.execute(pyformat_sql(sql), param_values(params))
+            names = [d.name for d in cur.description] if cur.description else None
+            result = cur.fetchall() if names is not None else None
+        if result and metrics.active():
+            metrics.count("db_bytes", metrics.payload_bytes(result))
+        return cur.rowcount, names, result
+
+    def execute(self, sql: str, params: List[Param], database: Optional[str] = None,
+                **kwargs) -> Dict[str, Any]:
+        count, names, result = self._run(sql, params)
+        resp = {"numberOfRecordsUpdated": max(count, 0)}
+        if result is not None:
+            with metrics.timer("decode"):
+                resp["records"] = [[_cell(v) for v in r] for r in result]
+            if kwargs.get("includeResultMetadata"):
+                resp["columnMetadata"] = [{"name": n, "label": n} for n in names]
+        return resp
+
+    def batch_execute(self, sql: str, param_sets: List[List[Param]],
+                      database: Optional[str] = None) -> Dict[str, Any]:
+        with self._connection() as conn:
+            with conn.transaction():
+                conn.cursor().executemany(pyformat_sql(sql), [param_values(p) for p in param_sets])
+        return {"updateResults": [{"generatedFields": []} for _ in param_sets]}
+
+    def query(self, sql: str, params: List[Param]) -> List[Tuple[Any, ...]]:
+        _, _, result = self._run(sql, params)
+        with metrics.timer("decode"):
+            return [tuple(map(_plain, r)) for r in result or []]
+
+    def query_dicts(self, sql: str, params: List[Param]) -> List[Dict[str, Any]]:
+        _, names, result = self._run(sql, params)
+        with metrics.timer("decode"):
+            return [dict(zip(names, map(_plain, r))) for r in result or []]
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """
+    The process-wide backend, created from DB_BACKEND on first use and
+    reused across warm Lambda invocations.
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = PsycopgBackend() if DB_BACKEND == "psycopg" else DataApiBackend()
+    return _backend
+
+
+def set_backend(backend) -> None:
+    """
+    Replace the process-wide backend (e.g. a pool built by a job).
+    """
+    global _backend
+    _backend = backend
+
+
+# ---------- Statements ----------
 def exec_sql(
     sql: str,
-    params: Optional[List[Dict[str, Any]]] = None,
+    params: Params = None,
+    database: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Execute a SQL statement and return a Data API shaped response.
+    `params` is a list of Data API parameters or a mapping of plain values.
+    """
+    with metrics.timer("db"):
+        resp = get_backend().execute(sql, _as_params(params), database)
+    metrics.count("db_rows", len(resp.get("records") or ()))
+    return resp
+
+
+def batch_exec_sql(
+    sql: str,
+    param_sets: Iterable[Params],
     database: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
-    Execute a SQL statement against Aurora using the Data API.
+    Execute one SQL statement for many parameter sets in a single
+    call (e.g. multi-row inserts).
+    """
+    with metrics.timer("db"):
+        return get_backend().batch_execute(sql, [_as_params(p) for p in param_sets], database)
+
+
+def transaction():
+    """
+    Context manager: the exec_sql / batch_exec_sql / query calls made by
+    this thread inside the block run in one transaction, committed when the
+    block ends and rolled back if it raises.
+    """
+    return get_backend().transaction()
+
+
+def query(sql: str, params: Params = None) -> List[Tuple[Any, ...]]:
+    """
+    Execute a query and return its rows as tuples of plain values.
+    """
+    with metrics.timer("db"):
+        result = get_backend().query(sql, _as_params(params))
+    metrics.count("db_rows", len(result))
+    return result
+
+
+def query_dicts(sql: str, params: Params = None) -> List[Dict[str, Any]]:
+    """
+    Execute a query and return its rows as dicts keyed by column name.
+    Column names must be unique.
     """
-    return rds.execute_statement(
-        resourceArn=AURORA_ARN,
-        secretArn=SECRET_ARN,
-        database=database or DB_NAME,
-        sql=sql,
-        parameters=params or [],
-    )
+    with metrics.timer("db"):
+        result = get_backend().query_dicts(sql, _as_params(params))
+    metrics.count("db_rows", len(result))
+    return result
@@ -0,0 +1,212 @@
+"""
+Deterministic Supplier360 risk report.
+
+render_report turns the three action-group results (duplicate check,
+compliance, performance) into the data sections of the agent's report:
+
+    Supplier Data Integrity Summary
+    Certification Summary
+    Operational Summary
+    Overall Risk Summary   (weighted table, Trust Score, risk classification)
+
+in the system prompt's format: plain text, one blank line between
+paragraphs, Markdown only for the table. Scores, weighted contributions and
+the Trust Score come from common.trust_score, so the agent no longer does
+the arithmetic or lays out the table; it copies this text and writes the
+Executive Summary, Recommendations and Helpful Links itself.
+
+The templates are string.Template objects built once at import.
+"""
+
+from collections import Counter
+from string import Template
+from typing import Any, Dict, Iterable, List, Optional
+
+from . import metrics
+from .trust_score import TRUST_WEIGHTS, risk_level, trust_score, weighted_contributions
+
+_DATA_INTEGRITY = Template("""\
+Supplier Data Integrity Summary
+
+Input supplier: $input_supplier
+
+Matched supplier: $matched_supplier
+
+Data Integrity Score: $score
+
+Supplier match clarity: $clarity""")
+
+_CERTIFICATION = Template("""\
+Certification Summary
+
+Supplier: $supplier_name ($supplier_id), industry $industry
+
+Certification Score: $score
+
+Certification results: $summary
+
+Valid certificates: $valid
+
+Expired certificates: $expired
+
+Missing certificates: $missing
+
+Pending certificates: $pending
+
+Certification issues: $issues""")
+
+_OPERATIONAL = Template("""\
+Operational Summary
+
+Operational Score: $score
+
+Delivery score: $delivery, quality score: $quality, invoice match score: $invoice
+
+Operational notes: $notes""")
+
+_OVERALL = Template("""\
+Overall Risk Summary
+
+| Component | Score | Weight | Weighted Contribution |
+| --- | --- | --- | --- |
+$rows
+
+Weighted Trust Score: $trust_score
+
+Final risk classification: $risk_level""")
+
+_ROW = Template("| $label | $score | $weight% | $contribution |")
+
+_COMPONENTS = (
+    ("data_integrity", "Data Integrity Score"),
+    ("certification", "Certification Score"),
+    ("operational", "Operational Score"),
+)
+
+SECTION_TITLES = (
+    "Supplier Data Integrity Summary",
+    "Certification Summary",
+    "Operational Summary",
+    "Overall Risk Summary",
+)
+
+
+def _num(value: Any) -> str:
+    """
+    A score as returned: integers as is, other numbers with at most two
+    decimals.
+    """
+    if value is None:
+        return "not available"
+    if isinstance(value, int):
+        return str(value)
+    return f"{float(value):.2f}".rstrip("0").rstrip(".")
+
+
+def _list(items: Iterable[str]) -> str:
+    items = [i for i in items if i]
+    return ", ".join(items) if items else "none"
+
+
+def _notes(notes: List[str]) -> str:
+    """
+    Notes in first-seen order, repeated notes counted once with their count.
+    """
+    counts = Counter(notes)
+    return _list(
+        f"{note} ({counts[note]})" if counts[note] > 1 else note
+        for note in dict.fromkeys(notes)
+    )
+
+
+def _integrity_score(dedup: Dict[str, Any]) -> Any:
+    """
+    The Data Integrity Score: a stored record's data_integrity_score
+    (common.dedup.record_duplicate_check), else the input's similarity_score.
+    """
+    return dedup.get("data_integrity_score", dedup.get("similarity_score"))
+
+
+def data_integrity_section(dedup: Dict[str, Any]) -> str:
+    return _DATA_INTEGRITY.substitute(
+        input_supplier=dedup.get("input_supplier") or "",
+        matched_supplier=dedup.get("matched_supplier") or "none",
+        score=_num(_integrity_score(dedup)),
+        clarity=dedup.get("message") or "",
+    )
+
+
+def certification_section(certification: Dict[str, Any]) -> str:
+    breakdown = certification.get("status_breakdown") or {}
+    return _CERTIFICATION.substitute(
+        supplier_name=certification.get("supplier_name") or "",
+        supplier_id=certification.get("supplier_id") or "",
+        industry=certification.get("industry") or "unknown",
+        score=_num(certification.get("compliance_score")),
+        summary=certification.get("summary") or "",
+        valid=_list(breakdown.get("Valid", [])),
+        expired=_list(breakdown.get("Expired", [])),
+        missing=_list(breakdown.get("Missing", [])),
+        pending=_list(breakdown.get("Pending", [])),
+        issues=_list(i.get("detail") for i in certification.get("issues") or []),
+    )
+
+
+def operational_section(operational: Dict[str, Any]) -> str:
+    return _OPERATIONAL.substitute(
+        score=_num(operational.get("performance_score")),
+        delivery=_num(operational.get("delivery_score")),
+        quality=_num(operational.get("quality_score")),
+        invoice=_num(operational.get("invoice_score")),
+        notes=_notes(operational.get("notes") or []),
+    )
+
+
+def overall_section(scores: Dict[str, Any], contributions: Dict[str, float],
+                    total: float, level: str) -> str:
+    rows = "\n".join(
+        _ROW.substitute(
+            label=label,
+            score=_num(scores[key]),
+            weight=_num(int(round(TRUST_WEIGHTS[key] * 100))),
+            contribution=_num(contributions[key]),
+        )
+        for key, label in _COMPONENTS
+    )
+    return _OVERALL.substitute(rows=rows, trust_score=_num(total), risk_level=level)
+
+
+@metrics.timed("render")
+def render_report(dedup: Dict[str, Any], certification: Dict[str, Any],
+                  operational: Dict[str, Any],
+                  contributions: Optional[Dict[str, float]] = None,
+                  total: Optional[float] = None) -> str:
+    """
+    The four data sections of the report. `contributions` / `total` are
+    computed with common.trust_score when not given.
+    """
+    scores = {
+        "data_integrity": _integrity_score(dedup),
+        "certification": certification.get("compliance_score"),
+        "operational": operational.get("performance_score"),
+    }
+    if contributions is None:
+        contributions = weighted_contributions(**scores)
+    if total is None:
+        total = trust_score(**scores)
+    return "\n\n".join((
+        data_integrity_section(dedup),
+        certification_section(certification),
+        operational_section(operational),
+        overall_section(scores, contributions, total, risk_level(total)),
+    ))
+
+
+def render_trust_body(body: Dict[str, Any]) -> str:
+    """
+    render_report for a trust-score Lambda response body.
+    """
+    return render_report(
+        body["data_integrity"], body["certification"], body["operational"],
+        body.get("weighted_contributions"), body.get("trust_score"),
+    )
@@ -0,0 +1,333 @@
+"""
+Response cache for the supplier-keyed Lambdas.
+
+The Streamlit quick buttons ask about the same few suppliers over and over,
+and every call used to re-run all of its SQL. ResponseCache keeps finished
+response bodies keyed by the resolved supplier_id (plus a request variant:
+window parameters, the date the body was computed for):
+
+- an in-process LRU with TTL (LocalCache), kept across warm invocations.
+  supplier_scorecard.stale_since and stale_xid are set by the scorecard
+  triggers whenever a supplier's master row, certificates, performance
+  history, duplicate cluster or industry requirements change. At most
+  once every `refresh_seconds` the cache reads the suppliers changed by
+  transactions that had not committed at its previous poll (stale_xid at
+  or above that poll's oldest running transaction, ix_scorecard_stale_xid)
+  and drops their entries. Being keyed on transactions rather than on
+  time, the feed also sees long transactions such as bulk loads that
+  commit minutes after they marked a supplier,
+- optionally a shared backend: any object with get / set / delete, such as
+  RedisCache or, locally, another LocalCache. Other containers cannot
+  evict from our change feed, so shared entries carry the supplier's
+  stale_since at compute time and are checked against it with one
+  primary-key read before use.
+
+Every cached response reports a cache_status: "hit", "shared_hit", "miss"
+or "off" (RESPONSE_CACHE=false).
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+ENABLED = os.getenv("RESPONSE_CACHE", "true").lower() == "true"
+TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300"))
+REFRESH_SECONDS = float(os.getenv("RESPONSE_CACHE_REFRESH_SECONDS", "30"))
+MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+REDIS_URL = os.getenv("RESPONSE_CACHE_REDIS_URL", "")
+
+# Oldest transaction still running: every change the next statement cannot
+# see yet is written by this transaction or a later one.
+SQL_FEED_POSITION = """
+SELECT CAST(pg_snapshot_xmin(pg_current_snapshot()) AS TEXT);
+"""
+
+# Suppliers changed by transactions at or after a previous position. Changes
+# that were already visible then come back too; _seen filters them out.
+SQL_CHANGED_SUPPLIERS = """
+SELECT supplier_id, CAST(stale_since AS TEXT)
+FROM supplier_scorecard
+WHERE stale_xid >= CAST(:since AS XID8);
+"""
+
+SQL_SUPPLIER_VERSION = """
+SELECT CAST(stale_since AS TEXT)
+FROM supplier_scorecard
+WHERE supplier_id = :sid;
+"""
+
+
+class LocalCache:
+    """
+    Thread-safe LRU with a TTL per entry. Also the local stand-in for a
+    shared backend.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        # key -> (expires_at, value)
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < self.clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> List[str]:
+        """
+        Store a value; returns the keys evicted to make room.
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        evicted = []
+        with self._lock:
+            self._entries[key] = (self.clock() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[0])
+        return evicted
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCache:
+    """
+    Shared backend on Redis / ElastiCache. Needs the optional `redis`
+    package, imported on first use.
+    """
+
+    def __init__(self, url: str, prefix: str = "s360:"):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        self.client.set(self.prefix + key, json.dumps(value, default=str),
+                        ex=int(ttl_seconds) if ttl_seconds else None)
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self.client.delete(*(self.prefix + k for k in keys))
+
+
+def shared_backend_from_env():
+    """
+    RedisCache for RESPONSE_CACHE_REDIS_URL, or None.
+    """
+    if not REDIS_URL:
+        return None
+    try:
+        return RedisCache(REDIS_URL)
+    except Exception:
+        log.warning("Shared response cache unavailable; using the local cache only", exc_info=True)
+        return None
+
+
+class ResponseCache:
+    """
+    Response bodies of one Lambda (`kind`) keyed by supplier_id and variant.
+
+        body, cache_status = cache.get_or_compute(supplier.supplier_id, variant, compute)
+
+    `compute()` returns the body, or None for results that must not be
+    cached (not found, errors).
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        query: Callable[..., List[Tuple]],
+        ttl_seconds: float = TTL_SECONDS,
+        refresh_seconds: float = REFRESH_SECONDS,
+        max_entries: int = MAX_ENTRIES,
+        shared: Any = None,
+        enabled: bool = ENABLED,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.kind = kind
+        self.query = query
+        self.ttl_seconds = ttl_seconds
+        self.refresh_seconds = refresh_seconds
+        self.shared = shared
+        self.enabled = enabled
+        self.clock = clock
+
+        self.local = LocalCache(max_entries, ttl_seconds, clock)
+        self._lock = threading.Lock()
+        # supplier_id -> local keys, so a change evicts every variant; only
+        # keys still in self.local
+        self._keys: Dict[str, set] = {}
+        # change feed position (a transaction id), and the last stale_since
+        # seen per supplier (a poll returns changes it has already seen)
+        self._watermark: Optional[str] = None
+        self._seen: Dict[str, str] = {}
+        self._polled_at = 0.0
+        self.stats: Dict[str, int] = {
+            "hits": 0, "shared_hits": 0, "misses": 0, "invalidations": 0, "size": 0,
+        }
+
+    def _key(self, supplier_id: str, variant: str) -> str:
+        return f"{self.kind}:{supplier_id}:{variant}"
+
+    def _supplier_of(self, key: str) -> str:
+        return key[len(self.kind) + 1:].split(":", 1)[0]
+
+    def _forget(self, keys: List[str]) -> None:
+        """
+        Drop keys that left self.local from _keys (self._lock held).
+        """
+        for key in keys:
+            supplier_id = self._supplier_of(key)
+            owned = self._keys.get(supplier_id)
+            if owned is not None:
+                owned.discard(key)
+                if not owned:
+                    del self._keys[supplier_id]
+
+    # ----- invalidation -----
+    def _poll(self) -> None:
+        now = self.clock()
+        if self._watermark is not None and now - self._polled_at < self.refresh_seconds:
+            return
+        self._polled_at = now
+
+        # Taken before the changes are read, so nothing committed in between
+        # is skipped by the next poll.
+        rows = self.query(SQL_FEED_POSITION)
+        position = rows[0][0] if rows else None
+        if self._watermark is None:
+            self._watermark = position
+            return
+
+        changed = []
+        for supplier_id, stale_since in self.query(SQL_CHANGED_SUPPLIERS, {"since": self._watermark}):
+            if self._seen.get(supplier_id) == stale_since:
+                continue
+            self._seen[supplier_id] = stale_since
+            changed.append(supplier_id)
+        if position is not None:
+            self._watermark = position
+        # Only changes since the oldest running transaction need remembering.
+        if len(self._seen) > 10 * self.local.max_entries:
+            self._seen.clear()
+        if changed:
+            self.invalidate(changed)
+
+    def invalidate(self, supplier_ids: Optional[List[str]] = None) -> None:
+        """
+        Drop the entries of these suppliers (all entries when None).
+        """
+        with self._lock:
+            if supplier_ids is None:
+                self.local.clear()
+                self._keys.clear()
+                self.stats["size"] = 0
+                return
+            for supplier_id in supplier_ids:
+                keys = self._keys.pop(supplier_id, ())
+                if keys:
+                    self.local.delete(*keys)
+                    self.stats["invalidations"] += len(keys)
+            self.stats["size"] = len(self.local)
+
+    def version(self, supplier_id: str) -> str:
+        """
+        The supplier's stale_since ("" without a scorecard row).
+        """
+        rows = self.query(SQL_SUPPLIER_VERSION, {"sid": supplier_id})
+        return rows[0][0] if rows else ""
+
+    # ----- lookup -----
+    def _shared_get(self, key: str, supplier_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            entry = self.shared.get(key)
+        except Exception:
+            log.warning("Shared response cache get failed", exc_info=True)
+            return None
+        if not entry or entry.get("version") != self.version(supplier_id):
+            return None
+        return entry["body"]
+
+    def _shared_set(self, key: str, version: str, body: Dict[str, Any]) -> None:
+        try:
+            self.shared.set(key, {"version": version, "body": body}, self.ttl_seconds)
+        except Exception:
+            log.warning("Shared response cache set failed", exc_info=True)
+
+    def _put_local(self, supplier_id: str, key: str, body: Dict[str, Any]) -> None:
+        with self._lock:
+            evicted = self.local.set(key, body)
+            self._keys.setdefault(supplier_id, set()).add(key)
+            self._forget(evicted)
+            self.stats["size"] = len(self.local)
+
+    def get_or_compute(
+        self,
+        supplier_id: str,
+        variant: str,
+        compute: Callable[[], Optional[Dict[str, Any]]],
+    ) -> Tuple[Optional[Dict[str, Any]], str]:
+        """
+        (body, cache_status). Cached bodies are shared between calls; the
+        caller must copy before changing one.
+        """
+        if not self.enabled:
+            return compute(), "off"
+
+        self._poll()
+        key = self._key(supplier_id, variant)
+
+        body = self.local.get(key)
+        if body is not None:
+            self.stats["hits"] += 1
+            return body, "hit"
+        with self._lock:
+            # Missing or expired: no longer in self.local
+            self._forget([key])
+
+        if self.shared is not None:
+            body = self._shared_get(key, supplier_id)
+            if body is not None:
+                self.stats["shared_hits"] += 1
+                self._put_local(supplier_id, key, body)
+                return body, "shared_hit"
+
+        self.stats["misses"] += 1
+        # Read the version before computing: a change made meanwhile then
+        # leaves the shared entry out of date rather than marked current.
+        version = self.version(supplier_id) if self.shared is not None else ""
+        body = compute()
+        if body is not None:
+            self._put_local(supplier_id, key, body)
+            if self.shared is not None:
+                self._shared_set(key, version, body)
+        return body, "miss"
@@ -0,0 +1,169 @@
+"""
+Supplier score history from supplier_score_snapshots.
+
+Answers "how did this supplier's scores move between two dates" from the
+precomputed snapshot rows (backend/jobs/score_snapshots.py) instead of
+rescoring certificates and orders. One statement per request: the
+supplier's snapshots in the range are read off the (supplier_id,
+snapshot_date) primary key of the year partitions the range touches and
+downsampled in the database to one point per day, week, month, quarter or
+year, so the response size depends on the number of periods, not on the
+number of snapshots.
+
+Each point holds the snapshot at the end of its period (agg "last", the
+default: scores are states, not amounts) or the period's average, minimum
+or maximum. interval "auto" picks the finest period that keeps the range
+within `max_points` points.
+"""
+
+import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Snapshot columns returned for every point.
+SCORE_COLUMNS = (
+    "compliance_score",
+    "delivery_score",
+    "quality_score",
+    "invoice_score",
+    "performance_score",
+    "trust_score",
+    "order_count",
+)
+
+# date_trunc() field -> approximate length in days, finest first.
+INTERVALS = {"day": 1, "week": 7, "month": 30, "quarter": 91, "year": 365}
+
+AGGREGATES = {
+    "last": "(ARRAY_AGG({column} ORDER BY snapshot_date DESC))[1]",
+    "avg": "ROUND(AVG({column}), 2)",
+    "min": "MIN({column})",
+    "max": "MAX({column})",
+}
+
+DEFAULT_DAYS = 730
+DEFAULT_MAX_POINTS = 60
+
+_SELECT = """
+SELECT CAST(date_trunc(:interval, snapshot_date) AS DATE) AS period,
+       MAX(snapshot_date) AS as_of,
+       COUNT(*) AS snapshots,
+       {columns}
+FROM supplier_score_snapshots
+WHERE supplier_id = :sid
+  AND snapshot_date >= CAST(:start_date AS DATE)
+  AND snapshot_date <= CAST(:end_date AS DATE)
+GROUP BY 1
+ORDER BY 1;
+"""
+
+_FIELDS = ("period", "as_of", "snapshots") + SCORE_COLUMNS
+# Integer columns, returned as floats only for agg "avg".
+_INTEGER = ("compliance_score", "order_count")
+
+
+class HistoryError(ValueError):
+    """
+    Invalid history request (bad date, range, interval or agg).
+    """
+
+
+def parse_date(value: Any, name: str) -> datetime.date:
+    if isinstance(value, datetime.date):
+        return value
+    try:
+        return datetime.date.fromisoformat(str(value).strip())
+    except ValueError as e:
+        raise HistoryError(f"{name} must be a date (YYYY-MM-DD)") from e
+
+
+def pick_interval(start: datetime.date, end: datetime.date,
+                  max_points: int = DEFAULT_MAX_POINTS) -> str:
+    """
+    The finest interval with at most `max_points` periods in [start, end].
+    """
+    days = (end - start).days + 1
+    for interval, length in INTERVALS.items():
+        if days / length <= max_points:
+            return interval
+    return "year"
+
+
+def build_history_sql(supplier_id: str, start: datetime.date, end: datetime.date,
+                      interval: str = "auto", agg: str = "last",
+                      max_points: int = DEFAULT_MAX_POINTS) -> Tuple[str, Dict[str, Any]]:
+    """
+    Returns (sql, params). Only whitelisted aggregate templates are
+    interpolated; the interval is a parameter of date_trunc().
+    """
+    if end < start:
+        raise HistoryError("end_date must not be before start_date")
+    if interval == "auto":
+        interval = pick_interval(start, end, max_points)
+    if interval not in INTERVALS:
+        raise HistoryError(f"interval must be auto or one of {', '.join(INTERVALS)}")
+    if agg not in AGGREGATES:
+        raise HistoryError(f"agg must be one of {', '.join(AGGREGATES)}")
+
+    columns = ",\n       ".join(
+        f"{AGGREGATES[agg].format(column=c)} AS {c}" for c in SCORE_COLUMNS
+    )
+    params = {
+        "sid": supplier_id,
+        "interval": interval,
+        "start_date": start.isoformat(),
+        "end_date": end.isoformat(),
+    }
+    return _SELECT.format(columns=columns), params
+
+
+def _decode(row: Tuple, agg: str) -> Dict[str, Any]:
+    out = dict(zip(_FIELDS, row))
+    for key in SCORE_COLUMNS:
+        if out[key] is not None:
+            out[key] = float(out[key])
+    if agg != "avg":
+        for key in _INTEGER:
+            if out[key] is not None:
+                out[key] = int(out[key])
+    out["snapshots"] = int(out["snapshots"])
+    out["period"] = str(out["period"])
+    out["as_of"] = str(out["as_of"])
+    return out
+
+
+def score_history(query: Callable[..., List[Tuple]], supplier_id: str,
+                  start: Optional[Any] = None, end: Optional[Any] = None,
+                  interval: str = "auto", agg: str = "last",
+                  max_points: int = DEFAULT_MAX_POINTS) -> Dict[str, Any]:
+    """
+    Downsampled score history of one supplier. `query` is
+    common.rds_client.query. `end` defaults to today and `start` to
+    DEFAULT_DAYS before it; `change` is last point minus first point.
+    """
+    end = parse_date(end, "end_date") if end else datetime.date.today()
+    start = parse_date(start, "start_date") if start else end - datetime.timedelta(days=DEFAULT_DAYS)
+    interval = (interval or "auto").lower()
+    agg = (agg or "last").lower()
+
+    sql, params = build_history_sql(supplier_id, start, end, interval, agg, max_points)
+    points = [_decode(r, agg) for r in query(sql, params)]
+
+    change = {}
+    if points:
+        first, last = points[0], points[-1]
+        change = {
+            c: round(last[c] - first[c], 2)
+            for c in SCORE_COLUMNS
+            if c != "order_count" and first[c] is not None and last[c] is not None
+        }
+
+    return {
+        "supplier_id": supplier_id,
+        "start_date": start.isoformat(),
+        "end_date": end.isoformat(),
+        "interval": params["interval"],
+        "agg": agg,
+        "count": len(points),
+        "points": points,
+        "change": change,
+    }
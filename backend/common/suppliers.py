@@ -0,0 +1,190 @@
+"""
+Supplier resolution shared by the Lambdas.
+
+`supplier_id = :sid OR LOWER(supplier_name) = LOWER(:sname)` cannot use an
+index for both branches, so Postgres scanned supplier_master on every
+request. Resolution is split instead:
+
+- by supplier_id through the primary key,
+- by name through supplier_master.supplier_name_norm (indexed, generated by
+  the normalize_supplier_name() SQL function). "Dow Inc.", "DOW, INC" and
+  "Dow" all resolve to the same row; when several suppliers share a
+  normalized name, the one that also matches with its legal suffix
+  (ignoring case and punctuation) wins. Without such a match, suppliers
+  with different legal names ("Acme Co", "Acme Ltd" for "Acme") are not
+  merged: by_name() returns an AmbiguousName listing them.
+
+SupplierResolver keeps resolved suppliers in warm containers, keyed by id
+and by the requested name, for `ttl_seconds` (renames and deletes show up
+after at most that long).
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from .name_index import normalize_name
+
+# Trailing legal-form tokens of an already normalized name. Same list as the
+# normalize_supplier_name() SQL function in db/schema/schema.sql.
+LEGAL_SUFFIXES = (
+    "inc", "incorporated", "corp", "corporation", "co", "company", "ltd", "limited",
+    "llc", "l l c", "llp", "lp", "plc", "p l c",
+    "gmbh", "ag", "kg", "kgaa", "se", "sa", "s a", "nv", "n v", "bv", "b v",
+    "spa", "s p a", "srl", "s r l", "oy", "oyj", "ab", "asa", "pte", "pty", "kk", "bhd",
+)
+_LEGAL_SUFFIX = re.compile("( (" + "|".join(LEGAL_SUFFIXES) + "))+$")
+
+SQL_SUPPLIER_BY_ID = """
+SELECT supplier_id, supplier_name, industry
+FROM supplier_master
+WHERE supplier_id = :sid;
+"""
+
+SQL_SUPPLIER_BY_NAME = """
+SELECT supplier_id, supplier_name, industry
+FROM supplier_master
+WHERE supplier_name_norm = :sname_norm
+ORDER BY (btrim(regexp_replace(LOWER(supplier_name), '[^0-9a-z]+', ' ', 'g')) = :sname_flat) DESC,
+         supplier_id
+LIMIT :max_candidates;
+"""
+
+# Suppliers listed in an AmbiguousName.
+MAX_NAME_CANDIDATES = 10
+
+
+def normalize_supplier_name(name: Optional[str]) -> str:
+    """
+    Lookup form of a supplier name: normalize_name() without trailing legal
+    suffixes ("Dow Inc." -> "dow", "Acme Co., Ltd." -> "acme"). A name that
+    is only a suffix ("SE") is kept as is.
+    """
+    return _LEGAL_SUFFIX.sub("", normalize_name(name))
+
+
+class Supplier(NamedTuple):
+    supplier_id: str
+    supplier_name: str
+    industry: str
+
+
+class AmbiguousName(NamedTuple):
+    """
+    A name that matches several suppliers only once their legal suffixes
+    are stripped.
+    """
+    candidates: Tuple[Supplier, ...]
+
+    def body(self, supplier_input: Any) -> Dict[str, Any]:
+        """
+        Error body for a Lambda response (HTTP 409).
+        """
+        return {
+            "error": "Ambiguous supplier name",
+            "input": supplier_input,
+            "candidates": [
+                {"supplier_id": c.supplier_id, "supplier_name": c.supplier_name}
+                for c in self.candidates
+            ],
+        }
+
+
+def pick_supplier(rows: List[Tuple], sname_flat: str) -> Union[Supplier, AmbiguousName, None]:
+    """
+    The supplier for SQL_SUPPLIER_BY_NAME rows: the first one if it matches
+    with its legal suffix or all rows share one legal name (duplicate
+    records), an AmbiguousName otherwise.
+    """
+    suppliers = [Supplier(*row) for row in rows]
+    if not suppliers:
+        return None
+    legal_names = {normalize_name(s.supplier_name) for s in suppliers}
+    if normalize_name(suppliers[0].supplier_name) == sname_flat or len(legal_names) == 1:
+        return suppliers[0]
+    return AmbiguousName(tuple(suppliers))
+
+
+class SupplierResolver:
+    """
+    Resolves a supplier_id and/or supplier_name to one supplier_master row
+    (or an AmbiguousName). The id wins when both are given and it exists.
+    """
+
+    def __init__(
+        self,
+        query: Callable[..., List[Tuple]],
+        ttl_seconds: float = 300,
+        max_entries: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.query = query
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        # ("id", supplier_id) / ("name", normalize_name(input))
+        #   -> (expires_at, Supplier or AmbiguousName)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        # Updated under the lock.
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "size": 0}
+
+    def _get(self, key: Tuple[str, str]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < self.clock():
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def _put(self, key: Tuple[str, str], supplier: Any) -> None:
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl_seconds, supplier)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.stats["size"] = len(self._entries)
+
+    def _lookup(self, key: Tuple[str, str], sql: str, params: Dict[str, Any],
+                pick: Callable[[List[Tuple]], Any]) -> Any:
+        supplier = self._get(key)
+        if supplier is not None:
+            return supplier
+        supplier = pick(self.query(sql, params))
+        if supplier is None:
+            return None
+        self._put(key, supplier)
+        if isinstance(supplier, Supplier):
+            self._put(("id", supplier.supplier_id), supplier)
+        return supplier
+
+    def by_id(self, supplier_id: str) -> Optional[Supplier]:
+        return self._lookup(("id", supplier_id), SQL_SUPPLIER_BY_ID, {"sid": supplier_id},
+                            lambda rows: Supplier(*rows[0]) if rows else None)
+
+    def by_name(self, supplier_name: str) -> Union[Supplier, AmbiguousName, None]:
+        flat = normalize_name(supplier_name)
+        norm = normalize_supplier_name(supplier_name)
+        if not norm:
+            return None
+        return self._lookup(("name", flat), SQL_SUPPLIER_BY_NAME,
+                            {"sname_norm": norm, "sname_flat": flat,
+                             "max_candidates": MAX_NAME_CANDIDATES},
+                            lambda rows: pick_supplier(rows, flat))
+
+    def resolve(self, supplier_id: Optional[str] = None,
+                supplier_name: Optional[str] = None) -> Union[Supplier, AmbiguousName, None]:
+        supplier = self.by_id(supplier_id) if supplier_id else None
+        if supplier is None and supplier_name:
+            supplier = self.by_name(supplier_name)
+        return supplier
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.stats["size"] = 0
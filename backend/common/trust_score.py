@@ -0,0 +1,70 @@
+"""
+Supplier Trust Score.
+
+    Trust Score = Data Integrity Score x 0.30
+                + Certification Score  x 0.30
+                + Operational Score    x 0.40
+
+Data Integrity is the supplier record's data_integrity_score
+(common.dedup.record_integrity_score), Certification the compliance_score
+and Operational the performance_score. These are the same
+weights the agent's system prompt uses.
+
+The final risk classification is Low from RISK_LOW_MIN (default 80),
+Medium from RISK_MEDIUM_MIN (default 60) and High below. The system prompt
+states the defaults for its fallback path, so keep it in step when
+changing them.
+"""
+
+import os
+from typing import Dict, Optional
+
+TRUST_WEIGHTS = {
+    "data_integrity": 0.30,
+    "certification": 0.30,
+    "operational": 0.40,
+}
+
+RISK_LOW_MIN = float(os.getenv("RISK_LOW_MIN", "80"))
+RISK_MEDIUM_MIN = float(os.getenv("RISK_MEDIUM_MIN", "60"))
+
+
+def weighted_contributions(
+    data_integrity: Optional[float],
+    certification: Optional[float],
+    operational: Optional[float],
+) -> Dict[str, float]:
+    """
+    Each component's score times its weight, rounded to 2 decimals.
+    A missing component contributes 0.
+    """
+    scores = {
+        "data_integrity": data_integrity,
+        "certification": certification,
+        "operational": operational,
+    }
+    return {
+        key: round(float(scores[key] or 0) * weight, 2)
+        for key, weight in TRUST_WEIGHTS.items()
+    }
+
+
+def trust_score(
+    data_integrity: Optional[float],
+    certification: Optional[float],
+    operational: Optional[float],
+) -> float:
+    contributions = weighted_contributions(data_integrity, certification, operational)
+    return round(sum(contributions.values()), 2)
+
+
+def risk_level(score: Optional[float]) -> str:
+    """
+    Low, Medium or High for a Trust Score.
+    """
+    score = float(score or 0)
+    if score >= RISK_LOW_MIN:
+        return "Low"
+    if score >= RISK_MEDIUM_MIN:
+        return "Medium"
+    return "High"
@@ -0,0 +1,7 @@
+"""
+Offline / batch jobs for Supplier360.
+
+Run from the `backend/` directory, e.g.:
+
+    python -m jobs.dedup_batch vendors.csv -o results.jsonl
+"""
@@ -0,0 +1,671 @@
+"""
+Streaming bulk loader for supplier_master, compliance_certificates and
+supplier_performance_history.
+
+    python -m jobs.bulk_load suppliers suppliers.csv.gz --workers 4
+    python -m jobs.bulk_load certificates certificates.jsonl --rejects rejects.jsonl
+    python -m jobs.bulk_load performance orders.csv --chunk-size 10000 --refresh-scorecards
+
+Input is CSV with a header row or JSONL objects, keyed by column name
+(gzip-compressed when the file name ends in .gz). It is read in
+--chunk-size row chunks, and at most two chunks per worker are in memory.
+
+Every row is checked against the db/schema/schema.sql constraints before it
+is sent: NOT NULL, types, VARCHAR/CHAR lengths, DECIMAL precision, the
+supplier_id foreign key and the unique registration_number. Rows that fail
+go to --rejects with their input line and the reason, and so do lines that
+cannot be read as a row (invalid JSON, JSON that is not an object, CSV
+lines with more fields than the header); a key repeated within a chunk
+keeps its last row.
+
+A chunk is not loaded concurrently with an earlier chunk that has a key or
+unique value in common: it waits until that chunk is committed. Repeated
+keys are then applied in input order, a unique value reused by a later
+chunk is caught against the database, and --set-based chunks never adjust
+the performance buckets for the same order at the same time. Only the keys
+of the chunks in flight are held in memory.
+
+Valid rows are upserted on the primary key, so loading a row twice is
+harmless (and unchanged rows are not rewritten):
+- DB_BACKEND=psycopg: COPY into a temporary staging table, then one
+  INSERT ... SELECT ... ON CONFLICT, in one transaction per chunk,
+- Data API: batch_execute_statement, --batch-size rows per call.
+Failed chunks are retried (deadlocks between workers updating the same
+supplier's buckets are expected on busy loads).
+
+The schema's row triggers keep derived data current as rows land: scorecard
+rows are marked stale, the performance buckets are adjusted and
+supplier_master.updated_at feeds the warm name-index and response caches.
+After a suppliers load supplier_duplicate_clusters is rebuilt
+(jobs.dedup_clusters; --no-clusters skips it), and --refresh-scorecards
+then recomputes the stale scorecards.
+
+Row triggers cost most of the load time (about 10x on performance history).
+With --set-based (COPY only, needs rds_superuser) they are switched off for
+each chunk's transaction and the chunk does the same upkeep in a few
+set-based statements: stale scorecard rows, performance bucket deltas and
+updated_at.
+
+Progress (rows/s) is logged every --progress-seconds. The checkpoint file
+(default <input>.checkpoint) records how many input rows are done; a rerun
+with the same arguments skips them, and the file is removed once the input
+is fully loaded.
+"""
+
+import argparse
+import csv
+import datetime
+import decimal
+import gzip
+import io
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from common import rds_client
+
+log = logging.getLogger(__name__)
+
+
+class Column(NamedTuple):
+    name: str
+    kind: str                     # varchar, char, int, bigint, decimal, date, bool
+    size: Optional[int] = None    # varchar/char length, decimal precision
+    scale: int = 0                # decimal scale
+    nullable: bool = False
+
+
+class TableSpec(NamedTuple):
+    table: str
+    key: str
+    columns: Tuple[Column, ...]
+    references_supplier: bool = False
+    unique: Tuple[str, ...] = ()
+    touch: Optional[str] = None   # set to CURRENT_TIMESTAMP when a row changes
+
+
+# Mirrors db/schema/schema.sql (generated and defaulted columns excluded).
+TABLES: Dict[str, TableSpec] = {
+    "suppliers": TableSpec(
+        "supplier_master", "supplier_id", (
+            Column("supplier_id", "varchar", 12),
+            Column("supplier_name", "varchar", 100),
+            Column("registration_number", "char", 6),
+            Column("country", "varchar", 60),
+            Column("industry", "varchar", 60),
+            Column("annual_revenue", "bigint"),
+            Column("employees", "int"),
+            Column("onboarding_date", "date"),
+        ),
+        unique=("registration_number",),
+        touch="updated_at",
+    ),
+    "certificates": TableSpec(
+        "compliance_certificates", "certificate_id", (
+            Column("certificate_id", "varchar", 12),
+            Column("supplier_id", "varchar", 12),
+            Column("certificate_type", "varchar", 60),
+            Column("certificate_number", "varchar", 24),
+            Column("issuing_body", "varchar", 60),
+            Column("issue_date", "date"),
+            Column("expiry_date", "date", nullable=True),
+            Column("valid_status", "varchar", 12),
+            Column("required", "bool"),
+            Column("notes", "varchar", 200, nullable=True),
+        ),
+        references_supplier=True,
+    ),
+    "performance": TableSpec(
+        "supplier_performance_history", "order_id", (
+            Column("order_id", "varchar", 12),
+            Column("supplier_id", "varchar", 12),
+            Column("order_date", "date"),
+            Column("promised_delivery_date", "date"),
+            Column("actual_delivery_date", "date"),
+            Column("on_time", "bool"),
+            Column("delivery_delay_days", "int", nullable=True),
+            Column("quality_compliance_pct", "decimal", 5, 2, nullable=True),
+            Column("invoice_match_pct", "decimal", 5, 2, nullable=True),
+            Column("incidents", "int", nullable=True),
+            Column("notes", "varchar", 200, nullable=True),
+        ),
+        references_supplier=True,
+    ),
+}
+
+SQL_EXISTING_SUPPLIERS = """
+SELECT supplier_id
+FROM supplier_master
+WHERE supplier_id IN (SELECT jsonb_array_elements_text(CAST(:ids AS JSONB)));
+"""
+
+SQL_UNIQUE_OWNERS = """
+SELECT {column}, {key}
+FROM {table}
+WHERE {column} IN (SELECT jsonb_array_elements_text(CAST(:values AS JSONB)));
+"""
+
+class BadLine(NamedTuple):
+    """
+    An input line that could not be read as a row.
+    """
+    error: str
+    text: str
+
+
+_INT_BOUNDS = {"int": 2 ** 31, "bigint": 2 ** 63}
+_TRUE = {"true", "t", "1", "yes", "y"}
+_FALSE = {"false", "f", "0", "no", "n"}
+
+
+# ---------- Reading ----------
+def _open(path: str):
+    if path.endswith(".gz"):
+        return io.TextIOWrapper(gzip.open(path, "rb"), encoding="utf-8", newline="")
+    return open(path, encoding="utf-8", newline="")
+
+
+def read_rows(path: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Stream (line number, row) pairs from a CSV or JSONL file. CSV empty
+    fields become None, as with COPY ... CSV. A line that is not valid
+    JSON, or a CSV line with more fields than the header, is yielded as a
+    BadLine.
+    """
+    with _open(path) as fh:
+        if path.endswith((".jsonl", ".ndjson", ".jsonl.gz", ".ndjson.gz")):
+            for line_no, line in enumerate(fh, 1):
+                if line.strip():
+                    try:
+                        yield line_no, json.loads(line)
+                    except ValueError as e:
+                        yield line_no, BadLine(f"invalid JSON: {e}", line.rstrip("\r\n"))
+        else:
+            reader = csv.DictReader(fh)
+            for row in reader:
+                if None in row:
+                    yield reader.line_num, BadLine("more fields than the header",
+                                                   ",".join(str(v) for v in row.values()))
+                    continue
+                yield reader.line_num, {k: (v if v != "" else None) for k, v in row.items()}
+
+
+def _chunks(items: Iterator, size: int) -> Iterator[List]:
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# ---------- Validation ----------
+def _convert(col: Column, raw: Any) -> Any:
+    if raw is None or raw == "":
+        if not col.nullable:
+            raise ValueError(f"{col.name} is required")
+        return None
+
+    kind = col.kind
+    if kind in ("varchar", "char"):
+        value = str(raw)
+        if len(value) > col.size:
+            raise ValueError(f"{col.name} is longer than {col.size} characters")
+        return value
+    if kind in ("int", "bigint"):
+        if isinstance(raw, bool) or (isinstance(raw, float) and not raw.is_integer()):
+            raise ValueError(f"{col.name} must be an integer")
+        value = int(raw)
+        bound = _INT_BOUNDS[kind]
+        if not -bound <= value < bound:
+            raise ValueError(f"{col.name} is out of range for {kind.upper()}")
+        return value
+    if kind == "decimal":
+        value = decimal.Decimal(str(raw)).quantize(
+            decimal.Decimal(1).scaleb(-col.scale), rounding=decimal.ROUND_HALF_UP)
+        if not value.is_finite() or abs(value) >= 10 ** (col.size - col.scale):
+            raise ValueError(f"{col.name} does not fit DECIMAL({col.size},{col.scale})")
+        return value
+    if kind == "date":
+        if isinstance(raw, datetime.date):
+            return raw
+        return datetime.date.fromisoformat(str(raw))
+    if kind == "bool":
+        if isinstance(raw, bool):
+            return raw
+        text = str(raw).strip().lower()
+        if text in _TRUE:
+            return True
+        if text in _FALSE:
+            return False
+        raise ValueError(f"{col.name} must be a boolean")
+    raise AssertionError(kind)
+
+
+def validate_row(spec: TableSpec, row: Any) -> Tuple[Any, ...]:
+    """
+    Typed values in spec.columns order; ValueError names the first problem.
+    """
+    if not isinstance(row, dict):
+        raise ValueError(f"row must be an object, not {type(row).__name__}")
+    values = []
+    for col in spec.columns:
+        try:
+            values.append(_convert(col, row.get(col.name)))
+        except (ValueError, TypeError, decimal.InvalidOperation) as e:
+            if str(e).startswith(col.name):
+                raise
+            raise ValueError(f"{col.name}: invalid value {row.get(col.name)!r}") from None
+    return tuple(values)
+
+
+class Chunk(NamedTuple):
+    end: int                               # input rows read up to this chunk's end
+    rows: List[Tuple[int, Tuple[Any, ...]]]
+    rejects: List[Dict[str, Any]]
+
+
+def validate_chunk(spec: TableSpec, items: List[Tuple[int, Any]], end: int) -> Chunk:
+    """
+    Validate the rows of one chunk. A unique value may only be used by one
+    key within the chunk; other chunks and the database are checked by
+    chunk_claims() and check_constraints(). A later row for a key replaces
+    the earlier one and releases the unique values only that row used.
+    """
+    names = [c.name for c in spec.columns]
+    key = names.index(spec.key)
+    unique = [(column, names.index(column)) for column in spec.unique]
+    claims: Dict[str, Dict[Any, Any]] = {column: {} for column in spec.unique}
+    by_key: Dict[Any, Tuple[int, Tuple[Any, ...]]] = {}
+    rejects = []
+    for line_no, row in items:
+        if isinstance(row, BadLine):
+            rejects.append({"line": line_no, "error": row.error, "row": row.text})
+            continue
+        try:
+            values = validate_row(spec, row)
+            for column, idx in unique:
+                owner = claims[column].get(values[idx], values[key])
+                if owner != values[key]:
+                    raise ValueError(f"{column} {values[idx]} is already used by {owner} (input)")
+        except ValueError as e:
+            rejects.append({"line": line_no, "error": str(e), "row": row})
+            continue
+        previous = by_key.pop(values[key], None)
+        for column, idx in unique:
+            if previous is not None:
+                claims[column].pop(previous[1][idx], None)
+            claims[column][values[idx]] = values[key]
+        by_key[values[key]] = (line_no, values)
+    return Chunk(end, list(by_key.values()), rejects)
+
+
+def chunk_claims(spec: TableSpec, chunk: Chunk) -> set:
+    """
+    The keys and unique values a chunk writes, as (column, value) pairs.
+    Chunks whose claims intersect must not be loaded concurrently.
+    """
+    names = [c.name for c in spec.columns]
+    columns = [(column, names.index(column)) for column in (spec.key,) + spec.unique]
+    return {(column, values[idx]) for _, values in chunk.rows for column, idx in columns
+            if values[idx] is not None}
+
+
+def check_constraints(spec: TableSpec, chunk: Chunk, query: Callable) -> Chunk:
+    """
+    Drop rows whose supplier_id does not exist, or whose unique value
+    belongs to another row in the database.
+    """
+    names = [c.name for c in spec.columns]
+    rows, rejects = chunk.rows, list(chunk.rejects)
+
+    if spec.references_supplier and rows:
+        sid = names.index("supplier_id")
+        wanted = sorted({values[sid] for _, values in rows})
+        found = {r[0] for r in query(SQL_EXISTING_SUPPLIERS, {"ids": json.dumps(wanted)})}
+        kept = []
+        for line_no, values in rows:
+            if values[sid] in found:
+                kept.append((line_no, values))
+            else:
+                rejects.append({"line": line_no, "error": f"supplier_id {values[sid]} does not exist",
+                                "row": dict(zip(names, values))})
+        rows = kept
+
+    key = names.index(spec.key)
+    for column in spec.unique:
+        if not rows:
+            break
+        idx = names.index(column)
+        wanted = sorted({values[idx] for _, values in rows if values[idx] is not None})
+        sql = SQL_UNIQUE_OWNERS.format(column=column, key=spec.key, table=spec.table)
+        owner = {str(r[0]).rstrip(): r[1] for r in query(sql, {"values": json.dumps(wanted)})}
+        kept = []
+        for line_no, values in rows:
+            value = values[idx]
+            if owner.get(value, values[key]) != values[key]:
+                rejects.append({"line": line_no,
+                                "error": f"{column} {value} already belongs to {owner[value]}",
+                                "row": dict(zip(names, values))})
+            else:
+                kept.append((line_no, values))
+        rows = kept
+
+    rejects.sort(key=lambda r: r["line"])
+    return Chunk(chunk.end, rows, rejects)
+
+
+# ---------- Writing ----------
+def _upsert_sql(spec: TableSpec, source: str, returning: str = "") -> str:
+    names = [c.name for c in spec.columns]
+    updated = [n for n in names if n != spec.key]
+    assignments = [f"{n} = EXCLUDED.{n}" for n in updated]
+    if spec.touch:
+        assignments.append(f"{spec.touch} = CURRENT_TIMESTAMP")
+    return (
+        f"INSERT INTO {spec.table} AS t ({', '.join(names)})\n{source}\n"
+        f"ON CONFLICT ({spec.key}) DO UPDATE SET {', '.join(assignments)}\n"
+        f"WHERE ({', '.join('t.' + n for n in updated)}) IS DISTINCT FROM "
+        f"({', '.join('EXCLUDED.' + n for n in updated)})"
+        + (f"\nRETURNING {returning}" if returning else "")
+    )
+
+
+# Set-based upkeep for --set-based loads, where the row triggers are off.
+# {written} holds the keys the upsert inserted or changed, {old} the previous
+# version of those rows. Their suppliers' scorecards go stale, and the new
+# rows are added to the performance buckets and the old ones taken out, as
+# mark_scorecard_stale() and perf_buckets_apply() do row by row.
+SQL_MARK_STALE = """
+INSERT INTO supplier_scorecard AS sc (supplier_id, stale, stale_since, stale_xid)
+SELECT supplier_id, TRUE, clock_timestamp(), pg_current_xact_id()
+FROM (
+  SELECT supplier_id FROM {written}
+  UNION
+  SELECT o.supplier_id FROM {old} o JOIN {written} w USING ({key})
+) ids
+ON CONFLICT (supplier_id) DO UPDATE
+  SET stale = TRUE, stale_since = EXCLUDED.stale_since, stale_xid = EXCLUDED.stale_xid;
+"""
+
+_BUCKET_ADD = """
+    order_count = t.order_count + EXCLUDED.order_count, delivery_sum = t.delivery_sum + EXCLUDED.delivery_sum,
+    quality_sum = t.quality_sum + EXCLUDED.quality_sum, quality_count = t.quality_count + EXCLUDED.quality_count,
+    invoice_sum = t.invoice_sum + EXCLUDED.invoice_sum, invoice_count = t.invoice_count + EXCLUDED.invoice_count,
+    incidents_sum = t.incidents_sum + EXCLUDED.incidents_sum"""
+
+SQL_BUCKET_DELTAS = f"""
+WITH r AS (
+  SELECT 1 AS sign, s.* FROM {{stage}} s JOIN {{written}} USING (order_id)
+  UNION ALL
+  SELECT -1, o.* FROM {{old}} o JOIN {{written}} USING (order_id)
+), d AS (
+  SELECT supplier_id, order_date AS bucket_date, SUM(sign) AS n,
+         SUM(sign * perf_delivery_score(on_time, delivery_delay_days)) AS d,
+         SUM(sign * COALESCE(quality_compliance_pct, 0)) AS q,
+         SUM(sign * (quality_compliance_pct IS NOT NULL)::INT) AS qc,
+         SUM(sign * COALESCE(invoice_match_pct, 0)) AS v,
+         SUM(sign * (invoice_match_pct IS NOT NULL)::INT) AS vc,
+         SUM(sign * COALESCE(incidents, 0)) AS i
+  FROM r
+  GROUP BY supplier_id, order_date
+), daily AS (
+  INSERT INTO supplier_performance_daily AS t
+  SELECT * FROM d
+  ON CONFLICT (supplier_id, bucket_date) DO UPDATE SET{_BUCKET_ADD}
+), monthly AS (
+  INSERT INTO supplier_performance_monthly AS t
+  SELECT supplier_id, date_trunc('month', bucket_date)::DATE,
+         SUM(n), SUM(d), SUM(q), SUM(qc), SUM(v), SUM(vc), SUM(i)
+  FROM d
+  GROUP BY supplier_id, date_trunc('month', bucket_date)
+  ON CONFLICT (supplier_id, bucket_month) DO UPDATE SET{_BUCKET_ADD}
+)
+INSERT INTO supplier_performance_totals AS t
+SELECT supplier_id, SUM(n), SUM(d), SUM(q), SUM(qc), SUM(v), SUM(vc), SUM(i)
+FROM d
+GROUP BY supplier_id
+ON CONFLICT (supplier_id) DO UPDATE SET{_BUCKET_ADD};
+"""
+
+
+def copy_chunk(pool, spec: TableSpec, rows: List[Tuple[Any, ...]], set_based: bool = False) -> None:
+    """
+    COPY into a session-local staging table and upsert from it, in one
+    transaction. With `set_based` the row triggers are switched off for the
+    transaction and their work is done in a few statements per chunk.
+    """
+    names = ", ".join(c.name for c in spec.columns)
+    stage, old, written = (f"load_{spec.table}", f"load_old_{spec.table}",
+                           f"load_written_{spec.table}")
+    with pool.connection() as conn:
+        with conn.transaction():
+            conn.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS {stage} "
+                f"(LIKE {spec.table} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+            )
+            with conn.cursor().copy(f"COPY {stage} ({names}) FROM STDIN") as copy:
+                for values in rows:
+                    copy.write_row(values)
+
+            if not set_based:
+                conn.execute(_upsert_sql(spec, f"SELECT {names} FROM {stage}"))
+                return
+
+            # Needs rds_superuser; also skips the foreign key triggers, which
+            # check_constraints() has covered.
+            conn.execute("SET LOCAL session_replication_role = replica")
+            returning = "supplier_id" if spec.key == "supplier_id" else f"{spec.key}, supplier_id"
+            conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS {old} (LIKE {spec.table}) ON COMMIT DELETE ROWS")
+            conn.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS {written} ON COMMIT DELETE ROWS AS "
+                f"SELECT {returning} FROM {spec.table} WITH NO DATA"
+            )
+            conn.execute(
+                f"INSERT INTO {old} SELECT t.* FROM {spec.table} t "
+                f"JOIN {stage} s USING ({spec.key}) ORDER BY t.{spec.key} FOR UPDATE OF t"
+            )
+            conn.execute(
+                f"WITH up AS ({_upsert_sql(spec, f'SELECT {names} FROM {stage}', returning)}) "
+                f"INSERT INTO {written} SELECT * FROM up"
+            )
+            conn.execute(SQL_MARK_STALE.format(written=written, old=old, key=spec.key))
+            if spec.table == "supplier_performance_history":
+                conn.execute(SQL_BUCKET_DELTAS.format(stage=stage, old=old, written=written))
+
+
+def batch_chunk(batch_exec_sql: Callable, spec: TableSpec, rows: List[Tuple[Any, ...]],
+                batch_size: int) -> None:
+    """
+    Data API path: batch_execute_statement calls of `batch_size` rows.
+    """
+    names = [c.name for c in spec.columns]
+    sql = _upsert_sql(spec, "VALUES (" + ", ".join(":" + n for n in names) + ")")
+    for start in range(0, len(rows), batch_size):
+        batch_exec_sql(sql, [
+            [rds_client.make_param(n, v) for n, v in zip(names, values)]
+            for values in rows[start:start + batch_size]
+        ])
+
+
+def load_chunk(spec: TableSpec, chunk: Chunk, write: Callable, retries: int = 3) -> Chunk:
+    """
+    Check constraints and upsert one chunk, retrying on failure.
+    """
+    for attempt in range(retries + 1):
+        try:
+            checked = check_constraints(spec, chunk, rds_client.query)
+            if checked.rows:
+                write([values for _, values in checked.rows])
+            return checked
+        except Exception as e:
+            if attempt == retries:
+                raise
+            log.warning("Chunk ending at row %d failed (%s); retrying", chunk.end, e)
+            time.sleep(0.5 * 2 ** attempt)
+
+
+# ---------- Checkpoint ----------
+def read_checkpoint(path: str, kind: str, input_path: str) -> Dict[str, int]:
+    if not os.path.exists(path):
+        return {"rows": 0, "loaded": 0, "rejected": 0}
+    with open(path, encoding="utf-8") as f:
+        state = json.load(f)
+    if state.get("kind") != kind or state.get("input") != os.path.abspath(input_path):
+        raise SystemExit(f"{path} belongs to another load ({state.get('kind')} {state.get('input')}); "
+                         "use --restart or another --checkpoint")
+    return state
+
+
+def write_checkpoint(path: str, kind: str, input_path: str, state: Dict[str, int]) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(dict(state, kind=kind, input=os.path.abspath(input_path)), f)
+    os.replace(tmp, path)
+
+
+# ---------- Driver ----------
+def _writer(method: str, spec: TableSpec, batch_size: int, set_based: bool) -> Callable:
+    backend = rds_client.get_backend()
+    if method == "auto":
+        method = "copy" if isinstance(backend, rds_client.PsycopgBackend) else "batch"
+    if method == "copy":
+        if not isinstance(backend, rds_client.PsycopgBackend):
+            raise SystemExit("--method copy needs DB_BACKEND=psycopg")
+        return lambda rows: copy_chunk(backend.pool, spec, rows, set_based)
+    if set_based:
+        raise SystemExit("--set-based needs the copy method (DB_BACKEND=psycopg)")
+    return lambda rows: batch_chunk(rds_client.batch_exec_sql, spec, rows, batch_size)
+
+
+def load(kind: str, path: str, checkpoint: str, rejects_path: Optional[str] = None,
+         workers: int = 4, chunk_size: int = 5000, batch_size: int = 500,
+         method: str = "auto", set_based: bool = False, retries: int = 3,
+         progress_seconds: float = 10) -> Dict[str, int]:
+    """
+    Load one input file; returns the row counts (including earlier runs).
+    """
+    spec = TABLES[kind]
+    write = _writer(method, spec, batch_size, set_based)
+    state = read_checkpoint(checkpoint, kind, path)
+    skip = state["rows"]
+    if skip:
+        log.info("Resuming %s after %d rows (checkpoint %s)", path, skip, checkpoint)
+
+    rows = islice(read_rows(path), skip, None)
+    rejects_out = open(rejects_path, "a" if skip else "w", encoding="utf-8") if rejects_path else None
+    start = last_report = time.perf_counter()
+    done_this_run = 0
+
+    def finish(result: Chunk) -> None:
+        nonlocal last_report, done_this_run
+        if rejects_out:
+            for reject in result.rejects:
+                rejects_out.write(json.dumps(reject, default=str) + "\n")
+            rejects_out.flush()
+        done_this_run += result.end - state["rows"]
+        state["rows"] = result.end
+        state["loaded"] += len(result.rows)
+        state["rejected"] += len(result.rejects)
+        write_checkpoint(checkpoint, kind, path, state)
+
+        now = time.perf_counter()
+        if now - last_report >= progress_seconds:
+            last_report = now
+            log.info("%d rows (%d loaded, %d rejected), %.0f rows/s", state["rows"],
+                     state["loaded"], state["rejected"], done_this_run / (now - start))
+
+    # Chunks are validated here and loaded by the workers; results are taken
+    # in input order, so the checkpoint only ever covers a finished prefix.
+    # A chunk that shares a key or unique value with a chunk in flight waits
+    # for it (and the chunks before it) to finish.
+    end = skip
+    with ThreadPoolExecutor(workers) as pool:
+        pending = deque()
+        try:
+            for items in _chunks(rows, chunk_size):
+                end += len(items)
+                chunk = validate_chunk(spec, items, end)
+                claims = chunk_claims(spec, chunk)
+                while pending and any(not claims.isdisjoint(c) for _, c in pending):
+                    finish(pending.popleft()[0].result())
+                pending.append((pool.submit(load_chunk, spec, chunk, write, retries), claims))
+                if len(pending) >= workers * 2:
+                    finish(pending.popleft()[0].result())
+            while pending:
+                finish(pending.popleft()[0].result())
+        finally:
+            for future, _ in pending:
+                future.cancel()
+            if rejects_out:
+                rejects_out.close()
+
+    elapsed = time.perf_counter() - start
+    log.info("Loaded %s into %s: %d rows (%d loaded, %d rejected) in %.1fs, %.0f rows/s",
+             path, spec.table, state["rows"], state["loaded"], state["rejected"],
+             elapsed, done_this_run / max(elapsed, 1e-9))
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    return state
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("kind", choices=list(TABLES))
+    ap.add_argument("input", help="CSV or JSONL file (optionally .gz)")
+    ap.add_argument("--checkpoint", help="progress file (default: <input>.checkpoint)")
+    ap.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    ap.add_argument("--rejects", help="JSONL file for rows that fail validation")
+    ap.add_argument("--workers", type=int, default=4, help="chunks loaded concurrently")
+    ap.add_argument("--chunk-size", type=int, default=5000)
+    ap.add_argument("--batch-size", type=int, default=500, help="rows per Data API batch call")
+    ap.add_argument("--method", choices=("auto", "copy", "batch"), default="auto",
+                    help="copy needs DB_BACKEND=psycopg; auto picks it when available")
+    ap.add_argument("--set-based", action="store_true",
+                    help="copy only: turn the row triggers off per chunk and maintain scorecard "
+                         "staleness and performance buckets with set-based statements "
+                         "(needs rds_superuser)")
+    ap.add_argument("--retries", type=int, default=3, help="retries per failed chunk")
+    ap.add_argument("--progress-seconds", type=float, default=10)
+    ap.add_argument("--refresh-scorecards", action="store_true",
+                    help="recompute stale supplier_scorecard rows after the load")
+    ap.add_argument("--no-clusters", action="store_true",
+                    help="suppliers only: do not rebuild supplier_duplicate_clusters after the load")
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
+
+    checkpoint = args.checkpoint or args.input + ".checkpoint"
+    if args.restart and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+
+    try:
+        state = load(args.kind, args.input, checkpoint, args.rejects, args.workers,
+                     args.chunk_size, args.batch_size, args.method, args.set_based,
+                     args.retries, args.progress_seconds)
+    except Exception:
+        log.exception("Load stopped; rerun the same command to resume from %s", checkpoint)
+        sys.exit(1)
+
+    if args.kind == "suppliers" and not args.no_clusters:
+        from jobs.dedup_clusters import refresh_db
+        clustered = refresh_db(rds_client.exec_sql, workers=args.workers)
+        log.info("Rebuilt supplier_duplicate_clusters: %d clustered suppliers", clustered)
+
+    if args.refresh_scorecards:
+        from jobs.refresh_scorecards import refresh
+        refreshed = refresh(rds_client.exec_sql, workers=args.workers)
+        log.info("Refreshed %d scorecards", refreshed)
+
+    if state["rejected"]:
+        log.warning("%d rows rejected%s", state["rejected"],
+                    f"; see {args.rejects}" if args.rejects else "")
+
+
+if __name__ == "__main__":
+    main()
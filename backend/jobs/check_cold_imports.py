@@ -0,0 +1,113 @@
+"""
+Cold-import budget check for the Lambda handlers.
+
+Imports every lambdas/<name>/lambda_function.py in a fresh interpreter with
+`python -X importtime`, the way a new Lambda container does, and fails when
+
+- the import takes longer than --budget-ms (best of --repeat runs), or
+- a module that must only be loaded on first use shows up (boto3,
+  botocore, psycopg, psycopg_pool, redis).
+
+    python -m jobs.check_cold_imports --budget-ms 100
+
+Slowest imports are listed for failing handlers (for all with --verbose).
+Exits with status 1 when a check fails.
+"""
+
+import argparse
+import logging
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+log = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))
+LAMBDAS_DIR = os.path.join(BACKEND_DIR, "lambdas")
+
+LAZY_MODULES = ("boto3", "botocore", "psycopg", "psycopg_pool", "redis")
+
+# Same layout as a deployed package: the handler directory, then the shared
+# `common` package.
+_IMPORT = "import sys; sys.path[:0] = [{handler_dir!r}, {backend_dir!r}]; import lambda_function"
+
+
+def import_times(handler_dir: str) -> Dict[str, Tuple[int, int]]:
+    """
+    module -> (self us, cumulative us) for one cold import of the handler.
+    """
+    code = _IMPORT.format(handler_dir=handler_dir, backend_dir=BACKEND_DIR)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=handler_dir,
+    )
+    if proc.returncode:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        times[module.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def check_handler(name: str, budget_ms: float, repeat: int) -> Tuple[List[str], float, Dict]:
+    """
+    (problems, best import time in ms, import times of the best run).
+    """
+    handler_dir = os.path.join(LAMBDAS_DIR, name)
+    import_times(handler_dir)  # writes the .pyc files, like a deployed package
+    runs = [import_times(handler_dir) for _ in range(repeat)]
+    best = min(runs, key=lambda t: t["lambda_function"][1])
+    total_ms = best["lambda_function"][1] / 1000
+
+    problems = []
+    if total_ms > budget_ms:
+        problems.append(f"cold import {total_ms:.1f} ms > budget {budget_ms:.0f} ms")
+    loaded = sorted({m.split(".")[0] for m in best} & set(LAZY_MODULES))
+    if loaded:
+        problems.append("imported at cold start: " + ", ".join(loaded))
+    return problems, total_ms, best
+
+
+def _slowest(times: Dict[str, Tuple[int, int]], n: int = 8) -> str:
+    top = sorted(times.items(), key=lambda kv: kv[1][0], reverse=True)[:n]
+    return ", ".join(f"{m} {s / 1000:.1f}" for m, (s, _) in top)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--budget-ms", type=float, default=float(os.getenv("COLD_IMPORT_BUDGET_MS", "100")))
+    ap.add_argument("--repeat", type=int, default=5, help="imports per handler; the fastest counts")
+    ap.add_argument("--only", action="append", help="check only the named handler (repeatable)")
+    ap.add_argument("--verbose", action="store_true", help="list the slowest imports of every handler")
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
+
+    handlers = sorted(
+        d for d in os.listdir(LAMBDAS_DIR)
+        if os.path.isfile(os.path.join(LAMBDAS_DIR, d, "lambda_function.py"))
+    )
+    failed = 0
+    for name in handlers:
+        if args.only and name not in args.only:
+            continue
+        problems, total_ms, times = check_handler(name, args.budget_ms, args.repeat)
+        if problems:
+            failed += 1
+            log.error("FAIL %s: %s", name, "; ".join(problems))
+        else:
+            log.info("ok   %s: %.1f ms", name, total_ms)
+        if problems or args.verbose:
+            log.info("     slowest (self ms): %s", _slowest(times))
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
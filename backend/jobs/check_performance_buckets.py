@@ -0,0 +1,113 @@
+"""
+Consistency check for the supplier performance running-sum buckets.
+
+For every supplier (or the ones given with --supplier) and every window in
+--window-days, scores the supplier twice:
+
+* from the bucket tables with common.performance.SQL_PERFORMANCE_BUCKETS
+* from the raw supplier_performance_history rows with compute_scores
+
+and reports any score that differs by more than --tolerance. Exits with
+status 1 when a mismatch is found. --rebuild recomputes every bucket from
+the raw rows first (rebuild_performance_buckets() in schema.sql), which is
+also how the buckets are backfilled after the tables are created.
+
+    python -m jobs.check_performance_buckets --window-days 0 30 90 365
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from typing import Callable, Iterable, List, Tuple
+
+from common.dedup import iter_supplier_records
+from common.performance import SQL_PERFORMANCE_BUCKETS, bucket_params, compute_scores, scores_from_aggregate
+
+log = logging.getLogger(__name__)
+
+SCORE_KEYS = ("delivery_score", "quality_score", "invoice_score", "performance_score")
+
+SQL_REBUILD = "SELECT rebuild_performance_buckets();"
+
+# SQL_SUPPLIER_HISTORY with the bucket query's window filter.
+SQL_SUPPLIER_HISTORY_WINDOW = """
+SELECT
+    on_time,
+    delivery_delay_days,
+    quality_compliance_pct,
+    invoice_match_pct,
+    incidents,
+    notes
+FROM supplier_performance_history
+WHERE supplier_id = :sid
+  AND (:window_days <= 0 OR order_date >= CURRENT_DATE - CAST(:window_days AS INT));
+"""
+
+# (supplier_id, window_days, key, bucket value, raw value)
+Mismatch = Tuple[str, int, str, float, float]
+
+
+def check_supplier(exec_sql: Callable, supplier_id: str, window_days: int,
+                   tolerance: float = 0.01) -> List[Mismatch]:
+    resp = exec_sql(SQL_PERFORMANCE_BUCKETS, bucket_params(supplier_id, window_days))
+    bucketed = scores_from_aggregate((resp.get("records") or [None])[0])
+
+    rows = exec_sql(SQL_SUPPLIER_HISTORY_WINDOW, [
+        {"name": "sid", "value": {"stringValue": supplier_id}},
+        {"name": "window_days", "value": {"longValue": window_days}},
+    ]).get("records", [])
+    raw = compute_scores(rows)
+
+    return [
+        (supplier_id, window_days, key, bucketed[key], raw[key])
+        for key in SCORE_KEYS
+        if abs(float(bucketed[key]) - float(raw[key])) > tolerance
+    ]
+
+
+def check(exec_sql: Callable, supplier_ids: Iterable[str], windows: List[int],
+          tolerance: float = 0.01) -> Tuple[int, List[Mismatch]]:
+    checked = 0
+    mismatches: List[Mismatch] = []
+    for sid in supplier_ids:
+        for window_days in windows:
+            mismatches.extend(check_supplier(exec_sql, sid, window_days, tolerance))
+        checked += 1
+    return checked, mismatches
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--supplier", action="append", help="supplier_id to check (repeatable; default: all)")
+    ap.add_argument("--window-days", type=int, nargs="+", default=[0, 30, 90, 365],
+                    help="windows to check; 0 = whole history")
+    ap.add_argument("--tolerance", type=float, default=0.01)
+    ap.add_argument("--rebuild", action="store_true", help="rebuild all buckets from raw rows first")
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
+
+    from common.rds_client import exec_sql
+
+    if args.rebuild:
+        start = time.perf_counter()
+        exec_sql(SQL_REBUILD)
+        log.info("Rebuilt performance buckets in %.2fs", time.perf_counter() - start)
+
+    ids = args.supplier or (sid for sid, _ in iter_supplier_records(exec_sql))
+
+    start = time.perf_counter()
+    checked, mismatches = check(exec_sql, ids, args.window_days, args.tolerance)
+    for sid, window_days, key, bucketed, raw in mismatches:
+        log.warning("%s window=%d %s: buckets=%s raw=%s", sid, window_days, key, bucketed, raw)
+    log.info("Checked %d suppliers x %d windows in %.2fs, %d mismatches",
+             checked, len(args.window_days), time.perf_counter() - start, len(mismatches))
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
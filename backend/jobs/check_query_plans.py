@@ -0,0 +1,159 @@
+"""
+Query plan regression check against a local (or staging) Postgres.
+
+Runs EXPLAIN for the hot statements of the Lambdas and jobs and fails when
+one of them can no longer use the index it was written for
+(db/schema/schema.sql). Sequential scans are disabled for the session, so
+a small sample database gives the same answer as a large one: if a Seq Scan
+still shows up on a checked table, no usable index exists.
+
+    python -m jobs.check_query_plans --dsn postgresql://localhost/supplier360
+
+The schema must be loaded; data is optional. Exits with status 1 when a
+check fails.
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import sys
+from typing import Any, Dict, Iterator, List, NamedTuple, Tuple
+
+from common.compliance import SQL_COMPLIANCE_AS_OF, SQL_COMPLIANCE_COMBINED, SQL_EXPIRING_CERTS
+from common.performance import SQL_PERFORMANCE_AGGREGATE, SQL_PERFORMANCE_BUCKETS, aggregate_params, bucket_params
+from common.portfolio import build_ranking_sql
+from common.rds_client import make_params, param_values, pyformat_sql
+from common.suppliers import SQL_SUPPLIER_BY_NAME
+from jobs.compliance_scores import SQL_LATEST_CERTS_PAGE
+from jobs.score_snapshots import SQL_SNAPSHOT_PAGE, window_params
+
+log = logging.getLogger(__name__)
+
+
+class PlanCheck(NamedTuple):
+    name: str
+    sql: str
+    params: List[Dict[str, Any]]
+    # Tables that must not be read with a Seq Scan.
+    no_seq_scan: Tuple[str, ...]
+    # Indexes the plan must use.
+    indexes: Tuple[str, ...] = ()
+
+
+def _ranking_check() -> PlanCheck:
+    sql, _, params, _ = build_ranking_sql("trust_score", industry="Automotive")
+    return PlanCheck("portfolio ranking", sql, make_params(params),
+                     ("supplier_scorecard",), ("ix_scorecard_industry_trust",))
+
+
+def _snapshot_check() -> PlanCheck:
+    params = dict(window_params(datetime.date(2024, 6, 30), 90), after="", page_size=1000)
+    return PlanCheck("score snapshot page", SQL_SNAPSHOT_PAGE, make_params(params),
+                     ("compliance_certificates", "supplier_performance_daily",
+                      "supplier_performance_monthly"),
+                     ("ix_certs_supplier_type_latest",))
+
+
+CHECKS = [
+    PlanCheck(
+        "supplier name lookup", SQL_SUPPLIER_BY_NAME,
+        make_params({"sname_norm": "ford motor", "sname_flat": "ford motor company", "max_candidates": 10}),
+        ("supplier_master",), ("ix_supplier_master_name_norm",),
+    ),
+    PlanCheck(
+        "combined compliance", SQL_COMPLIANCE_COMBINED,
+        make_params({"sid": "7F9K3A2B"}),
+        ("supplier_master", "compliance_certificates"), ("ix_certs_supplier_type_latest",),
+    ),
+    PlanCheck(
+        "compliance as of", SQL_COMPLIANCE_AS_OF,
+        make_params({"sid": "7F9K3A2B", "as_of": "2024-06-30"}),
+        ("supplier_master", "compliance_certificates"), ("ix_certs_supplier_type_latest",),
+    ),
+    PlanCheck(
+        "expiring certificates", SQL_EXPIRING_CERTS,
+        make_params({"days": 30, "industry": "", "required_only": False, "limit": 100}),
+        ("compliance_certificates",), ("ix_certs_expiry",),
+    ),
+    PlanCheck(
+        "bulk latest certificates", SQL_LATEST_CERTS_PAGE,
+        make_params({"after": "", "page_size": 2000}),
+        ("compliance_certificates",), ("ix_certs_supplier_type_latest",),
+    ),
+    PlanCheck(
+        "performance aggregate", SQL_PERFORMANCE_AGGREGATE,
+        aggregate_params("7F9K3A2B", 90, 0, 20),
+        ("supplier_performance_history",), ("ix_perf_supplier_date",),
+    ),
+    PlanCheck(
+        "performance buckets", SQL_PERFORMANCE_BUCKETS,
+        bucket_params("7F9K3A2B", 90, 20),
+        ("supplier_performance_daily", "supplier_performance_monthly",
+         "supplier_performance_history"),
+    ),
+    _ranking_check(),
+    _snapshot_check(),
+]
+
+
+def _nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _nodes(child)
+
+
+def explain(conn, sql: str, params: List[Dict[str, Any]]) -> Dict[str, Any]:
+    cur = conn.execute("EXPLAIN (FORMAT JSON) " + pyformat_sql(sql.rstrip().rstrip(";")),
+                       param_values(params))
+    doc = cur.fetchone()[0]
+    return (json.loads(doc) if isinstance(doc, str) else doc)[0]["Plan"]
+
+
+def run_check(conn, check: PlanCheck) -> List[str]:
+    """
+    Problems found in the plan of one statement (empty when it passes).
+    """
+    nodes = list(_nodes(explain(conn, check.sql, check.params)))
+    problems = [
+        f"Seq Scan on {n['Relation Name']}"
+        for n in nodes
+        if n["Node Type"] == "Seq Scan" and n.get("Relation Name") in check.no_seq_scan
+    ]
+    used = {n.get("Index Name") for n in nodes}
+    problems += [f"index {ix} not used" for ix in check.indexes if ix not in used]
+    return problems
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--dsn", default=os.getenv("DB_DSN"), help="Postgres DSN (default: DB_DSN)")
+    ap.add_argument("--only", action="append", help="run only the named check (repeatable)")
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
+    if not args.dsn:
+        ap.error("--dsn or DB_DSN is required")
+
+    import psycopg
+
+    failed = 0
+    with psycopg.connect(args.dsn, autocommit=True) as conn:
+        conn.execute("SET enable_seqscan = off")
+        for check in CHECKS:
+            if args.only and check.name not in args.only:
+                continue
+            problems = run_check(conn, check)
+            if problems:
+                failed += 1
+                log.error("FAIL %s: %s", check.name, "; ".join(problems))
+            else:
+                log.info("ok   %s", check.name)
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Fleet-wide compliance scoring.
+
+Scores every supplier with the compliance Lambda's weighting without calling
+the Lambda once per supplier:
+
+1. required_certificates_master is read once (it is small).
+2. Suppliers are paged by supplier_id; for each page a single set-based
+   query returns the latest certificate per (supplier, type) using the same
+   ordering as the Lambda's SQL_LATEST_CERTS.
+3. Rows are decoded into columns and scored per supplier with
+   common.compliance.score_statuses.
+4. Results are upserted into supplier_compliance_scores in batches.
+
+    python -m jobs.compliance_scores --page-size 2000
+"""
+
+import argparse
+import logging
+import os
+import time
+from collections import defaultdict
+from typing import Dict, Iterator, List, Tuple
+
+from common.compliance import score_statuses
+
+log = logging.getLogger(__name__)
+
+SQL_REQUIRED_ALL = """
+SELECT industry, required_certificate_type
+FROM required_certificates_master
+ORDER BY industry, required_certificate_type;
+"""
+
+SQL_LATEST_CERTS_PAGE = """
+WITH page AS (
+  SELECT supplier_id, industry
+  FROM supplier_master
+  WHERE supplier_id > :after
+  ORDER BY supplier_id
+  LIMIT :page_size
+),
+latest AS (
+  SELECT DISTINCT ON (c.supplier_id, c.certificate_type)
+    c.supplier_id, c.certificate_type, c.valid_status
+  FROM compliance_certificates c
+  JOIN page p ON p.supplier_id = c.supplier_id
+  ORDER BY c.supplier_id, c.certificate_type,
+           COALESCE(c.expiry_date, DATE '9999-12-31') DESC,
+           c.issue_date DESC
+)
+SELECT p.supplier_id, p.industry, l.certificate_type, l.valid_status
+FROM page p
+LEFT JOIN latest l ON l.supplier_id = p.supplier_id
+ORDER BY p.supplier_id;
+"""
+
+SQL_UPSERT_SCORE = """
+INSERT INTO supplier_compliance_scores
+  (supplier_id, industry, compliance_score, required_count,
+   valid_count, pending_count, expired_count, missing_count, scored_at)
+VALUES
+  (:supplier_id, :industry, :compliance_score, :required_count,
+   :valid_count, :pending_count, :expired_count, :missing_count, CURRENT_TIMESTAMP)
+ON CONFLICT (supplier_id) DO UPDATE SET
+  industry         = EXCLUDED.industry,
+  compliance_score = EXCLUDED.compliance_score,
+  required_count   = EXCLUDED.required_count,
+  valid_count      = EXCLUDED.valid_count,
+  pending_count    = EXCLUDED.pending_count,
+  expired_count    = EXCLUDED.expired_count,
+  missing_count    = EXCLUDED.missing_count,
+  scored_at        = EXCLUDED.scored_at;
+"""
+
+# (supplier_id, industry, compliance_score, required, valid, pending, expired, missing)
+ScoreRow = Tuple[str, str, int, int, int, int, int, int]
+
+
+def _str(cell):
+    return None if cell.get("isNull") else cell.get("stringValue")
+
+
+def load_required(exec_sql) -> Dict[str, List[str]]:
+    required = defaultdict(list)
+    for r in exec_sql(SQL_REQUIRED_ALL).get("records", []):
+        required[r[0]["stringValue"]].append(r[1]["stringValue"])
+    return dict(required)
+
+
+def decode_columns(records) -> Tuple[List[str], List[str], List[str], List[str]]:
+    """
+    Turn Data API records into four parallel columns in one pass.
+    """
+    sids, industries, types, statuses = [], [], [], []
+    for r in records:
+        sids.append(r[0]["stringValue"])
+        industries.append(r[1]["stringValue"])
+        types.append(_str(r[2]))
+        statuses.append(_str(r[3]))
+    return sids, industries, types, statuses
+
+
+def score_columns(sids, industries, types, statuses, required: Dict[str, List[str]]) -> List[ScoreRow]:
+    """
+    Score suppliers from columns sorted by supplier_id.
+
+    Each supplier's run of rows becomes a type -> status map; statuses are
+    then read in required-set order, matching the Lambda's _score.
+    """
+    out = []
+    n = len(sids)
+    i = 0
+    while i < n:
+        sid = sids[i]
+        industry = industries[i]
+        latest = {}
+        while i < n and sids[i] == sid:
+            if types[i] is not None:
+                latest[types[i]] = (statuses[i] or "").strip()
+            i += 1
+
+        req = required.get(industry, [])
+        ordered = [latest.get(t) for t in req]
+        valid = ordered.count("Valid")
+        pending = ordered.count("Pending")
+        missing = ordered.count(None)
+        expired = len(ordered) - valid - pending - missing
+        out.append((sid, industry, score_statuses(ordered), len(req), valid, pending, expired, missing))
+    return out
+
+
+def iter_scores(exec_sql, page_size: int = 2000) -> Iterator[List[ScoreRow]]:
+    """
+    Yield scored pages of suppliers.
+    """
+    required = load_required(exec_sql)
+    after = ""
+    while True:
+        resp = exec_sql(SQL_LATEST_CERTS_PAGE, [
+            {"name": "after", "value": {"stringValue": after}},
+            {"name": "page_size", "value": {"longValue": page_size}},
+        ])
+        cols = decode_columns(resp.get("records", []))
+        if not cols[0]:
+            return
+        yield score_columns(*cols, required)
+        # Suppliers on a page can have several rows; a short page means done.
+        if len(set(cols[0])) < page_size:
+            return
+        after = cols[0][-1]
+
+
+def write_scores(batch_exec_sql, rows: List[ScoreRow], batch_size: int = 500) -> None:
+    for start in range(0, len(rows), batch_size):
+        batch_exec_sql(SQL_UPSERT_SCORE, [
+            [
+                {"name": "supplier_id", "value": {"stringValue": sid}},
+                {"name": "industry", "value": {"stringValue": industry}},
+                {"name": "compliance_score", "value": {"longValue": score}},
+                {"name": "required_count", "value": {"longValue": req}},
+                {"name": "valid_count", "value": {"longValue": valid}},
+                {"name": "pending_count", "value": {"longValue": pending}},
+                {"name": "expired_count", "value": {"longValue": expired}},
+                {"name": "missing_count", "value": {"longValue": missing}},
+            ]
+            for sid, industry, score, req, valid, pending, expired, missing in rows[start:start + batch_size]
+        ])
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--page-size", type=int, default=2000)
+    ap.add_argument("--dry-run", action="store_true", help="score but do not write results")
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
+
+    from common.rds_client import batch_exec_sql, exec_sql
+
+    start = time.perf_counter()
+    total = 0
+    for rows in iter_scores(exec_sql, args.page_size):
+        if not args.dry_run:
+            write_scores(batch_exec_sql, rows)
+        total += len(rows)
+
+    elapsed = time.perf_counter() - start
+    log.info("Scored %d suppliers in %.2fs (%.0f suppliers/s)", total, elapsed, total / max(elapsed, 1e-9))
+
+
+if __name__ == "__main__":
+    main()
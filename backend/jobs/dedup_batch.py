@@ -0,0 +1,143 @@
+"""
+Batch duplicate detection for vendor onboarding files.
+
+Reads candidate supplier names from a CSV (a `supplier_name` column, or the
+first column) or JSONL file (`{"supplier_name": ...}` objects or bare
+strings), fetches supplier_master once and scores every name against it on a
+process pool. Writes one JSON line per input, in input order, with the same
+fields the deduplication Lambda returns.
+
+    python -m jobs.dedup_batch vendors.csv -o results.jsonl --workers 8
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from common.dedup import duplicate_check, iter_supplier_records
+from common.name_index import NameIndex
+
+log = logging.getLogger(__name__)
+
+_index: Optional[NameIndex] = None
+
+
+def read_names(path: str) -> Iterator[str]:
+    """
+    Stream supplier names from a CSV or JSONL file without loading it whole.
+    """
+    with open(path, newline="", encoding="utf-8") as fh:
+        if path.endswith((".jsonl", ".ndjson")):
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                item = json.loads(line)
+                yield item if isinstance(item, str) else item.get("supplier_name") or ""
+        else:
+            reader = csv.reader(fh)
+            header = next(reader, None)
+            if header is None:
+                return
+            col = header.index("supplier_name") if "supplier_name" in header else 0
+            if "supplier_name" not in header:
+                yield header[col]
+            for row in reader:
+                if row:
+                    yield row[col]
+
+
+def _init_worker(records: List[Tuple[str, str]]) -> None:
+    global _index
+    _index = NameIndex.from_records(records)
+
+
+def _score_chunk(names: List[str]) -> List[dict]:
+    return [score_name(name, _index) for name in names]
+
+
+def score_name(name: str, index: NameIndex) -> dict:
+    supplier_input = (name or "").strip()
+    if not supplier_input:
+        return {"input_supplier": name, "error": "supplier_name is required"}
+    return duplicate_check(supplier_input, index, mode="batch")
+
+
+def _chunks(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def score_names(
+    names: Iterable[str],
+    records: List[Tuple[str, str]],
+    workers: int = os.cpu_count() or 1,
+    chunk_size: int = 500,
+) -> Iterator[dict]:
+    """
+    Score a stream of names against `records`, yielding results in input
+    order. At most 2 chunks per worker are in flight, so memory stays bounded
+    however long the input is.
+    """
+    if workers <= 1:
+        index = NameIndex.from_records(records)
+        for name in names:
+            yield score_name(name, index)
+        return
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(records,)) as pool:
+        pending = deque()
+        for chunk in _chunks(names, chunk_size):
+            pending.append(pool.submit(_score_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("input", help="CSV or JSONL file of candidate supplier names")
+    ap.add_argument("-o", "--output", help="JSONL output file (default: stdout)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--chunk-size", type=int, default=500)
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
+
+    from common.rds_client import exec_sql
+
+    start = time.perf_counter()
+    records = list(iter_supplier_records(exec_sql))
+    log.info("Loaded %d suppliers in %.2fs", len(records), time.perf_counter() - start)
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    count = duplicates = 0
+    try:
+        for result in score_names(read_names(args.input), records, args.workers, args.chunk_size):
+            out.write(json.dumps(result, default=str) + "\n")
+            count += 1
+            duplicates += bool(result.get("is_duplicate"))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    log.info("Scored %d names (%d duplicates) in %.2fs (%.0f names/s)",
+             count, duplicates, elapsed, count / max(elapsed, 1e-9))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+All-pairs near-duplicate report over supplier_master.
+
+Instead of comparing every pair of names (O(N^2) SequenceMatcher calls), each
+name is only compared with the trigram candidates NameIndex returns for it.
+Candidate lists are not symmetric (b can be among a's top candidates while
+a is not among b's), so a pair counts when either side finds the other.
+Pairs use the deduplication Lambda's similarity and threshold: a pair is a
+duplicate when either name, given to the Lambda as input, would score the
+other at DUPLICATE_THRESHOLD or above. Suppliers that share the exact same
+name always form a pair. Connected pairs are merged into clusters.
+
+    python -m jobs.dedup_clusters --output-dir out/ --workers 8 --write-db
+
+Outputs `duplicate_pairs.csv` and `duplicate_clusters.csv`. With --write-db
+the clusters also replace the contents of supplier_duplicate_clusters, which
+the agent and the scorecard can query, in one transaction: readers see the
+old clusters until the new ones are complete, and an interrupted run
+leaves the table as it was.
+"""
+
+import argparse
+import csv
+import logging
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from common.dedup import DUPLICATE_THRESHOLD, iter_supplier_records, similarity
+from common.name_index import NameIndex, normalize_name
+
+log = logging.getLogger(__name__)
+
+SQL_CLEAR_CLUSTERS = "DELETE FROM supplier_duplicate_clusters;"
+
+SQL_INSERT_CLUSTER = """
+INSERT INTO supplier_duplicate_clusters
+  (cluster_id, supplier_id, supplier_name, best_match_id, similarity_score)
+VALUES (:cluster_id, :supplier_id, :supplier_name, :best_match_id, :similarity_score);
+"""
+
+# Worker state, set up once per process by _init_worker.
+_names: List[str] = []
+_index: Optional[NameIndex] = None
+_slot: Dict[str, int] = {}
+_normalize = False
+_candidates = 32
+_threshold = DUPLICATE_THRESHOLD
+
+
+def _key(name: str) -> str:
+    return normalize_name(name) if _normalize else name
+
+
+def _init_worker(names, normalize, candidates, threshold):
+    global _names, _index, _slot, _normalize, _candidates, _threshold
+    _names = names
+    _normalize = normalize
+    _candidates = candidates
+    _threshold = threshold
+    _slot = {name: i for i, name in enumerate(names)}
+    # NameIndex stores names keyed by themselves here; ids are the names.
+    _index = NameIndex.from_records((name, name) for name in names)
+
+
+def _pairs_for(start: int, stop: int) -> List[Tuple[int, int, int]]:
+    """
+    Duplicate pairs (min(i, j), max(i, j), score) for start <= i < stop and
+    every candidate j != i of name i. A pair may also be found from j's
+    side; find_pairs drops the repeats.
+    """
+    out = []
+    for i in range(start, stop):
+        a = _names[i]
+        ka = _key(a)
+        for cand in _index.candidates(a, limit=_candidates):
+            j = _slot[cand]
+            if j == i:
+                continue
+            kb = _key(cand)
+            score = max(similarity(ka, kb), similarity(kb, ka))
+            if score >= _threshold:
+                out.append((min(i, j), max(i, j), score))
+    return out
+
+
+def find_pairs(names, workers=1, candidates=32, threshold=DUPLICATE_THRESHOLD,
+               normalize=False, chunk_size=2000):
+    args = (names, normalize, candidates, threshold)
+    ranges = [(s, min(s + chunk_size, len(names))) for s in range(0, len(names), chunk_size)]
+
+    if workers <= 1:
+        _init_worker(*args)
+        found = [p for start, stop in ranges for p in _pairs_for(start, stop)]
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=args) as pool:
+            futures = [pool.submit(_pairs_for, start, stop) for start, stop in ranges]
+            found = [p for f in futures for p in f.result()]
+    # The score is symmetric, so a pair found from both sides is the same tuple.
+    return sorted(set(found))
+
+
+class _DisjointSet:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, x):
+        parent = self.parent
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def build_clusters(records, workers=1, candidates=32, threshold=DUPLICATE_THRESHOLD, normalize=False):
+    """
+    Returns (pairs, clusters).
+
+    pairs:    [(supplier_id_a, name_a, supplier_id_b, name_b, score)]
+    clusters: [(cluster_id, supplier_id, supplier_name, best_match_id, score)]
+              cluster_id is the smallest supplier_id in the cluster.
+    """
+    ids_by_name = defaultdict(list)
+    for sid, name in records:
+        ids_by_name[name].append(sid)
+    names = sorted(ids_by_name)
+
+    name_pairs = find_pairs(names, workers, candidates, threshold, normalize)
+
+    pairs = []
+    for name, ids in ids_by_name.items():
+        ids = sorted(ids)
+        for other in ids[1:]:
+            pairs.append((ids[0], name, other, name, 100))
+    for i, j, score in name_pairs:
+        a, b = names[i], names[j]
+        for sa in ids_by_name[a]:
+            for sb in ids_by_name[b]:
+                pairs.append((sa, a, sb, b, score))
+
+    dsu = _DisjointSet()
+    best: Dict[str, Tuple[int, str]] = {}
+    for sa, _, sb, _, score in pairs:
+        dsu.union(sa, sb)
+        for x, y in ((sa, sb), (sb, sa)):
+            if score > best.get(x, (-1, ""))[0]:
+                best[x] = (score, y)
+
+    name_of = {sid: name for name, ids in ids_by_name.items() for sid in ids}
+    clusters = sorted(
+        (dsu.find(sid), sid, name_of[sid], match, score)
+        for sid, (score, match) in best.items()
+    )
+    return pairs, clusters
+
+
+def _write_csv(path, header, rows):
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def write_db(clusters, batch_size=500):
+    from common.rds_client import batch_exec_sql, exec_sql, make_param, transaction
+
+    with transaction():
+        exec_sql(SQL_CLEAR_CLUSTERS)
+        for start in range(0, len(clusters), batch_size):
+            batch_exec_sql(SQL_INSERT_CLUSTER, [
+                [
+                    make_param("cluster_id", cid),
+                    make_param("supplier_id", sid),
+                    make_param("supplier_name", name),
+                    make_param("best_match_id", match),
+                    make_param("similarity_score", score),
+                ]
+                for cid, sid, name, match, score in clusters[start:start + batch_size]
+            ])
+
+
+def refresh_db(exec_sql, workers=1, candidates=32, threshold=DUPLICATE_THRESHOLD,
+               normalize=False) -> int:
+    """
+    Rebuild supplier_duplicate_clusters from the current supplier_master
+    (e.g. after a bulk load). Returns the number of clustered suppliers.
+    """
+    records = list(iter_supplier_records(exec_sql))
+    _, clusters = build_clusters(records, workers, candidates, threshold, normalize)
+    write_db(clusters)
+    return len(clusters)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--output-dir", default=".")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--candidates", type=int, default=32, help="trigram candidates compared per name")
+    ap.add_argument("--threshold", type=int, default=DUPLICATE_THRESHOLD)
+    ap.add_argument("--normalize", action="store_true",
+                    help="compare normalized names (case / punctuation insensitive)")
+    ap.add_argument("--write-db", action="store_true", help="replace supplier_duplicate_clusters")
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
+
+    from common.rds_client import exec_sql
+
+    start = time.perf_counter()
+    records = list(iter_supplier_records(exec_sql))
+    log.info("Loaded %d suppliers in %.2fs", len(records), time.perf_counter() - start)
+
+    pairs, clusters = build_clusters(
+        records, args.workers, args.candidates, args.threshold, args.normalize
+    )
+    log.info("Found %d pairs, %d clustered suppliers, %d clusters in %.2fs",
+             len(pairs), len(clusters), len({c[0] for c in clusters}), time.perf_counter() - start)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    _write_csv(os.path.join(args.output_dir, "duplicate_pairs.csv"),
+               ["supplier_id_a", "supplier_name_a", "supplier_id_b", "supplier_name_b", "similarity_score"],
+               pairs)
+    _write_csv(os.path.join(args.output_dir, "duplicate_clusters.csv"),
+               ["cluster_id", "supplier_id", "supplier_name", "best_match_id", "similarity_score"],
+               clusters)
+
+    if args.write_db:
+        write_db(clusters)
+        log.info("Wrote %d rows to supplier_duplicate_clusters", len(clusters))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+"""
+Bulk Supplier360 report export for every supplier.
+
+    python -m jobs.export_reports exports/2026-Q3 --workers 8
+    python -m jobs.export_reports exports/2026-Q3 --format parquet --no-markdown
+
+Suppliers are read from supplier_master in supplier_id order and scored in
+--chunk-size chunks on a process pool, with the Lambdas' logic:
+- duplicate status from supplier_duplicate_clusters, as the scorecard
+  reads it (common.dedup.record_duplicate_check: the supplier's closest
+  other supplier, never the supplier itself; run jobs.dedup_clusters
+  --write-db first),
+- compliance from SQL_COMPLIANCE_COMBINED (common.compliance),
+- performance from the bucket tables (common.performance.score_supplier),
+- weighted Trust Score and risk classification (common.trust_score).
+
+Output in the export directory:
+- scores/part-NNNNN.csv (or .parquet, which needs pyarrow): one row per
+  supplier, EXPORT_COLUMNS, --part-size suppliers per part. Parts are
+  written under a temporary name and renamed when complete.
+- reports/<supplier_id>.md: the report's data sections (common.report),
+  written by the workers.
+- checkpoint.json: the last supplier_id of the last complete part. A rerun
+  of the same command resumes after it; the file is removed when the
+  export is done.
+
+Each worker holds its own database backend and the duplicate matches; at
+most two chunks per worker are in flight and a part's rows are the
+only results held in memory. Throughput (suppliers/min) is logged every
+--progress-seconds.
+"""
+
+import argparse
+import csv
+import datetime
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import suppress
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from common import rds_client
+from common.compliance import SQL_COMPLIANCE_COMBINED, compliance_body, parse_combined_row
+from common.dedup import duplicate_matches, iter_supplier_records, record_duplicate_check
+from common.performance import performance_body, score_supplier
+from common.report import render_report
+from common.trust_score import risk_level, trust_score, weighted_contributions
+
+log = logging.getLogger(__name__)
+
+
+class ExportColumn(NamedTuple):
+    name: str
+    kind: str  # str, int, float or bool (Parquet type)
+
+
+EXPORT_COLUMNS = (
+    ExportColumn("supplier_id", "str"),
+    ExportColumn("supplier_name", "str"),
+    ExportColumn("industry", "str"),
+    ExportColumn("data_integrity_score", "int"),
+    ExportColumn("is_duplicate", "bool"),
+    ExportColumn("matched_supplier_id", "str"),
+    ExportColumn("compliance_score", "int"),
+    ExportColumn("required_count", "int"),
+    ExportColumn("valid_count", "int"),
+    ExportColumn("expired_count", "int"),
+    ExportColumn("missing_count", "int"),
+    ExportColumn("pending_count", "int"),
+    ExportColumn("delivery_score", "float"),
+    ExportColumn("quality_score", "float"),
+    ExportColumn("invoice_score", "float"),
+    ExportColumn("performance_score", "float"),
+    ExportColumn("trust_score", "float"),
+    ExportColumn("risk_level", "str"),
+)
+
+ExportRow = Tuple[Any, ...]
+# supplier_id -> (best_match_id, best_match_name, similarity_score)
+Matches = Dict[str, Tuple[str, str, int]]
+
+# ---------- Worker ----------
+_matches: Matches = {}
+_report_dir: Optional[str] = None
+
+
+def _init_worker(matches: Matches, report_dir: Optional[str]) -> None:
+    global _matches, _report_dir
+    _matches = matches
+    _report_dir = report_dir
+
+
+def score_export(exec_sql, supplier_id: str, supplier_name: str,
+                 matches: Matches) -> Optional[Dict[str, Any]]:
+    """
+    The three action-group results plus the Trust Score for one supplier,
+    or None if it no longer exists.
+    """
+    resp = exec_sql(SQL_COMPLIANCE_COMBINED, [rds_client.make_param("sid", supplier_id)])
+    if not resp.get("records"):
+        return None
+    sid, sname, industry, required, latest = parse_combined_row(resp["records"][0])
+    certification = compliance_body(sid, sname, industry, required, latest, mode="export")
+    operational = performance_body(sid, sname, score_supplier(exec_sql, sid), mode="export")
+    dedup = record_duplicate_check(supplier_name, matches.get(supplier_id), mode="export")
+
+    scores = (dedup["data_integrity_score"], certification["compliance_score"],
+              operational["performance_score"])
+    return {
+        "data_integrity": dedup,
+        "certification": certification,
+        "operational": operational,
+        "weighted_contributions": weighted_contributions(*scores),
+        "trust_score": trust_score(*scores),
+    }
+
+
+def export_row(result: Dict[str, Any]) -> ExportRow:
+    dedup, cert, ops = result["data_integrity"], result["certification"], result["operational"]
+    breakdown = cert["status_breakdown"]
+    return (
+        cert["supplier_id"], cert["supplier_name"], cert["industry"],
+        dedup["data_integrity_score"], dedup["is_duplicate"], dedup["matched_supplier_id"],
+        cert["compliance_score"], len(cert["required_set"]),
+        len(breakdown["Valid"]), len(breakdown["Expired"]),
+        len(breakdown["Missing"]), len(breakdown["Pending"]),
+        float(ops["delivery_score"]), float(ops["quality_score"]),
+        float(ops["invoice_score"]), float(ops["performance_score"]),
+        float(result["trust_score"]), risk_level(result["trust_score"]),
+    )
+
+
+def report_markdown(result: Dict[str, Any], generated: str) -> str:
+    cert = result["certification"]
+    return (
+        f"# Supplier360 report: {cert['supplier_name']} ({cert['supplier_id']})\n\n"
+        f"Generated {generated}\n\n"
+        + render_report(result["data_integrity"], cert, result["operational"],
+                        result["weighted_contributions"], result["trust_score"])
+        + "\n"
+    )
+
+
+def _write_report(report_dir: str, supplier_id: str, text: str) -> None:
+    path = os.path.join(report_dir, f"{supplier_id}.md")
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def export_chunk(chunk: List[Tuple[str, str]], generated: str) -> List[ExportRow]:
+    """
+    Score one chunk in a worker; suppliers deleted meanwhile are skipped.
+    """
+    exec_sql = rds_client.exec_sql
+    rows = []
+    for supplier_id, supplier_name in chunk:
+        result = score_export(exec_sql, supplier_id, supplier_name, _matches)
+        if result is None:
+            continue
+        rows.append(export_row(result))
+        if _report_dir:
+            _write_report(_report_dir, supplier_id, report_markdown(result, generated))
+    return rows
+
+
+# ---------- Parts ----------
+class _CsvPart:
+
+    def __init__(self, path: str):
+        self.path = path
+        self._f = open(path + ".tmp", "w", newline="", encoding="utf-8")
+        self._w = csv.writer(self._f)
+        self._w.writerow([c.name for c in EXPORT_COLUMNS])
+
+    def write(self, rows: List[ExportRow]) -> None:
+        self._w.writerows(rows)
+
+    def close(self) -> None:
+        self._f.close()
+        os.replace(self.path + ".tmp", self.path)
+
+
+class _ParquetPart:
+    """
+    One row group per chunk. Needs the optional `pyarrow` package.
+    """
+
+    def __init__(self, path: str):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        types = {"str": pa.string(), "int": pa.int64(), "float": pa.float64(), "bool": pa.bool_()}
+        self.pa = pa
+        self.path = path
+        self.schema = pa.schema([(c.name, types[c.kind]) for c in EXPORT_COLUMNS])
+        self._w = pq.ParquetWriter(path + ".tmp", self.schema)
+
+    def write(self, rows: List[ExportRow]) -> None:
+        if rows:
+            columns = list(zip(*rows))
+            self._w.write_table(self.pa.Table.from_arrays(
+                [self.pa.array(col, type=f.type) for col, f in zip(columns, self.schema)],
+                schema=self.schema,
+            ))
+
+    def close(self) -> None:
+        self._w.close()
+        os.replace(self.path + ".tmp", self.path)
+
+
+_PARTS = {"csv": _CsvPart, "parquet": _ParquetPart}
+
+
+# ---------- Checkpoint ----------
+def read_checkpoint(path: str, fmt: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {"after": "", "parts": 0, "exported": 0}
+    with open(path, encoding="utf-8") as f:
+        state = json.load(f)
+    if state.get("format") != fmt:
+        raise SystemExit(f"{path} belongs to a {state.get('format')} export; "
+                         "use --restart or another export directory")
+    return state
+
+
+def write_checkpoint(path: str, fmt: str, state: Dict[str, Any]) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(dict(state, format=fmt), f)
+    os.replace(tmp, path)
+
+
+# ---------- Driver ----------
+def _drop_parts(score_dir: str, first: int) -> None:
+    """
+    Remove parts numbered `first` and up (left by an interrupted or
+    earlier, longer run).
+    """
+    for name in os.listdir(score_dir):
+        if name.startswith("part-") and int(name[5:10]) >= first:
+            os.remove(os.path.join(score_dir, name))
+
+
+def _chunks(records: List[Tuple[str, str]], after: str, size: int) -> Iterator[List[Tuple[str, str]]]:
+    todo = [r for r in records if r[0] > after]
+    for i in range(0, len(todo), size):
+        yield todo[i:i + size]
+
+
+def export(out_dir: str, fmt: str = "csv", markdown: bool = True,
+           workers: int = os.cpu_count() or 1, chunk_size: int = 200,
+           part_size: int = 10000, progress_seconds: float = 30) -> Dict[str, Any]:
+    """
+    Export every supplier; returns the counts (including earlier runs).
+    """
+    score_dir = os.path.join(out_dir, "scores")
+    report_dir = os.path.join(out_dir, "reports") if markdown else None
+    for d in (score_dir, report_dir):
+        if d:
+            os.makedirs(d, exist_ok=True)
+    checkpoint = os.path.join(out_dir, "checkpoint.json")
+    state = read_checkpoint(checkpoint, fmt)
+    if state["after"]:
+        log.info("Resuming after supplier %s (%d exported, %d parts)",
+                 state["after"], state["exported"], state["parts"])
+    _drop_parts(score_dir, state["parts"])
+
+    # supplier_master in supplier_id order, which the chunks, parts and the
+    # checkpoint follow.
+    records = list(iter_supplier_records(rds_client.exec_sql))
+    matches = duplicate_matches(rds_client.exec_sql)
+    generated = datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+
+    part = None
+    part_rows = 0
+    last_id = state["after"]
+    done_this_run = 0
+    start = last_report = time.perf_counter()
+
+    def close_part() -> None:
+        nonlocal part, part_rows
+        part.close()
+        part, part_rows = None, 0
+        state["parts"] += 1
+        state["after"] = last_id
+        write_checkpoint(checkpoint, fmt, state)
+
+    def finish(chunk: List[Tuple[str, str]], rows: List[ExportRow]) -> None:
+        nonlocal part, part_rows, last_id, done_this_run, last_report
+        if part is None:
+            part = _PARTS[fmt](os.path.join(score_dir, f"part-{state['parts']:05d}.{fmt}"))
+        part.write(rows)
+        part_rows += len(chunk)
+        last_id = chunk[-1][0]
+        done_this_run += len(chunk)
+        state["exported"] += len(rows)
+        if part_rows >= part_size:
+            close_part()
+
+        now = time.perf_counter()
+        if now - last_report >= progress_seconds:
+            last_report = now
+            log.info("%d suppliers exported, %.0f suppliers/min",
+                     state["exported"], done_this_run / (now - start) * 60)
+
+    # Spawned, not forked: a forked worker would share the parent's database
+    # connections. Each worker creates its own backend from DB_BACKEND.
+    with ProcessPoolExecutor(max(1, workers), mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker, initargs=(matches, report_dir)) as pool:
+        pending = deque()
+        try:
+            for chunk in _chunks(records, state["after"], chunk_size):
+                pending.append((chunk, pool.submit(export_chunk, chunk, generated)))
+                if len(pending) >= workers * 2:
+                    chunk, future = pending.popleft()
+                    finish(chunk, future.result())
+            while pending:
+                chunk, future = pending.popleft()
+                finish(chunk, future.result())
+            if part is not None:
+                close_part()
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    elapsed = time.perf_counter() - start
+    log.info("Exported %d suppliers into %s (%d parts) in %.1fs, %.0f suppliers/min",
+             state["exported"], out_dir, state["parts"], elapsed,
+             done_this_run / max(elapsed, 1e-9) * 60)
+    with suppress(FileNotFoundError):
+        os.remove(checkpoint)
+    return state
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("out_dir", help="export directory")
+    ap.add_argument("--format", choices=list(_PARTS), default="csv",
+                    help="score table format (parquet needs pyarrow)")
+    ap.add_argument("--no-markdown", action="store_true", help="skip the per-supplier reports")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--chunk-size", type=int, default=200, help="suppliers per worker task")
+    ap.add_argument("--part-size", type=int, default=10000, help="suppliers per score file")
+    ap.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    ap.add_argument("--progress-seconds", type=float, default=30)
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
+
+    if args.format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise SystemExit("--format parquet needs the pyarrow package")
+
+    checkpoint = os.path.join(args.out_dir, "checkpoint.json")
+    if args.restart and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+
+    try:
+        export(args.out_dir, args.format, not args.no_markdown, args.workers,
+               args.chunk_size, args.part_size, args.progress_seconds)
+    except Exception:
+        log.exception("Export stopped; rerun the same command to resume from %s", checkpoint)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Incremental maintenance of supplier_scorecard.
+
+Triggers on supplier_master, compliance_certificates,
+supplier_performance_history, required_certificates_master and
+supplier_duplicate_clusters flag affected scorecard rows as stale. This job
+recomputes only the stale rows, using the same scoring code as the
+Lambdas, and clears the flag unless the row changed again while it was
+being recomputed: a row's stale_since is read before its source rows, and
+the flag is only cleared if stale_since still has that value when the
+scores are written. Every trigger sets a new stale_since, so a write that
+commits after the source rows were read keeps the row stale.
+
+The data integrity score is common.dedup.record_integrity_score of the
+supplier's supplier_duplicate_clusters row (jobs.dedup_clusters).
+
+With a last-N-days performance window (PERF_WINDOW_DAYS > 0) orders leave
+the window every day without any trigger firing. Each run then first marks
+the rows computed before today stale, and the Lambdas do not serve such
+rows from the scorecard, so schedule the job daily (e.g. an EventBridge
+rule shortly after midnight) to keep the fast paths in use.
+
+    python -m jobs.refresh_scorecards             # stale rows only
+    python -m jobs.refresh_scorecards --full      # every supplier
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from common.compliance import SQL_COMPLIANCE_COMBINED, compliance_body, parse_combined_row
+from common.dedup import record_integrity_score
+from common.performance import (
+    SQL_PERFORMANCE_AGGREGATE,
+    WINDOW_DAYS,
+    aggregate_params,
+    performance_body,
+    scores_from_aggregate,
+)
+from common.rds_client import make_param
+from common.trust_score import trust_score
+
+log = logging.getLogger(__name__)
+
+
+SQL_MARK_ALL_STALE = """
+INSERT INTO supplier_scorecard (supplier_id)
+SELECT supplier_id FROM supplier_master
+ON CONFLICT (supplier_id) DO UPDATE
+  SET stale = TRUE, stale_since = clock_timestamp(), stale_xid = pg_current_xact_id();
+"""
+
+SQL_MARK_AGED_STALE = """
+UPDATE supplier_scorecard
+SET stale = TRUE, stale_since = clock_timestamp(), stale_xid = pg_current_xact_id()
+WHERE NOT stale
+  AND refreshed_at < CURRENT_DATE;
+"""
+
+SQL_STALE_PAGE = """
+SELECT supplier_id
+FROM supplier_scorecard
+WHERE stale AND supplier_id > :after
+ORDER BY supplier_id
+LIMIT :page_size;
+"""
+
+SQL_STALE_SINCE = """
+SELECT CAST(stale_since AS TEXT)
+FROM supplier_scorecard
+WHERE supplier_id = :sid;
+"""
+
+SQL_DUPLICATE_STATUS = """
+SELECT d.cluster_id,
+       (SELECT COUNT(*) - 1
+        FROM supplier_duplicate_clusters d2
+        WHERE d2.cluster_id = d.cluster_id),
+       d.similarity_score
+FROM supplier_duplicate_clusters d
+WHERE d.supplier_id = :sid;
+"""
+
+SQL_UPDATE_SCORECARD = """
+UPDATE supplier_scorecard SET
+  supplier_name        = :supplier_name,
+  industry             = :industry,
+  compliance_score     = :compliance_score,
+  compliance_detail    = CAST(:compliance_detail AS JSONB),
+  delivery_score       = :delivery_score,
+  quality_score        = :quality_score,
+  invoice_score        = :invoice_score,
+  performance_score    = :performance_score,
+  performance_detail   = CAST(:performance_detail AS JSONB),
+  duplicate_cluster_id = :duplicate_cluster_id,
+  duplicate_count      = :duplicate_count,
+  data_integrity_score = :data_integrity_score,
+  trust_score          = :trust_score,
+  stale                = stale_since IS DISTINCT FROM CAST(:seen AS TIMESTAMP),
+  refreshed_at         = CURRENT_TIMESTAMP
+WHERE supplier_id = :sid;
+"""
+
+SQL_DELETE_ORPHAN = "DELETE FROM supplier_scorecard WHERE supplier_id = :sid;"
+
+
+def build_scorecard(exec_sql: Callable, supplier_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Compute every scorecard column for one supplier, or None if the
+    supplier no longer exists.
+    """
+    resp = exec_sql(SQL_COMPLIANCE_COMBINED, [make_param("sid", supplier_id)])
+    if not resp.get("records"):
+        return None
+    sid, sname, industry, required, latest = parse_combined_row(resp["records"][0])
+    compliance = compliance_body(sid, sname, industry, required, latest)
+    compliance.pop("mode")
+
+    agg = exec_sql(SQL_PERFORMANCE_AGGREGATE, aggregate_params(sid)).get("records") or [None]
+    performance = performance_body(sid, sname, scores_from_aggregate(agg[0]))
+    performance.pop("mode")
+
+    dup = exec_sql(SQL_DUPLICATE_STATUS, [make_param("sid", sid)]).get("records", [])
+    cluster_id = dup[0][0]["stringValue"] if dup else None
+    duplicate_count = int(dup[0][1]["longValue"]) if dup else 0
+    data_integrity_score = record_integrity_score(dup[0][2]["longValue"] if dup else None)
+
+    return {
+        "supplier_id": sid,
+        "supplier_name": sname,
+        "industry": industry,
+        "compliance": compliance,
+        "performance": performance,
+        "duplicate_cluster_id": cluster_id,
+        "duplicate_count": duplicate_count,
+        "data_integrity_score": data_integrity_score,
+        "trust_score": trust_score(
+            data_integrity_score,
+            compliance["compliance_score"],
+            performance["performance_score"],
+        ),
+    }
+
+
+def refresh_one(exec_sql: Callable, supplier_id: str) -> bool:
+    # Read before the source rows; see the module docstring.
+    seen = exec_sql(SQL_STALE_SINCE, [make_param("sid", supplier_id)]).get("records")
+    if not seen:
+        return False
+    card = build_scorecard(exec_sql, supplier_id)
+    if card is None:
+        exec_sql(SQL_DELETE_ORPHAN, [make_param("sid", supplier_id)])
+        return False
+
+    perf = card["performance"]
+    exec_sql(SQL_UPDATE_SCORECARD, [
+        make_param("sid", supplier_id),
+        make_param("supplier_name", card["supplier_name"]),
+        make_param("industry", card["industry"]),
+        make_param("compliance_score", card["compliance"]["compliance_score"]),
+        make_param("compliance_detail", json.dumps(card["compliance"], default=str)),
+        make_param("delivery_score", float(perf["delivery_score"])),
+        make_param("quality_score", float(perf["quality_score"])),
+        make_param("invoice_score", float(perf["invoice_score"])),
+        make_param("performance_score", float(perf["performance_score"])),
+        make_param("performance_detail", json.dumps(perf, default=str)),
+        make_param("duplicate_cluster_id", card["duplicate_cluster_id"]),
+        make_param("duplicate_count", card["duplicate_count"]),
+        make_param("data_integrity_score", card["data_integrity_score"]),
+        make_param("trust_score", float(card["trust_score"])),
+        make_param("seen", seen[0][0]["stringValue"]),
+    ])
+    return True
+
+
+def stale_ids(exec_sql: Callable, page_size: int) -> List[str]:
+    ids = []
+    after = ""
+    while True:
+        resp = exec_sql(SQL_STALE_PAGE, [make_param("after", after), make_param("page_size", page_size)])
+        page = [r[0]["stringValue"] for r in resp.get("records", [])]
+        ids.extend(page)
+        if len(page) < page_size:
+            return ids
+        after = page[-1]
+
+
+def refresh(exec_sql: Callable, full: bool = False, workers: int = 4, page_size: int = 5000) -> int:
+    if full:
+        exec_sql(SQL_MARK_ALL_STALE)
+    elif WINDOW_DAYS > 0:
+        exec_sql(SQL_MARK_AGED_STALE)
+
+    ids = stale_ids(exec_sql, page_size)
+    with ThreadPoolExecutor(max(1, workers)) as pool:
+        refreshed = sum(pool.map(lambda sid: refresh_one(exec_sql, sid), ids))
+    return refreshed
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--full", action="store_true", help="recompute every supplier, not only stale rows")
+    ap.add_argument("--workers", type=int, default=4, help="concurrent suppliers (Data API calls are I/O bound)")
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
+
+    from common.rds_client import exec_sql
+
+    start = time.perf_counter()
+    count = refresh(exec_sql, args.full, args.workers)
+    log.info("Refreshed %d scorecards in %.2fs", count, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""
+Per-supplier score snapshots (supplier_score_snapshots).
+
+    python -m jobs.score_snapshots                       # yesterday (daily schedule)
+    python -m jobs.score_snapshots --date 2026-09-30
+    python -m jobs.score_snapshots --backfill            # every month end of the history
+    python -m jobs.score_snapshots --backfill --start 2024-01-01 --end 2025-12-31
+
+A snapshot holds a supplier's scores as of the end of its snapshot date,
+derived from dates rather than from the current state, so the daily run and
+the backfill produce the same rows:
+
+- compliance: for every certificate type required in the supplier's
+  industry, the latest certificate issued by that day (same ordering as
+  SQL_COMPLIANCE_COMBINED) with its status from certificate_status_as_of()
+  (schema.sql), weighted with common.compliance.score_statuses;
+- performance: the supplier_performance_* bucket sums of the orders dated
+  up to that day, over the performance Lambda's window (PERF_WINDOW_DAYS),
+  scored with common.performance.scores_from_aggregate;
+- trust score: common.trust_score, with the data integrity score of
+  common.dedup.record_integrity_score as in supplier_scorecard.
+  supplier_duplicate_clusters has no history, so every date uses the
+  current clusters.
+
+Without --backfill one date is written (default yesterday, the last
+complete day). --backfill writes every month end from --start (default: the
+first order or certificate issue date) to --end (default yesterday).
+Suppliers are snapshotted from their onboarding_date. Each date is written
+page by page; suppliers that already have a snapshot for the date are
+skipped, so an interrupted run is resumed by running it again.
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from common.compliance import score_statuses
+from common.dedup import record_integrity_score
+from common.performance import WINDOW_DAYS, scores_from_aggregate
+from common.rds_client import make_param
+from common.trust_score import trust_score
+
+log = logging.getLogger(__name__)
+
+SQL_HISTORY_START = """
+SELECT CAST(LEAST(
+  (SELECT MIN(order_date) FROM supplier_performance_history),
+  (SELECT MIN(issue_date) FROM compliance_certificates)
+) AS TEXT);
+"""
+
+SQL_CREATE_PARTITION = "SELECT score_snapshot_partition(CAST(:year AS INT));"
+
+# One row per supplier of the page: industry, statuses of the required
+# certificates in required_certificate_type order (NULL = missing), its
+# duplicate cluster similarity (NULL = none), then the
+# SQL_PERFORMANCE_BUCKETS columns. The performance window is split like
+# SQL_PERFORMANCE_BUCKETS: daily buckets of its partial first month
+# [:window_start, :first_end), monthly buckets [:full_from, :month_start)
+# and daily buckets of the snapshot's own month [:last_start, :snapshot_date].
+SQL_SNAPSHOT_PAGE = """
+WITH page AS (
+  SELECT sm.supplier_id, sm.industry
+  FROM supplier_master sm
+  WHERE sm.supplier_id > :after
+    AND sm.onboarding_date <= CAST(:snapshot_date AS DATE)
+    AND NOT EXISTS (
+      SELECT 1
+      FROM supplier_score_snapshots s
+      WHERE s.supplier_id = sm.supplier_id
+        AND s.snapshot_date = CAST(:snapshot_date AS DATE)
+    )
+  ORDER BY sm.supplier_id
+  LIMIT :page_size
+)
+SELECT
+  p.supplier_id,
+  p.industry,
+  cs.statuses,
+  d.similarity_score,
+  pf.order_count,
+  pf.delivery_sum / NULLIF(pf.order_count, 0),
+  pf.quality_sum / NULLIF(pf.quality_count, 0),
+  pf.invoice_sum / NULLIF(pf.invoice_count, 0),
+  0,
+  '[]'
+FROM page p
+LEFT JOIN supplier_duplicate_clusters d ON d.supplier_id = p.supplier_id
+LEFT JOIN LATERAL (
+  SELECT COALESCE(json_agg(l.status ORDER BY r.required_certificate_type), '[]'::json)::text AS statuses
+  FROM required_certificates_master r
+  LEFT JOIN LATERAL (
+    SELECT certificate_status_as_of(c.valid_status, c.expiry_date, CAST(:snapshot_date AS DATE)) AS status
+    FROM compliance_certificates c
+    WHERE c.supplier_id = p.supplier_id
+      AND c.certificate_type = r.required_certificate_type
+      AND c.issue_date <= CAST(:snapshot_date AS DATE)
+    ORDER BY COALESCE(c.expiry_date, DATE '9999-12-31') DESC, c.issue_date DESC
+    LIMIT 1
+  ) l ON TRUE
+  WHERE r.industry = p.industry
+) cs ON TRUE
+LEFT JOIN LATERAL (
+  SELECT COALESCE(SUM(b.order_count), 0) AS order_count,
+         SUM(b.delivery_sum) AS delivery_sum,
+         SUM(b.quality_sum) AS quality_sum, SUM(b.quality_count) AS quality_count,
+         SUM(b.invoice_sum) AS invoice_sum, SUM(b.invoice_count) AS invoice_count
+  FROM (
+    SELECT order_count, delivery_sum, quality_sum, quality_count, invoice_sum, invoice_count
+    FROM supplier_performance_daily
+    WHERE supplier_id = p.supplier_id
+      AND bucket_date >= CAST(:window_start AS DATE)
+      AND bucket_date < CAST(:first_end AS DATE)
+    UNION ALL
+    SELECT order_count, delivery_sum, quality_sum, quality_count, invoice_sum, invoice_count
+    FROM supplier_performance_monthly
+    WHERE supplier_id = p.supplier_id
+      AND bucket_month >= CAST(:full_from AS DATE)
+      AND bucket_month < CAST(:month_start AS DATE)
+    UNION ALL
+    SELECT order_count, delivery_sum, quality_sum, quality_count, invoice_sum, invoice_count
+    FROM supplier_performance_daily
+    WHERE supplier_id = p.supplier_id
+      AND bucket_date >= CAST(:last_start AS DATE)
+      AND bucket_date <= CAST(:snapshot_date AS DATE)
+  ) b
+) pf ON TRUE
+ORDER BY p.supplier_id;
+"""
+
+SQL_INSERT_SNAPSHOT = """
+INSERT INTO supplier_score_snapshots
+  (supplier_id, snapshot_date, industry, compliance_score, order_count,
+   delivery_score, quality_score, invoice_score, performance_score, trust_score, source)
+VALUES
+  (:supplier_id, :snapshot_date, :industry, :compliance_score, :order_count,
+   :delivery_score, :quality_score, :invoice_score, :performance_score, :trust_score, :source)
+ON CONFLICT (supplier_id, snapshot_date) DO NOTHING;
+"""
+
+# (supplier_id, industry, compliance, orders, delivery, quality, invoice, performance, trust)
+SnapshotRow = Tuple[str, str, int, int, float, float, float, float, float]
+
+
+def month_ends(start: datetime.date, end: datetime.date) -> List[datetime.date]:
+    """
+    Last day of every month from start's month on, up to end.
+    """
+    out = []
+    year, month = start.year, start.month
+    while True:
+        first_next = datetime.date(year + month // 12, month % 12 + 1, 1)
+        last = first_next - datetime.timedelta(days=1)
+        if last > end:
+            return out
+        out.append(last)
+        year, month = first_next.year, first_next.month
+
+
+def window_params(snapshot_date: datetime.date, window_days: int = WINDOW_DAYS) -> Dict[str, datetime.date]:
+    """
+    Bucket ranges of SQL_SNAPSHOT_PAGE for a window of `window_days` days
+    ending on snapshot_date (whole history when <= 0).
+    """
+    month_start = snapshot_date.replace(day=1)
+    if window_days and window_days > 0:
+        window_start = snapshot_date - datetime.timedelta(days=window_days)
+        full_from = (window_start.replace(day=1) + datetime.timedelta(days=32)).replace(day=1)
+    else:
+        window_start = full_from = datetime.date.min
+    return {
+        "snapshot_date": snapshot_date,
+        "window_start": window_start,
+        "first_end": min(full_from, month_start),
+        "full_from": full_from,
+        "month_start": month_start,
+        "last_start": max(month_start, window_start),
+    }
+
+
+def score_row(record: List[Dict[str, Any]]) -> SnapshotRow:
+    """
+    Score one SQL_SNAPSHOT_PAGE record.
+    """
+    statuses = json.loads(record[2]["stringValue"])
+    compliance = score_statuses(statuses)
+    integrity = record_integrity_score(record[3].get("longValue"))
+    perf = scores_from_aggregate(record[4:])
+    return (
+        record[0]["stringValue"],
+        record[1]["stringValue"],
+        compliance,
+        int(record[4].get("longValue", 0)),
+        float(perf["delivery_score"]),
+        float(perf["quality_score"]),
+        float(perf["invoice_score"]),
+        float(perf["performance_score"]),
+        float(trust_score(integrity, compliance, perf["performance_score"])),
+    )
+
+
+def iter_pages(exec_sql: Callable, snapshot_date: datetime.date, page_size: int = 1000,
+               window_days: int = WINDOW_DAYS) -> Iterator[List[SnapshotRow]]:
+    """
+    Yield scored pages of the suppliers without a snapshot for the date.
+    """
+    bounds = [make_param(k, v) for k, v in window_params(snapshot_date, window_days).items()]
+    after = ""
+    while True:
+        resp = exec_sql(SQL_SNAPSHOT_PAGE, bounds + [
+            make_param("after", after),
+            make_param("page_size", page_size),
+        ])
+        records = resp.get("records", [])
+        if not records:
+            return
+        yield [score_row(r) for r in records]
+        if len(records) < page_size:
+            return
+        after = records[-1][0]["stringValue"]
+
+
+def write_snapshots(batch_exec_sql: Callable, snapshot_date: datetime.date, rows: List[SnapshotRow],
+                    source: str, batch_size: int = 500) -> None:
+    for start in range(0, len(rows), batch_size):
+        batch_exec_sql(SQL_INSERT_SNAPSHOT, [
+            [
+                make_param("supplier_id", sid),
+                make_param("snapshot_date", snapshot_date),
+                make_param("industry", industry),
+                make_param("compliance_score", compliance),
+                make_param("order_count", orders),
+                make_param("delivery_score", delivery),
+                make_param("quality_score", quality),
+                make_param("invoice_score", invoice),
+                make_param("performance_score", performance),
+                make_param("trust_score", trust),
+                make_param("source", source),
+            ]
+            for sid, industry, compliance, orders, delivery, quality, invoice, performance, trust
+            in rows[start:start + batch_size]
+        ])
+
+
+def snapshot(exec_sql: Callable, batch_exec_sql: Callable, dates: List[datetime.date],
+             source: str = "daily", page_size: int = 1000, dry_run: bool = False) -> int:
+    """
+    Write the missing snapshots for every date. Returns the rows written.
+    """
+    if not dry_run:
+        for year in sorted({d.year for d in dates}):
+            exec_sql(SQL_CREATE_PARTITION, [make_param("year", year)])
+
+    total = 0
+    for snapshot_date in dates:
+        start = time.perf_counter()
+        count = 0
+        for rows in iter_pages(exec_sql, snapshot_date, page_size):
+            if not dry_run:
+                write_snapshots(batch_exec_sql, snapshot_date, rows, source)
+            count += len(rows)
+        total += count
+        log.info("%s: %d snapshots in %.2fs", snapshot_date, count, time.perf_counter() - start)
+    return total
+
+
+def history_start(exec_sql: Callable) -> Optional[datetime.date]:
+    cell = exec_sql(SQL_HISTORY_START)["records"][0][0]
+    return None if cell.get("isNull") else datetime.date.fromisoformat(cell["stringValue"])
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--date", type=datetime.date.fromisoformat, help="snapshot date (default: yesterday)")
+    ap.add_argument("--backfill", action="store_true", help="snapshot every month end from --start to --end")
+    ap.add_argument("--start", type=datetime.date.fromisoformat,
+                    help="first backfill month (default: first order or certificate)")
+    ap.add_argument("--end", type=datetime.date.fromisoformat, help="last backfill date (default: yesterday)")
+    ap.add_argument("--page-size", type=int, default=1000)
+    ap.add_argument("--dry-run", action="store_true", help="score but do not write snapshots")
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
+
+    from common.rds_client import batch_exec_sql, exec_sql
+
+    yesterday = datetime.date.today() - datetime.timedelta(days=1)
+    if args.backfill:
+        start = args.start or history_start(exec_sql)
+        if start is None:
+            log.info("No orders or certificates; nothing to backfill")
+            return
+        dates = month_ends(start, args.end or yesterday)
+        source = "backfill"
+    else:
+        dates = [args.date or yesterday]
+        source = "daily"
+
+    start_time = time.perf_counter()
+    total = snapshot(exec_sql, batch_exec_sql, dates, source, args.page_size, args.dry_run)
+    log.info("Wrote %d snapshots for %d date(s) in %.2fs", total, len(dates), time.perf_counter() - start_time)
+
+
+if __name__ == "__main__":
+    main()
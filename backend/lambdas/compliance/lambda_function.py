@@ -1,27 +1,41 @@
 import os
 import json
 import logging
-import boto3
+from datetime import date
+
+from common.compliance import (
+    EXPIRING_FIELDS,
+    SQL_COMPLIANCE_AS_OF,
+    SQL_COMPLIANCE_COMBINED,
+    SQL_EXPIRING_CERTS,
+    compliance_body,
+    parse_combined_row,
+)
+from common.metrics import instrument_handler, timer
+from common.rds_client import exec_sql, make_param, query
+from common.response_cache import ResponseCache, shared_backend_from_env
+from common.suppliers import AmbiguousName, SupplierResolver
 
 # ---------- Config ----------
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 logging.getLogger().setLevel(LOG_LEVEL)
 log = logging.getLogger(__name__)
 
-AURORA_ARN = os.getenv("AURORA_ARN")
-SECRET_ARN = os.getenv("DB_SECRET_ARN")
-DB_NAME = os.getenv("DB_NAME", "supplier360")
+# Resolve supplier, required set and latest certs in one statement; the
+# three-query path is kept as a fallback.
+SINGLE_QUERY = os.getenv("COMPLIANCE_SINGLE_QUERY", "true").lower() == "true"
 
-rds = boto3.client("rds-data")
+# Serve precomputed supplier_scorecard rows when they are fresh.
+SCORECARD_FAST_PATH = os.getenv("SCORECARD_FAST_PATH", "true").lower() == "true"
 
-# ---------- SQL ----------
-SQL_SUPPLIER = """
-SELECT supplier_id, supplier_name, industry
-FROM supplier_master
-WHERE (supplier_id = :sid) OR (LOWER(supplier_name) = LOWER(:sname))
-LIMIT 1;
-"""
+# /compliance/expiring defaults and bounds.
+EXPIRING_DEFAULT_DAYS = int(os.getenv("EXPIRING_DEFAULT_DAYS", "30"))
+EXPIRING_MAX_ROWS = int(os.getenv("EXPIRING_MAX_ROWS", "1000"))
+
+# How long a warm container reuses a resolved supplier id/name.
+SUPPLIER_CACHE_TTL_SECONDS = int(os.getenv("SUPPLIER_CACHE_TTL_SECONDS", "300"))
 
+# ---------- SQL ----------
 SQL_REQUIRED = """
 SELECT required_certificate_type
 FROM required_certificates_master
@@ -56,72 +70,143 @@ FROM ranked
 WHERE rn = 1;
 """
 
+SQL_SCORECARD = """
+SELECT CAST(sc.compliance_detail AS TEXT)
+FROM supplier_scorecard sc
+WHERE NOT sc.stale
+  AND sc.compliance_detail IS NOT NULL
+  AND sc.supplier_id = :sid;
+"""
+
+# ---------- Shared state (reused across warm invocations) ----------
+_resolver = SupplierResolver(query, ttl_seconds=SUPPLIER_CACHE_TTL_SECONDS)
+
+# Finished bodies by supplier_id (RESPONSE_CACHE_* settings, common.response_cache).
+_responses = ResponseCache("compliance", query, shared=shared_backend_from_env())
+
 # ---------- Helpers ----------
-def _param(name, value):
-    return {
-        "name": name,
-        "value": {
-            "stringValue": value if value is not None else ""
+def _fetch_combined(supplier):
+    """
+    One round trip: supplier, required set and latest certs.
+    Returns (sid, sname, industry, required, latest) or None if not found.
+    """
+    resp = exec_sql(SQL_COMPLIANCE_COMBINED, [make_param("sid", supplier.supplier_id)])
+    if not resp.get("records"):
+        return None
+    return parse_combined_row(resp["records"][0])
+
+def _fetch_as_of(supplier, as_of):
+    """
+    Same return shape as _fetch_combined, evaluated as of the end of day
+    `as_of` (certificates issued by then, statuses from their dates).
+    """
+    resp = exec_sql(SQL_COMPLIANCE_AS_OF, [
+        make_param("sid", supplier.supplier_id),
+        make_param("as_of", as_of.isoformat())
+    ])
+    if not resp.get("records"):
+        return None
+    return parse_combined_row(resp["records"][0])
+
+def _fetch_sequential(supplier):
+    """
+    Original round trips (the supplier is already resolved). Same return
+    shape as _fetch_combined.
+    """
+    sid, sname, industry = supplier
+
+    # 1) Required certs for this industry
+    rresp = exec_sql(SQL_REQUIRED, [make_param("industry", industry)])
+    required = [rec[0]["stringValue"] for rec in rresp.get("records", [])]
+
+    # 2) Latest cert per type
+    cresp = exec_sql(SQL_LATEST_CERTS, [make_param("sid", sid)])
+    latest = {}
+    for r in cresp.get("records", []):
+        ctype = r[0]["stringValue"]
+        latest[ctype] = {
+            "certificate_number": r[1]["stringValue"],
+            "issuing_body":       r[2]["stringValue"],
+            "issue_date":         r[3]["stringValue"],
+            "expiry_date":        r[4].get("stringValue") if r[4] else None,
+            "valid_status":       r[5]["stringValue"]
         }
-    }
+    return sid, sname, industry, required, latest
 
-def _exec(sql, params):
-    return rds.execute_statement(
-        resourceArn=AURORA_ARN,
-        secretArn=SECRET_ARN,
-        database=DB_NAME,
-        sql=sql,
-        parameters=params
-    )
+def _from_scorecard(supplier_id):
+    """
+    Precomputed response body, or None if there is no fresh scorecard row.
+    """
+    resp = exec_sql(SQL_SCORECARD, [make_param("sid", supplier_id)])
+    if not resp.get("records"):
+        return None
+    body = json.loads(resp["records"][0][0]["stringValue"])
+    body["mode"] = "scorecard"
+    return body
 
-def _score(required, latest):
+def _compliance(supplier, as_of=None):
     """
-    Simple scoring:
-      - Each required cert has equal weight.
-      - Valid   => full weight
-      - Pending => half weight
-      - Missing / Expired / other => 0
+    Response body for a resolved supplier, or None if it is gone meanwhile.
+    With `as_of` the scorecard (which is as of today) is skipped.
     """
-    breakdown = {"Valid": [], "Expired": [], "Missing": [], "Pending": []}
-    issues = []
-    n = max(1, len(required))
-    per = 100 / n
-    total = 0.0
-
-    for req in required:
-        info = latest.get(req)
-        if not info:
-            breakdown["Missing"].append(req)
-            issues.append({"type": "Missing", "detail": f"{req} is missing"})
-            continue
-
-        status = (info.get("valid_status") or "").strip()
-        if status == "Valid":
-            breakdown["Valid"].append(req)
-            total += per
-        elif status == "Pending":
-            breakdown["Pending"].append(req)
-            total += 0.5 * per
-            issues.append({"type": "Pending", "detail": f"{req} is pending"})
-        else:
-            breakdown["Expired"].append(req)
-            detail = f"{req} {status.lower() or 'non-compliant'}"
-            if info.get("expiry_date"):
-                detail += f" (expiry {info['expiry_date']})"
-            issues.append({"type": status or "NonCompliant", "detail": detail})
-
-    score = round(total)
-    if not breakdown["Expired"] and not breakdown["Missing"] and not breakdown["Pending"]:
-        summary = f"Fully compliant: {n}/{n} required certificates valid"
-    else:
-        summary = (
-            f"Mixed: {len(breakdown['Valid'])} valid, "
-            f"{len(breakdown['Expired'])} expired, "
-            f"{len(breakdown['Missing'])} missing, "
-            f"{len(breakdown['Pending'])} pending"
-        )
-
-    return breakdown, issues, int(score), summary
+    if as_of is not None:
+        fetched = _fetch_as_of(supplier, as_of)
+        if fetched is None:
+            return None
+        sid, sname, industry, required, latest = fetched
+        body = compliance_body(sid, sname, industry, required, latest, mode="as_of")
+        body["as_of"] = as_of.isoformat()
+        return body
+
+    if SCORECARD_FAST_PATH:
+        body = _from_scorecard(supplier.supplier_id)
+        if body is not None:
+            return body
+
+    fetched = _fetch(supplier)
+    if fetched is None:
+        return None
+    sid, sname, industry, required, latest = fetched
+    return compliance_body(sid, sname, industry, required, latest)
+
+def _expiring(req):
+    """
+    Certificates expiring in the next N days across all suppliers.
+    """
+    days = int(req.get("days") or EXPIRING_DEFAULT_DAYS)
+    limit = int(req.get("limit") or EXPIRING_MAX_ROWS)
+    if days < 0 or limit < 1:
+        return 400, {
+            "error": "days must be >= 0 and limit >= 1",
+            "example": {"days": 30, "industry": "Automotive", "required_only": True}
+        }
+    limit = min(limit, EXPIRING_MAX_ROWS)
+    required_only = str(req.get("required_only") or "").lower() in ("true", "1", "yes")
+
+    rows = query(SQL_EXPIRING_CERTS, [
+        make_param("days", days),
+        make_param("industry", req.get("industry") or ""),
+        make_param("required_only", required_only),
+        make_param("limit", limit + 1)
+    ])
+    certificates = [dict(zip(EXPIRING_FIELDS, r)) for r in rows[:limit]]
+    return 200, {
+        "days": days,
+        "industry": req.get("industry"),
+        "required_only": required_only,
+        "count": len(certificates),
+        "truncated": len(rows) > limit,
+        "certificates": certificates,
+        "mode": "aurora"
+    }
+
+def _fetch(supplier):
+    if SINGLE_QUERY:
+        try:
+            return _fetch_combined(supplier)
+        except Exception:
+            log.warning("Combined compliance query failed; using sequential queries", exc_info=True)
+    return _fetch_sequential(supplier)
 
 # ---------- Bedrock helpers ----------
 def _from_bedrock_event(event):
@@ -131,7 +216,8 @@ def _from_bedrock_event(event):
       "apiPath": "/compliance",
       "parameters": [
         {"name": "supplier_id", "value": "..."},
-        {"name": "supplier_name", "value": "..."}
+        {"name": "supplier_name", "value": "..."},
+        {"name": "as_of", "value": "YYYY-MM-DD"}
       ],
       ...
     }
@@ -142,36 +228,63 @@ def _from_bedrock_event(event):
         return {
             "supplier_id": pmap.get("supplier_id"),
             "supplier_name": pmap.get("supplier_name"),
+            "as_of": pmap.get("as_of"),
+            "days": pmap.get("days"),
+            "industry": pmap.get("industry"),
+            "required_only": pmap.get("required_only"),
+            "limit": pmap.get("limit"),
+            "_api_path": event.get("apiPath"),
             "_bedrock": True
         }
     # direct invocation
+    event = event or {}
     return {
-        "supplier_id": (event or {}).get("supplier_id"),
-        "supplier_name": (event or {}).get("supplier_name"),
+        "supplier_id": event.get("supplier_id"),
+        "supplier_name": event.get("supplier_name"),
+        "as_of": event.get("as_of"),
+        "days": event.get("days"),
+        "industry": event.get("industry"),
+        "required_only": event.get("required_only"),
+        "limit": event.get("limit"),
+        "_api_path": "/compliance/expiring" if event.get("expiring") else "/compliance",
         "_bedrock": False
     }
 
-def _respond_bedrock(status, body):
+def _respond_bedrock(status, body, api_path="/compliance"):
+    with timer("serialize"):
+        payload = json.dumps(body, default=str)
     return {
         "messageVersion": "1.0",
         "response": {
             "actionGroup": "compliance",   # must match your Action Group name
-            "apiPath": "/compliance",
+            "apiPath": api_path,
             "httpMethod": "GET",
             "httpStatusCode": status,
             "responseBody": {
                 "application/json": {
-                    "body": json.dumps(body, default=str)
+                    "body": payload
                 }
             }
         }
     }
 
 # ---------- Handler ----------
+@instrument_handler("compliance")
 def lambda_handler(event, context):
     log.info("Event: %s", json.dumps(event, default=str))
 
     req = _from_bedrock_event(event)
+
+    if req["_api_path"] == "/compliance/expiring":
+        try:
+            status, body = _expiring(req)
+        except ValueError as e:
+            status, body = 400, {"error": str(e)}
+        except Exception as e:
+            log.exception("Error in Lambda2 (expiring)")
+            status, body = 500, {"error": "InternalError", "detail": str(e)}
+        return _respond_bedrock(status, body, req["_api_path"]) if req["_bedrock"] else body
+
     supplier_id = req["supplier_id"]
     supplier_name = req["supplier_name"]
     is_bedrock = req["_bedrock"]
@@ -186,14 +299,36 @@ def lambda_handler(event, context):
         }
         return _respond_bedrock(400, body) if is_bedrock else body
 
+    as_of = None
+    if req["as_of"]:
+        try:
+            as_of = date.fromisoformat(str(req["as_of"]).strip())
+        except ValueError:
+            body = {
+                "error": "as_of must be a date (YYYY-MM-DD)",
+                "example": {"supplier_name": "Ford Motor Company", "as_of": "2025-06-30"}
+            }
+            return _respond_bedrock(400, body) if is_bedrock else body
+
     try:
-        # 1) Supplier lookup
-        sresp = _exec(SQL_SUPPLIER, [
-            _param("sid", supplier_id or ""),
-            _param("sname", supplier_name or "")
-        ])
+        supplier = _resolver.resolve(supplier_id, supplier_name)
+        body = None
+
+        if isinstance(supplier, AmbiguousName):
+            body = supplier.body(supplier_name)
+            return _respond_bedrock(409, body) if is_bedrock else body
+
+        if supplier is not None:
+            # Statuses depend on the evaluation date, so the date is part of the key
+            if as_of is None:
+                variant = date.today().isoformat()
+            else:
+                variant = f"as_of:{as_of.isoformat()}"
+            body, cache_status = _responses.get_or_compute(
+                supplier.supplier_id, variant, lambda: _compliance(supplier, as_of)
+            )
 
-        if not sresp.get("records"):
+        if body is None:
             body = {
                 "error": "Supplier not found",
                 "input": {
@@ -203,41 +338,7 @@ def lambda_handler(event, context):
             }
             return _respond_bedrock(404, body) if is_bedrock else body
 
-        row = sresp["records"][0]
-        sid      = row[0]["stringValue"]
-        sname    = row[1]["stringValue"]
-        industry = row[2]["stringValue"]
-
-        # 2) Required certs for this industry
-        rresp = _exec(SQL_REQUIRED, [_param("industry", industry)])
-        required = [rec[0]["stringValue"] for rec in rresp.get("records", [])]
-
-        # 3) Latest cert per type
-        cresp = _exec(SQL_LATEST_CERTS, [_param("sid", sid)])
-        latest = {}
-        for r in cresp.get("records", []):
-            ctype = r[0]["stringValue"]
-            latest[ctype] = {
-                "certificate_number": r[1]["stringValue"],
-                "issuing_body":       r[2]["stringValue"],
-                "issue_date":         r[3]["stringValue"],
-                "expiry_date":        r[4].get("stringValue") if r[4] else None,
-                "valid_status":       r[5]["stringValue"]
-            }
-
-        breakdown, issues, score, summary = _score(required, latest)
-
-        body = {
-            "supplier_id": sid,
-            "supplier_name": sname,
-            "industry": industry,
-            "required_set": required,
-            "status_breakdown": breakdown,
-            "issues": issues,
-            "compliance_score": score,
-            "summary": summary,
-            "mode": "aurora"
-        }
+        body = dict(body, cache_status=cache_status)
 
         return _respond_bedrock(200, body) if is_bedrock else body
 
@@ -1,70 +1,181 @@
 import os
 import json
 import logging
-import boto3
-from difflib import SequenceMatcher, get_close_matches
+
+from common import response_cache
+from common.dedup import duplicate_check, name_index_cache
+from common.metrics import instrument_handler, timer
+from common.name_index import NameIndex
+from common.rds_client import exec_sql, make_param, query
 
 # ---------- Config ----------
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 logging.getLogger().setLevel(LOG_LEVEL)
 log = logging.getLogger(__name__)
 
-AURORA_ARN = os.getenv("AURORA_ARN")
-SECRET_ARN = os.getenv("DB_SECRET_ARN")
-DB_NAME = os.getenv("DB_NAME", "supplier360")
+# Warm-container name index cache: full reload after the TTL, incremental
+# refresh of changed rows at most every REFRESH seconds, memory budget in MB.
+INDEX_TTL_SECONDS = int(os.getenv("DEDUP_INDEX_TTL_SECONDS", "3600"))
+INDEX_REFRESH_SECONDS = int(os.getenv("DEDUP_INDEX_REFRESH_SECONDS", "30"))
+INDEX_MAX_MB = int(os.getenv("DEDUP_INDEX_MAX_MB", "256"))
+
+# Upper bound on names scored by one /deduplication/batch call.
+BATCH_MAX_NAMES = int(os.getenv("DEDUP_BATCH_MAX_NAMES", "1000"))
 
-rds = boto3.client("rds-data")
+# Serve precomputed supplier_scorecard rows when they are fresh.
+SCORECARD_FAST_PATH = os.getenv("SCORECARD_FAST_PATH", "true").lower() == "true"
 
 # ---------- SQL ----------
-SQL_FETCH_ALL = """
+# An exact (case-sensitive) name is a 100% match, which is what the fuzzy
+# path would return; lets a cold container answer without loading the index.
+SQL_SCORECARD_EXACT = """
 SELECT supplier_id, supplier_name
-FROM supplier_master;
+FROM supplier_scorecard
+WHERE NOT stale AND supplier_name = :sname
+ORDER BY supplier_id
+LIMIT 1;
 """
 
-# ---------- Helpers ----------
-def _exec(sql, params=None):
-    return rds.execute_statement(
-        resourceArn=AURORA_ARN,
-        secretArn=SECRET_ARN,
-        database=DB_NAME,
-        sql=sql,
-        parameters=params or []
-    )
+# ---------- Name index (reused across warm invocations) ----------
+_cache = name_index_cache(
+    query,
+    ttl_seconds=INDEX_TTL_SECONDS,
+    refresh_seconds=INDEX_REFRESH_SECONDS,
+    max_bytes=INDEX_MAX_MB * 1024 * 1024,
+)
+
+# Single-name results by input name. Any supplier's name can change the best
+# match, so entries are only valid for the index version they came from
+# rather than being keyed by one supplier_id.
+_responses = response_cache.LocalCache(response_cache.MAX_ENTRIES, response_cache.TTL_SECONDS)
+
+# cache_status of a 200 computed without the response cache; every 200
+# reports one, as in the other Lambdas.
+_UNCACHED = "miss" if response_cache.ENABLED else "off"
+
+def _match(supplier_input, index):
+    """
+    (result, cache_status) for one name against an up-to-date index.
+    """
+    if not response_cache.ENABLED:
+        return duplicate_check(supplier_input, index), "off"
+    cached = _responses.get(supplier_input)
+    if cached is not None and cached[0] == _cache.version:
+        return cached[1], "hit"
+    result = duplicate_check(supplier_input, index)
+    _responses.set(supplier_input, (_cache.version, result))
+    return result, "miss"
+
+def _parse_names(value):
+    """
+    Batch names arrive as a list (direct invoke) or, from Bedrock, as a
+    string holding a JSON array or a comma separated list. ValueError
+    unless they are a list of non-empty strings.
+    """
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            value = value.strip("[]").split(",")
+        if isinstance(value, str):
+            value = [value]
+    if not isinstance(value, list):
+        raise ValueError("supplier_names must be a list of supplier names")
+    names = []
+    for v in value:
+        name = v.strip().strip('"').strip() if isinstance(v, str) else ""
+        if not name:
+            raise ValueError(f"supplier_names must be non-empty strings, got {json.dumps(v)}")
+        names.append(name)
+    return names
 
 def _from_bedrock_event(event):
     if isinstance(event, dict) and "apiPath" in event:
         params = event.get("parameters", [])
-        pmap = {p.get("name"): p.get("value") for p in params}
+        props = (((event.get("requestBody") or {}).get("content") or {})
+                 .get("application/json", {}).get("properties", []))
+        pmap = {p.get("name"): p.get("value") for p in params + props}
         return {
             "supplier_name": pmap.get("supplier_name"),
+            "supplier_names": pmap.get("supplier_names"),
+            "_api_path": event.get("apiPath"),
+            "_http_method": event.get("httpMethod", "GET"),
             "_bedrock": True
         }
     return {
         "supplier_name": (event or {}).get("supplier_name"),
+        "supplier_names": (event or {}).get("supplier_names"),
         "_bedrock": False
     }
 
-def _respond_bedrock(status, body):
+def _respond_bedrock(status, body, api_path="/deduplication", http_method="GET"):
+    with timer("serialize"):
+        payload = json.dumps(body, default=str)
     return {
         "messageVersion": "1.0",
         "response": {
             "actionGroup": "deduplication",
-            "apiPath": "/deduplication",
-            "httpMethod": "GET",
+            "apiPath": api_path,
+            "httpMethod": http_method,
             "httpStatusCode": status,
             "responseBody": {
                 "application/json": {
-                    "body": json.dumps(body, default=str)
+                    "body": payload
                 }
             }
         }
     }
 
+# ---------- Batch ----------
+def _batch(req):
+    example = {"supplier_names": ["Ford Motors", "Toyota Motor Co."]}
+    try:
+        names = _parse_names(req["supplier_names"]) if req["supplier_names"] is not None else []
+    except ValueError as e:
+        return 400, {"error": str(e), "example": example}
+    if not names:
+        return 400, {
+            "error": "supplier_names is required",
+            "example": example
+        }
+    if len(names) > BATCH_MAX_NAMES:
+        return 400, {
+            "error": f"At most {BATCH_MAX_NAMES} names per batch; use jobs.dedup_batch for files",
+            "received": len(names)
+        }
+
+    index = _cache.get()
+    log.info("Name index cache: %s", json.dumps(_cache.stats))
+
+    results = [duplicate_check(name, index) for name in names]
+
+    return 200, {
+        "count": len(results),
+        "duplicates": sum(1 for r in results if r.get("is_duplicate")),
+        "results": results,
+        "mode": "aurora",
+        "cache_status": _UNCACHED
+    }
+
 # ---------- Handler ----------
+@instrument_handler("deduplication")
 def lambda_handler(event, context):
     log.info("Event: %s", json.dumps(event, default=str))
 
     req = _from_bedrock_event(event)
+
+    if req.get("_api_path") == "/deduplication/batch" or (
+        not req["_bedrock"] and req["supplier_names"] is not None
+    ):
+        try:
+            status, body = _batch(req)
+        except Exception as e:
+            log.exception("Error in Duplicate Detection Lambda (batch)")
+            status, body = 500, {"error": "InternalError", "detail": str(e)}
+        if req["_bedrock"]:
+            return _respond_bedrock(status, body, req["_api_path"], req["_http_method"])
+        return body
+
     supplier_input = (req.get("supplier_name") or "").strip()
     is_bedrock = req["_bedrock"]
 
@@ -76,48 +187,29 @@ def lambda_handler(event, context):
         return _respond_bedrock(400, body) if is_bedrock else body
 
     try:
-        # 1) Fetch supplier list
-        resp = _exec(SQL_FETCH_ALL)
-        records = resp.get("records", [])
-
-        supplier_list = []
-        id_map = {}
-
-        for r in records:
-            sid = r[0]["stringValue"]
-            sname = r[1]["stringValue"]
-            supplier_list.append(sname)
-            id_map[sname] = sid
-
-        if not supplier_list:
-            body = {"message": "No suppliers found in the database."}
+        # 0) Cold container: try an exact scorecard hit before loading the index
+        if SCORECARD_FAST_PATH and not _cache.warm:
+            card = exec_sql(SQL_SCORECARD_EXACT, [
+                make_param("sname", supplier_input)
+            ])
+            if card.get("records"):
+                row = card["records"][0]
+                index = NameIndex.from_records([(row[0]["stringValue"], row[1]["stringValue"])])
+                result = duplicate_check(supplier_input, index, mode="scorecard")
+                result["cache_status"] = _UNCACHED
+                return _respond_bedrock(200, result) if is_bedrock else result
+
+        # 1) Supplier name index
+        index = _cache.get()
+        log.info("Name index cache: %s", json.dumps(_cache.stats))
+
+        if not len(index):
+            body = {"message": "No suppliers found in the database.", "cache_status": _UNCACHED}
             return _respond_bedrock(200, body) if is_bedrock else body
 
-        # 2) Fuzzy matching using built-in difflib
-        matches = get_close_matches(supplier_input, supplier_list, n=1, cutoff=0.5)
-
-        if matches:
-            best_match = matches[0]
-            similarity = int(SequenceMatcher(None, supplier_input, best_match).ratio() * 100)
-        else:
-            best_match = None
-            similarity = 0
-
-        is_duplicate = similarity >= 90
-
-        result = {
-            "input_supplier": supplier_input,
-            "is_duplicate": is_duplicate,
-            "matched_supplier": best_match if is_duplicate else None,
-            "matched_supplier_id": id_map.get(best_match) if is_duplicate else None,
-            "similarity_score": similarity,
-            "message": (
-                f"Potential duplicate found: '{best_match}' ({similarity}% match)"
-                if is_duplicate
-                else "No duplicate supplier found."
-            ),
-            "mode": "aurora"
-        }
+        # 2) Fuzzy matching: trigram candidates, scored with difflib
+        result, cache_status = _match(supplier_input, index)
+        result = dict(result, cache_status=cache_status)
 
         return _respond_bedrock(200, result) if is_bedrock else result
 
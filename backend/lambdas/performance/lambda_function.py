@@ -1,51 +1,101 @@
 import os
 import json
 import logging
-import boto3
+from datetime import date
+
+from common.metrics import instrument_handler, timer
+from common.performance import (
+    MAX_NOTES,
+    SQL_SUPPLIER_HISTORY,
+    WINDOW_DAYS,
+    WINDOW_ORDERS,
+    compute_scores,
+    performance_body,
+    score_supplier,
+)
+from common.rds_client import exec_sql, make_param, query
+from common.response_cache import ResponseCache, shared_backend_from_env
+from common.suppliers import AmbiguousName, SupplierResolver
 
 # ---------- Config ----------
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 logging.getLogger().setLevel(LOG_LEVEL)
 log = logging.getLogger(__name__)
 
-AURORA_ARN = os.getenv("AURORA_ARN")
-SECRET_ARN = os.getenv("DB_SECRET_ARN")
-DB_NAME = os.getenv("DB_NAME", "supplier360")
+# Aggregate in SQL over a bounded window instead of pulling every order row.
+# Default window: PERF_WINDOW_DAYS / PERF_WINDOW_ORDERS (see common.performance);
+# requests can override it with window_days / window_orders.
+SQL_AGGREGATE = os.getenv("PERF_SQL_AGGREGATE", "true").lower() == "true"
 
-rds = boto3.client("rds-data")
+# Read the running-sum bucket tables when the window is whole history or
+# last N days (a last-N-orders window still uses the aggregate query).
+USE_BUCKETS = os.getenv("PERF_USE_BUCKETS", "true").lower() == "true"
+
+# Serve precomputed supplier_scorecard rows when they are fresh.
+SCORECARD_FAST_PATH = os.getenv("SCORECARD_FAST_PATH", "true").lower() == "true"
+
+# How long a warm container reuses a resolved supplier id/name.
+SUPPLIER_CACHE_TTL_SECONDS = int(os.getenv("SUPPLIER_CACHE_TTL_SECONDS", "300"))
 
 # ---------- SQL ----------
-SQL_SUPPLIER_HISTORY = """
-SELECT
-    on_time,
-    delivery_delay_days,
-    quality_compliance_pct,
-    invoice_match_pct,
-    incidents,
-    notes
-FROM supplier_performance_history
-WHERE supplier_id = :sid;
+# A last-N-days window moves every day, so such a row is only served on the
+# day it was computed (jobs.refresh_scorecards recomputes older ones).
+SQL_SCORECARD = """
+SELECT CAST(sc.performance_detail AS TEXT)
+FROM supplier_scorecard sc
+WHERE NOT sc.stale
+  AND sc.performance_detail IS NOT NULL
+  AND (:window_days = 0 OR sc.refreshed_at >= CURRENT_DATE)
+  AND sc.supplier_id = :sid;
 """
 
-SQL_SUPPLIER_LOOKUP = """
-SELECT supplier_id, supplier_name
-FROM supplier_master
-WHERE LOWER(supplier_name) = LOWER(:sname)
-LIMIT 1;
-"""
+# ---------- Shared state (reused across warm invocations) ----------
+_resolver = SupplierResolver(query, ttl_seconds=SUPPLIER_CACHE_TTL_SECONDS)
+
+# Finished bodies by supplier_id (RESPONSE_CACHE_* settings, common.response_cache).
+_responses = ResponseCache("performance", query, shared=shared_backend_from_env())
 
 # ---------- Helpers ----------
-def _param(name, value):
-    return {"name": name, "value": {"stringValue": str(value) if value else ""}}
-
-def _exec(sql, params):
-    return rds.execute_statement(
-        resourceArn=AURORA_ARN,
-        secretArn=SECRET_ARN,
-        database=DB_NAME,
-        sql=sql,
-        parameters=params
-    )
+def _performance(supplier_id, supplier_name, window_days, window_orders, custom_window):
+    # Fresh precomputed scorecard row, if any (default window only)
+    if SCORECARD_FAST_PATH and not custom_window:
+        card = exec_sql(SQL_SCORECARD, [
+            make_param("sid", supplier_id),
+            make_param("window_days", WINDOW_DAYS),
+        ])
+        if card.get("records"):
+            body = json.loads(card["records"][0][0]["stringValue"])
+            body["mode"] = "scorecard"
+            return body
+
+    if SQL_AGGREGATE or (USE_BUCKETS and window_orders <= 0):
+        # One aggregated row (bucket sums when possible), bounded notes
+        result = score_supplier(
+            exec_sql, supplier_id, window_days, window_orders, MAX_NOTES, USE_BUCKETS
+        )
+    else:
+        # Fetch performance history
+        perf = exec_sql(SQL_SUPPLIER_HISTORY, [make_param("sid", supplier_id)])
+        rows = perf.get("records", [])
+
+        result = compute_scores(rows)
+
+    return performance_body(supplier_id, supplier_name, result)
+
+def _window_param(value, name):
+    """
+    A window size from the request: None when not given, ValueError unless
+    it is a non-negative integer.
+    """
+    if value is None or value == "":
+        return None
+    try:
+        size = int(value)
+        if size < 0 or (isinstance(value, float) and size != value):
+            raise ValueError
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a non-negative integer, got {value!r}") from None
+    return size
 
 # ---------- Bedrock Helpers ----------
 def _from_bedrock_event(event):
@@ -57,15 +107,21 @@ def _from_bedrock_event(event):
         pmap = {p["name"]: p["value"] for p in params}
         return {
             "supplier_name": pmap.get("supplier_name"),
+            "window_days": pmap.get("window_days"),
+            "window_orders": pmap.get("window_orders"),
             "_bedrock": True
         }
     # Direct invoke
     return {
         "supplier_name": (event or {}).get("supplier_name"),
+        "window_days": (event or {}).get("window_days"),
+        "window_orders": (event or {}).get("window_orders"),
         "_bedrock": False
     }
 
 def _respond_bedrock(status, body):
+    with timer("serialize"):
+        payload = json.dumps(body, default=str)
     return {
         "messageVersion": "1.0",
         "response": {
@@ -75,62 +131,14 @@ def _respond_bedrock(status, body):
             "httpStatusCode": status,
             "responseBody": {
                 "application/json": {
-                    "body": json.dumps(body, default=str)
+                    "body": payload
                 }
             }
         }
     }
 
-# ---------- Scoring ----------
-def compute_scores(rows):
-    if not rows:
-        return {
-            "delivery_score": 0,
-            "quality_score": 0,
-            "invoice_score": 0,
-            "performance_score": 0,
-            "notes": ["No performance records found"]
-        }
-
-    delivery_scores, quality_scores, invoice_scores, notes_list = [], [], [], []
-
-    for r in rows:
-        on_time = r[0].get("booleanValue") if r[0] else None
-        delay_days = int(r[1].get("longValue", 0)) if r[1] else 0
-
-        quality_pct = float(r[2].get("doubleValue") or r[2].get("stringValue"))
-        invoice_pct = float(r[3].get("doubleValue") or r[3].get("stringValue"))
-
-        incidents = int(r[4].get("longValue", 0)) if r[4] else 0
-        notes = r[5]["stringValue"] if r[5] else ""
-        if notes:
-            notes_list.append(notes)
-
-        # Delivery
-        if on_time:
-            delivery_scores.append(100)
-        else:
-            penalty = min(delay_days * 5, 100)
-            delivery_scores.append(max(0, 100 - penalty))
-
-        quality_scores.append(quality_pct)
-        invoice_scores.append(invoice_pct)
-
-    avg_del = sum(delivery_scores) / len(delivery_scores)
-    avg_qual = sum(quality_scores) / len(quality_scores)
-    avg_inv = sum(invoice_scores) / len(invoice_scores)
-
-    final = avg_del * 0.40 + avg_qual * 0.35 + avg_inv * 0.25
-
-    return {
-        "delivery_score": round(avg_del, 2),
-        "quality_score": round(avg_qual, 2),
-        "invoice_score": round(avg_inv, 2),
-        "performance_score": round(final, 2),
-        "notes": notes_list
-    }
-
 # ---------- Handler ----------
+@instrument_handler("performance")
 def lambda_handler(event, context):
     log.info("Event: %s", json.dumps(event, default=str))
 
@@ -143,35 +151,37 @@ def lambda_handler(event, context):
         return _respond_bedrock(400, body) if is_bedrock else body
 
     try:
+        days = _window_param(req["window_days"], "window_days")
+        orders = _window_param(req["window_orders"], "window_orders")
+    except ValueError as e:
+        body = {"error": str(e)}
+        return _respond_bedrock(400, body) if is_bedrock else body
+
+    try:
+        # An explicit 0 (whole history / no order limit) overrides the default
+        custom_window = days is not None or orders is not None
+        window_days = WINDOW_DAYS if days is None else days
+        window_orders = WINDOW_ORDERS if orders is None else orders
+
         # Resolve supplier ID using supplier_name
-        lookup = _exec(SQL_SUPPLIER_LOOKUP, [
-            _param("sname", supplier_name)
-        ])
+        supplier = _resolver.by_name(supplier_name)
 
-        if not lookup.get("records"):
+        if supplier is None:
             body = {"error": "Supplier not found", "input": supplier_name}
             return _respond_bedrock(404, body) if is_bedrock else body
-
-        row = lookup["records"][0]
-        supplier_id = row[0]["stringValue"]
-        supplier_name = row[1]["stringValue"]
-
-        # Fetch performance history
-        perf = _exec(SQL_SUPPLIER_HISTORY, [_param("sid", supplier_id)])
-        rows = perf.get("records", [])
-
-        result = compute_scores(rows)
-
-        body = {
-            "supplier_name": supplier_name,
-            "supplier_id": supplier_id,
-            "delivery_score": result["delivery_score"],
-            "quality_score": result["quality_score"],
-            "invoice_score": result["invoice_score"],
-            "performance_score": result["performance_score"],
-            "notes": result["notes"],
-            "mode": "performance_scoring"
-        }
+        if isinstance(supplier, AmbiguousName):
+            body = supplier.body(supplier_name)
+            return _respond_bedrock(409, body) if is_bedrock else body
+
+        supplier_id, supplier_name, _ = supplier
+
+        # Windows end today, so the date is part of the key
+        variant = f"{date.today().isoformat()}:{window_days}:{window_orders}:{int(custom_window)}"
+        body, cache_status = _responses.get_or_compute(
+            supplier_id, variant,
+            lambda: _performance(supplier_id, supplier_name, window_days, window_orders, custom_window)
+        )
+        body = dict(body, cache_status=cache_status)
 
         return _respond_bedrock(200, body) if is_bedrock else body
 
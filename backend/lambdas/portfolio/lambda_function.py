@@ -0,0 +1,78 @@
+import os
+import json
+import logging
+
+from common.metrics import instrument_handler, timer
+from common.portfolio import DEFAULT_LIMIT, RankingError, rank_suppliers
+from common.rds_client import query
+
+# ---------- Config ----------
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+logging.getLogger().setLevel(LOG_LEVEL)
+log = logging.getLogger(__name__)
+
+_PARAMS = ("rank_by", "order", "industry", "country", "cursor", "limit")
+
+# ---------- Bedrock Helpers ----------
+def _from_bedrock_event(event):
+    if isinstance(event, dict) and "apiPath" in event:
+        params = event.get("parameters", [])
+        pmap = {p.get("name"): p.get("value") for p in params}
+        req = {key: pmap.get(key) for key in _PARAMS}
+        req["_bedrock"] = True
+        return req
+    # Direct invoke
+    req = {key: (event or {}).get(key) for key in _PARAMS}
+    req["_bedrock"] = False
+    return req
+
+def _respond_bedrock(status, body):
+    with timer("serialize"):
+        payload = json.dumps(body, default=str)
+    return {
+        "messageVersion": "1.0",
+        "response": {
+            "actionGroup": "portfolio",
+            "apiPath": "/portfolio/risk-ranking",
+            "httpMethod": "GET",
+            "httpStatusCode": status,
+            "responseBody": {
+                "application/json": {
+                    "body": payload
+                }
+            }
+        }
+    }
+
+# ---------- Handler ----------
+@instrument_handler("portfolio")
+def lambda_handler(event, context):
+    log.info("Event: %s", json.dumps(event, default=str))
+
+    req = _from_bedrock_event(event)
+    is_bedrock = req["_bedrock"]
+
+    try:
+        body = rank_suppliers(
+            query,
+            rank_by=req["rank_by"] or "trust_score",
+            order=req["order"],
+            industry=req["industry"],
+            country=req["country"],
+            cursor=req["cursor"],
+            limit=int(req["limit"] or DEFAULT_LIMIT),
+        )
+        body["mode"] = "scorecard"
+        return _respond_bedrock(200, body) if is_bedrock else body
+
+    except (RankingError, ValueError) as e:
+        body = {
+            "error": str(e),
+            "example": {"industry": "Automotive", "rank_by": "trust_score", "limit": 50}
+        }
+        return _respond_bedrock(400, body) if is_bedrock else body
+
+    except Exception as e:
+        log.exception("Portfolio Ranking Lambda Error")
+        body = {"error": "InternalError", "detail": str(e)}
+        return _respond_bedrock(500, body) if is_bedrock else body
@@ -0,0 +1,101 @@
+import os
+import json
+import logging
+
+from common.metrics import instrument_handler, timer
+from common.rds_client import query
+from common.score_history import DEFAULT_MAX_POINTS, HistoryError, score_history
+from common.suppliers import AmbiguousName, SupplierResolver
+
+# ---------- Config ----------
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+logging.getLogger().setLevel(LOG_LEVEL)
+log = logging.getLogger(__name__)
+
+# How long a warm container reuses a resolved supplier id/name.
+SUPPLIER_CACHE_TTL_SECONDS = int(os.getenv("SUPPLIER_CACHE_TTL_SECONDS", "300"))
+
+# Most points per response when interval is "auto".
+HISTORY_MAX_POINTS = int(os.getenv("HISTORY_MAX_POINTS", str(DEFAULT_MAX_POINTS)))
+
+_PARAMS = ("supplier_name", "supplier_id", "start_date", "end_date", "interval", "agg")
+
+# ---------- Shared state (reused across warm invocations) ----------
+_resolver = SupplierResolver(query, ttl_seconds=SUPPLIER_CACHE_TTL_SECONDS)
+
+# ---------- Bedrock Helpers ----------
+def _from_bedrock_event(event):
+    if isinstance(event, dict) and "apiPath" in event:
+        params = event.get("parameters", [])
+        pmap = {p.get("name"): p.get("value") for p in params}
+        req = {key: pmap.get(key) for key in _PARAMS}
+        req["_bedrock"] = True
+        return req
+    # Direct invoke
+    req = {key: (event or {}).get(key) for key in _PARAMS}
+    req["_bedrock"] = False
+    return req
+
+def _respond_bedrock(status, body):
+    with timer("serialize"):
+        payload = json.dumps(body, default=str)
+    return {
+        "messageVersion": "1.0",
+        "response": {
+            "actionGroup": "score_history",
+            "apiPath": "/suppliers/score-history",
+            "httpMethod": "GET",
+            "httpStatusCode": status,
+            "responseBody": {
+                "application/json": {
+                    "body": payload
+                }
+            }
+        }
+    }
+
+# ---------- Handler ----------
+@instrument_handler("score_history")
+def lambda_handler(event, context):
+    log.info("Event: %s", json.dumps(event, default=str))
+
+    req = _from_bedrock_event(event)
+    is_bedrock = req["_bedrock"]
+
+    if not req["supplier_name"] and not req["supplier_id"]:
+        body = {"error": "supplier_name or supplier_id is required"}
+        return _respond_bedrock(400, body) if is_bedrock else body
+
+    try:
+        supplier = _resolver.resolve(req["supplier_id"], req["supplier_name"])
+        if supplier is None:
+            body = {"error": "Supplier not found", "input": req["supplier_name"] or req["supplier_id"]}
+            return _respond_bedrock(404, body) if is_bedrock else body
+        if isinstance(supplier, AmbiguousName):
+            body = supplier.body(req["supplier_name"])
+            return _respond_bedrock(409, body) if is_bedrock else body
+
+        supplier_id, supplier_name, industry = supplier
+        body = score_history(
+            query, supplier_id,
+            start=req["start_date"],
+            end=req["end_date"],
+            interval=req["interval"],
+            agg=req["agg"],
+            max_points=HISTORY_MAX_POINTS,
+        )
+        body = dict(body, supplier_name=supplier_name, industry=industry, mode="snapshots")
+        return _respond_bedrock(200, body) if is_bedrock else body
+
+    except HistoryError as e:
+        body = {
+            "error": str(e),
+            "example": {"supplier_name": "Toyota Motor", "start_date": "2024-10-01",
+                        "end_date": "2026-09-30", "interval": "quarter"}
+        }
+        return _respond_bedrock(400, body) if is_bedrock else body
+
+    except Exception as e:
+        log.exception("Score History Lambda Error")
+        body = {"error": "InternalError", "detail": str(e)}
+        return _respond_bedrock(500, body) if is_bedrock else body
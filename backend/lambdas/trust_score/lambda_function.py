@@ -0,0 +1,279 @@
+import os
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from common.compliance import SQL_COMPLIANCE_COMBINED, compliance_body, parse_combined_row
+from common.dedup import duplicate_check, name_index_cache, record_duplicate_check, record_match
+from common.metrics import instrument_handler, timer
+from common.performance import WINDOW_DAYS, performance_body, score_supplier
+from common.rds_client import exec_sql, make_param, query
+from common.report import render_trust_body
+from common.suppliers import AmbiguousName, SupplierResolver
+from common.trust_score import TRUST_WEIGHTS, risk_level, trust_score, weighted_contributions
+
+# ---------- Config ----------
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+logging.getLogger().setLevel(LOG_LEVEL)
+log = logging.getLogger(__name__)
+
+# Same name index cache settings as the deduplication Lambda.
+INDEX_TTL_SECONDS = int(os.getenv("DEDUP_INDEX_TTL_SECONDS", "3600"))
+INDEX_REFRESH_SECONDS = int(os.getenv("DEDUP_INDEX_REFRESH_SECONDS", "30"))
+INDEX_MAX_MB = int(os.getenv("DEDUP_INDEX_MAX_MB", "256"))
+
+# Serve precomputed supplier_scorecard rows when they are fresh.
+SCORECARD_FAST_PATH = os.getenv("SCORECARD_FAST_PATH", "true").lower() == "true"
+
+# How long a warm container reuses a resolved supplier id/name.
+SUPPLIER_CACHE_TTL_SECONDS = int(os.getenv("SUPPLIER_CACHE_TTL_SECONDS", "300"))
+
+# Return the rendered data sections of the risk report (common.report).
+# The agent copies them into its answer unless the caller displays them
+# from the trace and says so with the session attribute report_display=trace
+# (the Streamlit agent client does).
+RENDER_REPORT = os.getenv("RENDER_REPORT", "true").lower() == "true"
+
+# ---------- SQL ----------
+# An exact (case-sensitive) name resolves to its own record, so a fresh
+# scorecard row answers the whole request with its stored scores. With a
+# last-N-days performance window only rows computed today are fresh.
+SQL_SCORECARD_EXACT = """
+SELECT sc.supplier_id,
+       sc.supplier_name,
+       CAST(sc.compliance_detail AS TEXT),
+       CAST(sc.performance_detail AS TEXT),
+       sc.data_integrity_score,
+       sc.trust_score,
+       d.best_match_id,
+       m.supplier_name,
+       d.similarity_score
+FROM supplier_scorecard sc
+LEFT JOIN supplier_duplicate_clusters d ON d.supplier_id = sc.supplier_id
+LEFT JOIN supplier_master m ON m.supplier_id = d.best_match_id
+WHERE NOT sc.stale
+  AND sc.compliance_detail IS NOT NULL
+  AND sc.performance_detail IS NOT NULL
+  AND sc.data_integrity_score IS NOT NULL
+  AND sc.trust_score IS NOT NULL
+  AND (:window_days = 0 OR sc.refreshed_at >= CURRENT_DATE)
+  AND sc.supplier_name = :sname
+ORDER BY sc.supplier_id
+LIMIT 1;
+"""
+
+# ---------- Shared state (reused across warm invocations) ----------
+_cache = name_index_cache(
+    query,
+    ttl_seconds=INDEX_TTL_SECONDS,
+    refresh_seconds=INDEX_REFRESH_SECONDS,
+    max_bytes=INDEX_MAX_MB * 1024 * 1024,
+)
+
+_resolver = SupplierResolver(query, ttl_seconds=SUPPLIER_CACHE_TTL_SECONDS)
+
+# The three checks are I/O bound (Data API / pool round trips), so threads
+# overlap them; boto3 clients and the psycopg pool are thread safe.
+_pool = ThreadPoolExecutor(max_workers=3)
+
+# ---------- Checks ----------
+def _data_integrity(supplier_name):
+    index = _cache.get()
+    log.info("Name index cache: %s", json.dumps(_cache.stats))
+    return duplicate_check(supplier_name, index)
+
+def _certification(supplier):
+    resp = exec_sql(SQL_COMPLIANCE_COMBINED, [make_param("sid", supplier.supplier_id)])
+    if not resp.get("records"):
+        return None
+    return compliance_body(*parse_combined_row(resp["records"][0]))
+
+def _operational(supplier):
+    sid, sname, _ = supplier
+    return performance_body(sid, sname, score_supplier(exec_sql, sid))
+
+def _record_integrity(supplier):
+    # The supplier record's Data Integrity Score, as stored in
+    # supplier_scorecard (common.dedup.record_integrity_score).
+    sid, sname, _ = supplier
+    return record_duplicate_check(sname, record_match(query, sid), mode="aurora")
+
+def _submit_checks(supplier):
+    if supplier is None:
+        return None
+    return [_pool.submit(check, supplier) for check in (_record_integrity, _certification, _operational)]
+
+def _run_checks(supplier_input):
+    """
+    Deduplication, compliance and performance, concurrently.
+
+    The input name is resolved while deduplication runs, and the record's
+    integrity, compliance and performance start on that supplier straight
+    away. If the deduplication step matches a different supplier, they are
+    re-run for the matched supplier_id, which is what the agent did when it
+    called the three action groups in sequence. A name that is ambiguous
+    without its legal suffix returns the AmbiguousName instead.
+
+    Returns (dedup, certification, operational): dedup is the input's
+    duplicate check when no supplier was found, otherwise the record's
+    (common.dedup.record_duplicate_check), like the scorecard fast path.
+    """
+    dup_f = _pool.submit(_data_integrity, supplier_input)
+    supplier = _resolver.by_name(supplier_input)
+    if isinstance(supplier, AmbiguousName):
+        dup_f.cancel()
+        return supplier
+    futures = _submit_checks(supplier)
+
+    dedup = dup_f.result()
+
+    matched_id = dedup.get("matched_supplier_id")
+    if matched_id and (supplier is None or supplier.supplier_id != matched_id):
+        for f in futures or ():
+            f.cancel()
+        futures = _submit_checks(_resolver.by_id(matched_id))
+
+    if futures is None:
+        return dedup, None, None
+    return tuple(f.result() for f in futures)
+
+def _from_scorecard(supplier_input):
+    """
+    (dedup, certification, operational, trust_score) from a fresh scorecard
+    row, or None. The stored Data Integrity and Trust Scores are returned
+    as they are, so this agrees with portfolio, snapshots and exports.
+    """
+    rows = query(SQL_SCORECARD_EXACT, [
+        make_param("sname", supplier_input),
+        make_param("window_days", WINDOW_DAYS),
+    ])
+    if not rows:
+        return None
+    (sid, sname, compliance_detail, performance_detail,
+     integrity, stored_trust, match_id, match_name, match_score) = rows[0]
+    match = (match_id, match_name, int(match_score)) if match_id else None
+    dedup = record_duplicate_check(sname, match, mode="scorecard")
+    dedup["data_integrity_score"] = int(integrity)
+    return (
+        dedup,
+        json.loads(compliance_detail),
+        json.loads(performance_detail),
+        float(stored_trust),
+    )
+
+def _trust_body(supplier_input, dedup, certification, operational, mode, stored_trust=None):
+    data_integrity_score = dedup["data_integrity_score"]
+    certification_score = certification["compliance_score"]
+    operational_score = operational["performance_score"]
+
+    for part in (dedup, certification, operational):
+        part.pop("mode", None)
+
+    body = {
+        "input_supplier": supplier_input,
+        "supplier_id": certification["supplier_id"],
+        "supplier_name": certification["supplier_name"],
+        "data_integrity_score": data_integrity_score,
+        "certification_score": certification_score,
+        "operational_score": operational_score,
+        "weights": TRUST_WEIGHTS,
+        "weighted_contributions": weighted_contributions(
+            data_integrity_score, certification_score, operational_score
+        ),
+        "trust_score": stored_trust if stored_trust is not None else trust_score(
+            data_integrity_score, certification_score, operational_score
+        ),
+        "data_integrity": dedup,
+        "certification": certification,
+        "operational": operational,
+        "mode": mode
+    }
+    body["risk_level"] = risk_level(body["trust_score"])
+    if RENDER_REPORT:
+        body["report"] = render_trust_body(body)
+    return body
+
+# ---------- Bedrock Helpers ----------
+def _from_bedrock_event(event):
+    if isinstance(event, dict) and "apiPath" in event:
+        params = event.get("parameters", [])
+        pmap = {p.get("name"): p.get("value") for p in params}
+        session = event.get("sessionAttributes") or {}
+        return {
+            "supplier_name": pmap.get("supplier_name"),
+            "report_displayed": session.get("report_display") == "trace",
+            "_bedrock": True
+        }
+    # Direct invoke
+    return {
+        "supplier_name": (event or {}).get("supplier_name"),
+        "report_displayed": False,
+        "_bedrock": False
+    }
+
+def _respond_bedrock(status, body):
+    with timer("serialize"):
+        payload = json.dumps(body, default=str)
+    return {
+        "messageVersion": "1.0",
+        "response": {
+            "actionGroup": "trust_score",
+            "apiPath": "/trust-score",
+            "httpMethod": "GET",
+            "httpStatusCode": status,
+            "responseBody": {
+                "application/json": {
+                    "body": payload
+                }
+            }
+        }
+    }
+
+# ---------- Handler ----------
+@instrument_handler("trust_score")
+def lambda_handler(event, context):
+    log.info("Event: %s", json.dumps(event, default=str))
+
+    req = _from_bedrock_event(event)
+    supplier_input = (req.get("supplier_name") or "").strip()
+    is_bedrock = req["_bedrock"]
+
+    if not supplier_input:
+        body = {
+            "error": "supplier_name is required",
+            "example": {"supplier_name": "Ford Motor Company"}
+        }
+        return _respond_bedrock(400, body) if is_bedrock else body
+
+    try:
+        checks = _from_scorecard(supplier_input) if SCORECARD_FAST_PATH else None
+        mode = "scorecard"
+        if checks is None:
+            checks = _run_checks(supplier_input)
+            mode = "aurora"
+
+        if isinstance(checks, AmbiguousName):
+            body = checks.body(supplier_input)
+            return _respond_bedrock(409, body) if is_bedrock else body
+
+        dedup, certification, operational = checks[:3]
+        stored_trust = checks[3] if len(checks) > 3 else None
+
+        if certification is None or operational is None:
+            body = {
+                "error": "Supplier not found",
+                "input": supplier_input,
+                "data_integrity": dedup
+            }
+            return _respond_bedrock(404, body) if is_bedrock else body
+
+        body = _trust_body(supplier_input, dedup, certification, operational, mode, stored_trust)
+        if "report" in body:
+            body["report_displayed"] = req["report_displayed"]
+
+        return _respond_bedrock(200, body) if is_bedrock else body
+
+    except Exception as e:
+        log.exception("Trust Score Lambda Error")
+        body = {"error": "InternalError", "detail": str(e)}
+        return _respond_bedrock(500, body) if is_bedrock else body
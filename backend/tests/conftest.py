@@ -0,0 +1,16 @@
+"""
+Shared pytest setup. The backend directory is the import root, as for
+`python -m jobs.<name>` and the deployed Lambda packages.
+
+    cd backend && python -m pytest tests
+
+Tests that need a database use DB_DSN (a Postgres with
+db/schema/schema.sql loaded) and are skipped when it is not set.
+"""
+
+import os
+import sys
+
+BACKEND_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
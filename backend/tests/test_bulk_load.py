@@ -0,0 +1,42 @@
+"""
+Chunk validation of jobs.bulk_load.
+"""
+
+from jobs.bulk_load import TABLES, validate_chunk
+
+SPEC = TABLES["suppliers"]
+
+
+def _supplier(sid, reg, name="Acme"):
+    return {
+        "supplier_id": sid, "supplier_name": name, "registration_number": reg,
+        "country": "US", "industry": "Retail", "annual_revenue": 1,
+        "employees": 1, "onboarding_date": "2024-01-01",
+    }
+
+
+def _ids(chunk):
+    return [(values[0], values[2]) for _, values in chunk.rows]
+
+
+def test_repeated_key_releases_superseded_unique_value():
+    chunk = validate_chunk(SPEC, [
+        (1, _supplier("S1", "AAA111")),
+        (2, _supplier("S1", "BBB222")),     # S1 moves to BBB222
+        (3, _supplier("S2", "AAA111")),     # free again
+    ], 3)
+    assert chunk.rejects == []
+    assert _ids(chunk) == [("S1", "BBB222"), ("S2", "AAA111")]
+
+
+def test_unique_value_of_current_row_stays_claimed():
+    chunk = validate_chunk(SPEC, [
+        (1, _supplier("S1", "AAA111")),
+        (2, _supplier("S1", "BBB222")),
+        (3, _supplier("S2", "BBB222")),
+        (4, _supplier("S1", "AAA111", name="")),   # invalid: S1 keeps BBB222
+        (5, _supplier("S3", "BBB222")),
+    ], 5)
+    assert [r["line"] for r in chunk.rejects] == [3, 4, 5]
+    assert "already used by S1" in chunk.rejects[0]["error"]
+    assert _ids(chunk) == [("S1", "BBB222")]
@@ -0,0 +1,23 @@
+"""
+Cold-import budget of every Lambda handler (jobs.check_cold_imports).
+COLD_IMPORT_BUDGET_MS overrides the budget.
+"""
+
+import os
+
+import pytest
+
+from jobs.check_cold_imports import LAMBDAS_DIR, check_handler
+
+BUDGET_MS = float(os.getenv("COLD_IMPORT_BUDGET_MS", "100"))
+
+HANDLERS = sorted(
+    d for d in os.listdir(LAMBDAS_DIR)
+    if os.path.isfile(os.path.join(LAMBDAS_DIR, d, "lambda_function.py"))
+)
+
+
+@pytest.mark.parametrize("name", HANDLERS)
+def test_cold_import_within_budget(name):
+    problems, _, _ = check_handler(name, BUDGET_MS, repeat=3)
+    assert problems == []
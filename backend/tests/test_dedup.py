@@ -0,0 +1,33 @@
+"""
+Data Integrity Score of stored supplier records (common.dedup).
+"""
+
+import pytest
+
+from common.dedup import DUPLICATE_THRESHOLD, record_duplicate_check, record_integrity_score
+
+
+@pytest.mark.parametrize("score, integrity", [
+    (None, 100), (0, 100), (50, 100), (51, 98), (75, 50), (89, 22), (90, 20), (95, 10), (100, 0),
+])
+def test_record_integrity_score(score, integrity):
+    assert record_integrity_score(score) == integrity
+
+
+def test_record_integrity_score_has_no_cliff():
+    scores = [record_integrity_score(s) for s in range(0, 101)]
+    assert all(a >= b for a, b in zip(scores, scores[1:]))
+    assert max(a - b for a, b in zip(scores, scores[1:])) <= 2
+    assert record_integrity_score(DUPLICATE_THRESHOLD - 1) - record_integrity_score(DUPLICATE_THRESHOLD) <= 2
+
+
+def test_record_duplicate_check():
+    dedup = record_duplicate_check("Acme Co", ("S2", "Acme Co.", 95))
+    assert dedup["is_duplicate"] is True
+    assert dedup["matched_supplier_id"] == "S2"
+    assert dedup["data_integrity_score"] == 10
+
+    alone = record_duplicate_check("Acme Co", None)
+    assert alone["is_duplicate"] is False
+    assert alone["matched_supplier"] is None
+    assert alone["data_integrity_score"] == 100
@@ -0,0 +1,69 @@
+"""
+Responses of the deduplication Lambda, on the Data API code path with a
+stand-in rds-data client.
+"""
+
+import importlib.util
+import os
+
+import pytest
+
+from common import rds_client
+
+LAMBDA_PATH = os.path.join(os.path.dirname(__file__), "..", "lambdas", "deduplication", "lambda_function.py")
+
+SUPPLIERS = [("S1", "Acme Co"), ("S2", "Globex Corporation")]
+
+
+class _DataApi:
+    """
+    rds-data client stand-in: supplier_scorecard and supplier_master reads.
+    """
+
+    def execute_statement(self, sql, parameters=(), **kwargs):
+        params = {p["name"]: next(iter(p["value"].values())) for p in parameters}
+        if "FROM supplier_scorecard" in sql:
+            rows = [(sid, name) for sid, name in SUPPLIERS if name == params["sname"]][:1]
+        else:
+            rows = [(sid, name, "2026-01-01 00:00:00") for sid, name in SUPPLIERS]
+        return {"records": [[{"stringValue": v} for v in row] for row in rows]}
+
+
+@pytest.fixture
+def dedup(monkeypatch):
+    monkeypatch.setenv("LOG_LEVEL", "WARNING")
+    previous = rds_client._backend
+    rds_client.set_backend(rds_client.DataApiBackend(client=_DataApi()))
+    spec = importlib.util.spec_from_file_location("test_deduplication_lambda", LAMBDA_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    yield module
+    rds_client.set_backend(previous)
+
+
+def test_every_200_reports_cache_status(dedup):
+    cold = dedup.lambda_handler({"supplier_name": "Acme Co"}, None)
+    assert cold["mode"] == "scorecard"
+    assert cold["cache_status"] in ("miss", "off")
+
+    batch = dedup.lambda_handler({"supplier_names": ["Acme Co", "Globex Corp"]}, None)
+    assert batch["count"] == 2
+    assert batch["cache_status"] in ("miss", "off")
+
+    warm = dedup.lambda_handler({"supplier_name": "Globex Corporatoin"}, None)
+    assert warm["matched_supplier_id"] == "S2"
+    assert warm["cache_status"] in ("miss", "hit", "off")
+
+
+def test_bedrock_batch_reports_cache_status(dedup):
+    event = {
+        "apiPath": "/deduplication/batch",
+        "httpMethod": "POST",
+        "parameters": [],
+        "requestBody": {"content": {"application/json": {"properties": [
+            {"name": "supplier_names", "value": '["Acme Co"]'},
+        ]}}},
+    }
+    resp = dedup.lambda_handler(event, None)["response"]
+    assert resp["httpStatusCode"] == 200
+    assert '"cache_status"' in resp["responseBody"]["application/json"]["body"]
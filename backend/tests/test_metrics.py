@@ -0,0 +1,136 @@
+"""
+EMF records and the timer()/timed() helpers of common.metrics.
+"""
+
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from common import metrics
+
+
+def _traced(handler, sample_rate=1.0):
+    """
+    handler instrumented with a list collecting its EMF records.
+    """
+    records = []
+    return metrics.instrument_handler("test", sample_rate=sample_rate, emit=records.append)(handler), records
+
+
+def test_emf_record_layout():
+    record = metrics.emf_record("compliance", {"db_ms": 1.23456, "db_calls": 2, "db_bytes": 10},
+                                cold_start=True, request_id="req-1")
+
+    directive = record["_aws"]["CloudWatchMetrics"][0]
+    assert directive["Namespace"] == metrics.NAMESPACE
+    assert directive["Dimensions"] == [["Function"]]
+    assert directive["Metrics"] == [
+        {"Name": "cold_start", "Unit": "Count"},
+        {"Name": "db_bytes", "Unit": "Bytes"},
+        {"Name": "db_calls", "Unit": "Count"},
+        {"Name": "db_ms", "Unit": "Milliseconds"},
+    ]
+    assert isinstance(record["_aws"]["Timestamp"], int)
+    assert record["Function"] == "compliance"
+    assert record["RequestId"] == "req-1"
+    assert record["db_ms"] == 1.235
+    assert record["db_calls"] == 2
+    assert record["cold_start"] == 1
+    json.dumps(record)
+
+
+def test_emf_record_without_request_id():
+    record = metrics.emf_record("compliance", {}, cold_start=False)
+    assert "RequestId" not in record
+    assert record["cold_start"] == 0
+
+
+def test_instrument_handler_collects_timers_and_counts():
+    @metrics.timed("score")
+    def score():
+        return 42
+
+    def handler(event, context):
+        assert metrics.active()
+        with metrics.timer("db"):
+            pass
+        metrics.count("db_rows", 3)
+        score()
+        score()
+        return {"score": score()}
+
+    handler, records = _traced(handler)
+    assert handler({}, SimpleNamespace(aws_request_id="req-1")) == {"score": 42}
+
+    record, = records
+    assert record["Function"] == "test"
+    assert record["RequestId"] == "req-1"
+    assert record["db_calls"] == 1
+    assert record["db_rows"] == 3
+    assert record["score_calls"] == 3
+    assert record["score_ms"] >= 0
+    assert record["handler_ms"] >= record["score_ms"]
+    assert record["response_bytes"] == len(json.dumps({"score": 42}))
+    assert not metrics.active()
+
+
+def test_cold_start_only_on_first_invocation():
+    handler, records = _traced(lambda event, context: None)
+    handler({}, None)
+    handler({}, None)
+    assert [r["cold_start"] for r in records] == [1, 0]
+
+
+def test_unsampled_invocation_records_nothing():
+    seen = []
+
+    def handler(event, context):
+        seen.append(metrics.active())
+        with metrics.timer("db"):
+            pass
+        metrics.count("db_rows")
+        return "ok"
+
+    handler, records = _traced(handler, sample_rate=0)
+    assert handler({}, None) == "ok"
+    assert seen == [False]
+    assert records == []
+
+
+def test_timers_outside_a_trace_do_nothing():
+    @metrics.timed("score")
+    def score(x):
+        return x * 2
+
+    assert score(2) == 4
+    with metrics.timer("db") as t:
+        assert t is metrics._NULL
+
+
+def test_record_emitted_when_handler_raises():
+    def handler(event, context):
+        with metrics.timer("db"):
+            raise RuntimeError("boom")
+
+    handler, records = _traced(handler)
+    with pytest.raises(RuntimeError):
+        handler({}, None)
+    record, = records
+    assert record["db_calls"] == 1
+    assert record["response_bytes"] == len("null")
+    assert not metrics.active()
+
+
+def test_worker_thread_timers_add_to_the_trace():
+    def handler(event, context):
+        threads = [threading.Thread(target=lambda: metrics.count("db_calls")) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    handler, records = _traced(handler)
+    handler({}, None)
+    assert records[0]["db_calls"] == 4
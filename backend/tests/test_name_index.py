@@ -0,0 +1,72 @@
+"""
+Supplier name index (common.name_index) and its warm-container cache
+(common.name_cache).
+"""
+
+from common.dedup import SQL_NAME_INDEX_ALL
+from common.name_cache import NameIndexCache
+from common.name_index import NameIndex
+
+
+def test_shared_name_maps_to_lowest_supplier_id():
+    assert "ORDER BY supplier_id" in SQL_NAME_INDEX_ALL
+    ordered = NameIndex.from_records([("S1", "Acme"), ("S2", "Acme")])
+    assert ordered.id_for("Acme") == "S1"
+
+    # A later (incremental) row with a lower id takes the name over.
+    index = NameIndex.from_records([("S2", "Acme")])
+    index.add("S1", "Acme")
+    assert index.id_for("Acme") == "S1"
+    index.add("S3", "Acme")
+    assert index.id_for("Acme") == "S1"
+    assert len(index) == 1
+
+
+def test_refresh_of_unchanged_shared_name_keeps_version():
+    rows = [("S1", "Acme", "2026-01-01"), ("S2", "Acme", "2026-01-01")]
+    cache = NameIndexCache(lambda: rows, lambda since: rows, refresh_seconds=0)
+    index = cache.get()
+    version = cache.version
+    cache.get()
+    assert cache.version == version
+    assert index.id_for("Acme") == "S1"
+
+
+def test_rename_onto_held_name_keeps_other_holder():
+    index = NameIndex.from_records([("S1", "Acme"), ("S2", "Globex")])
+    index.add("S1", "Globex")              # S1 joins S2 on Globex
+    assert index.id_for("Globex") == "S1"
+    assert "Acme" not in index
+
+    index.add("S1", "Initech")             # and leaves again
+    assert index.id_for("Globex") == "S2"
+    assert index.best_match("Globex") == "Globex"
+
+    index.remove("S2")
+    assert "Globex" not in index
+    assert index.id_for("Initech") == "S1"
+    assert len(index) == 1
+
+
+def test_renamed_higher_id_leaves_name_with_lowest():
+    index = NameIndex.from_records([("S1", "Acme"), ("S2", "Acme"), ("S3", "Acme")])
+    index.add("S2", "Globex")
+    index.remove("S1")
+    assert index.id_for("Acme") == "S3"
+    index.remove("S3")
+    assert "Acme" not in index
+    assert index.id_for("Globex") == "S2"
+
+
+def test_tombstones_are_compacted():
+    index = NameIndex.from_records((f"S{i}", f"Supplier {i}") for i in range(100))
+    size = index.approx_bytes()
+    for round_ in range(20):
+        for i in range(100):
+            index.add(f"S{i}", f"Supplier {i} rev {round_}")
+    assert len(index) == 100
+    assert len(index._names) <= 100 / (1 - index.compact_ratio) + 1
+    assert index.approx_bytes() < 2 * size
+    assert index.best_match("Supplier 7 rev 19") == "Supplier 7 rev 19"
+    assert index.id_for(index.best_match("Supplier 42 rev 19")) == "S42"
+    assert index.candidates("Supplier 42 rev 3") and "Supplier 42 rev 3" not in index
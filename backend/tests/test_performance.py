@@ -0,0 +1,88 @@
+"""
+Performance scoring paths (common.performance) on windows without quality /
+invoice percentages.
+"""
+
+import os
+
+import pytest
+
+from common.performance import (
+    SQL_PERFORMANCE_AGGREGATE,
+    SQL_PERFORMANCE_BUCKETS,
+    SQL_SUPPLIER_HISTORY,
+    aggregate_params,
+    bucket_params,
+    compute_scores,
+    scores_from_aggregate,
+)
+from common.rds_client import make_param
+
+NULL = {"isNull": True}
+
+
+def test_params_are_typed_with_make_param():
+    assert aggregate_params("S1", 90, 0, 20) == [
+        make_param("sid", "S1"), make_param("window_days", 90),
+        make_param("window_orders", 0), make_param("max_notes", 20),
+    ]
+    assert bucket_params("S1", None, 20) == [
+        make_param("sid", "S1"), make_param("window_days", 0), make_param("max_notes", 20),
+    ]
+
+
+def test_aggregate_row_with_null_averages():
+    row = [{"longValue": 2}, {"doubleValue": 90.0}, NULL, NULL, {"longValue": 0}, {"stringValue": "[]"}]
+    result = scores_from_aggregate(row)
+    assert result["quality_score"] == 0
+    assert result["invoice_score"] == 0
+    assert result["performance_score"] == 36.0
+
+
+class _Rollback(Exception):
+    pass
+
+
+def test_null_only_window_scores_like_compute_scores():
+    dsn = os.getenv("DB_DSN")
+    if not dsn:
+        pytest.skip("DB_DSN is not set")
+    pytest.importorskip("psycopg_pool")
+    from common.rds_client import PsycopgBackend
+
+    backend = PsycopgBackend(dsn, min_size=1, max_size=1)
+    results = {}
+    try:
+        with backend.transaction():
+            backend.execute(
+                "INSERT INTO supplier_master (supplier_id, supplier_name, registration_number, country,"
+                " industry, annual_revenue, employees, onboarding_date)"
+                " VALUES ('ZZNULL000001', 'Null Window Test', 'ZZN001', 'Nowhere', 'Retail', 1, 1,"
+                " CURRENT_DATE - 400)", [])
+            backend.execute(
+                "INSERT INTO supplier_performance_history (order_id, supplier_id, order_date,"
+                " promised_delivery_date, actual_delivery_date, on_time, delivery_delay_days)"
+                " VALUES ('ZZNULLORD001', 'ZZNULL000001', CURRENT_DATE - 5, CURRENT_DATE - 3,"
+                " CURRENT_DATE - 3, TRUE, 0),"
+                " ('ZZNULLORD002', 'ZZNULL000001', CURRENT_DATE - 4, CURRENT_DATE - 2,"
+                " CURRENT_DATE, FALSE, 2)", [])
+            for window_days in (0, 30):
+                results["aggregate", window_days] = scores_from_aggregate(backend.execute(
+                    SQL_PERFORMANCE_AGGREGATE, aggregate_params("ZZNULL000001", window_days, 0, 20)
+                )["records"][0])
+                results["buckets", window_days] = scores_from_aggregate(backend.execute(
+                    SQL_PERFORMANCE_BUCKETS, bucket_params("ZZNULL000001", window_days, 20)
+                )["records"][0])
+            history = backend.execute(SQL_SUPPLIER_HISTORY, [make_param("sid", "ZZNULL000001")])["records"]
+            raise _Rollback
+    except _Rollback:
+        pass
+    finally:
+        backend.pool.close()
+
+    expected = compute_scores(history)
+    assert expected["delivery_score"] == 95.0
+    assert expected["quality_score"] == expected["invoice_score"] == 0
+    for key, result in results.items():
+        assert {k: result[k] for k in expected if k != "notes"} == \
+            {k: expected[k] for k in expected if k != "notes"}, key
@@ -0,0 +1,56 @@
+"""
+Keyset cursors of the portfolio risk ranking (common.portfolio).
+"""
+
+import pytest
+
+from common.portfolio import RankingError, build_ranking_sql, rank_suppliers
+
+
+def _query(rows):
+    def query(sql, params=None):
+        if sql.lstrip().startswith("SELECT COUNT"):
+            return [(len(rows),)]
+        return rows[:params["limit"]]
+    return query
+
+
+def _row(sid, score):
+    return (sid, f"Supplier {sid}", "Retail", "US", score, 100, 90, score, score, score, score, 0, False, score)
+
+
+def _first_cursor(**request):
+    body = rank_suppliers(_query([_row("S1", 50.0), _row("S2", 60.0)]), limit=2, **request)
+    assert body["next_cursor"]
+    return body["next_cursor"]
+
+
+def test_cursor_continues_its_own_ranking():
+    cursor = _first_cursor(rank_by="trust_score", industry="Retail")
+    page_sql, _, params, offset = build_ranking_sql("trust_score", None, "Retail", None, cursor, 2)
+    assert offset == 2
+    assert params["after_id"] == "S2"
+    assert params["after_value"] == "60.0"
+    assert ":after_value" in page_sql
+
+    # "ASC" and an empty filter are the same ranking.
+    build_ranking_sql("trust_score", "ASC", "Retail", "", cursor, 2)
+
+
+@pytest.mark.parametrize("request_args", [
+    {"rank_by": "delivery_score", "industry": "Retail"},
+    {"rank_by": "trust_score", "order": "desc", "industry": "Retail"},
+    {"rank_by": "trust_score", "industry": "Automotive"},
+    {"rank_by": "trust_score"},
+    {"rank_by": "trust_score", "industry": "Retail", "country": "US"},
+])
+def test_cursor_rejected_for_another_ranking(request_args):
+    cursor = _first_cursor(rank_by="trust_score", industry="Retail")
+    with pytest.raises(RankingError, match="different ranking"):
+        rank_suppliers(_query([]), cursor=cursor, **request_args)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "WyIxIiwiUzEiLDJd"])
+def test_malformed_or_unscoped_cursor(cursor):
+    with pytest.raises(RankingError):
+        build_ranking_sql(cursor=cursor)
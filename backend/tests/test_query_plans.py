@@ -0,0 +1,60 @@
+"""
+Query plans of the hot statements (jobs.check_query_plans) against the
+Postgres in DB_DSN.
+"""
+
+import os
+
+import pytest
+
+from jobs.check_query_plans import CHECKS, PlanCheck, run_check
+
+DSN = os.getenv("DB_DSN")
+
+
+@pytest.fixture(scope="module")
+def conn():
+    if not DSN:
+        pytest.skip("DB_DSN is not set")
+    psycopg = pytest.importorskip("psycopg")
+    with psycopg.connect(DSN, autocommit=True) as conn:
+        conn.execute("SET enable_seqscan = off")
+        yield conn
+
+
+@pytest.mark.parametrize("check", CHECKS, ids=[c.name for c in CHECKS])
+def test_plan_uses_index(conn, check):
+    assert run_check(conn, check) == []
+
+
+class _PlanConn:
+    """
+    Stands in for a connection; EXPLAIN returns a fixed plan.
+    """
+
+    def __init__(self, plan):
+        self.plan = plan
+
+    def execute(self, sql, params=None):
+        return self
+
+    def fetchone(self):
+        return [[{"Plan": self.plan}]]
+
+
+def test_run_check_reports_seq_scan_and_missing_index():
+    plan = {"Node Type": "Nested Loop", "Plans": [
+        {"Node Type": "Seq Scan", "Relation Name": "supplier_master"},
+        {"Node Type": "Index Scan", "Relation Name": "compliance_certificates",
+         "Index Name": "compliance_certificates_pkey"},
+    ]}
+    check = PlanCheck("t", "SELECT 1", [], ("supplier_master",), ("ix_certs_supplier_type_latest",))
+    assert run_check(_PlanConn(plan), check) == [
+        "Seq Scan on supplier_master", "index ix_certs_supplier_type_latest not used",
+    ]
+
+
+def test_run_check_ignores_seq_scan_on_unchecked_table():
+    plan = {"Node Type": "Seq Scan", "Relation Name": "supplier_scorecard"}
+    check = PlanCheck("t", "SELECT 1", [], ("supplier_master",))
+    assert run_check(_PlanConn(plan), check) == []
@@ -0,0 +1,89 @@
+"""
+LocalCache eviction and the ResponseCache change feed of common.response_cache.
+"""
+
+from common import response_cache
+from common.response_cache import LocalCache, ResponseCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Feed:
+    """
+    query() stand-in: the feed position and the changed rows at or after a
+    position, as (stale_xid, supplier_id, stale_since).
+    """
+
+    def __init__(self):
+        self.position = "10"
+        self.rows = []
+        self.since = []
+
+    def __call__(self, sql, params=None):
+        if sql is response_cache.SQL_FEED_POSITION:
+            return [(self.position,)]
+        assert sql is response_cache.SQL_CHANGED_SUPPLIERS
+        self.since.append(params["since"])
+        return [(sid, since) for xid, sid, since in self.rows if xid >= int(params["since"])]
+
+
+def test_local_set_returns_evicted_keys():
+    local = LocalCache(max_entries=2, ttl_seconds=60, clock=_Clock())
+    assert local.set("a", 1) == []
+    assert local.set("b", 2) == []
+    local.get("a")
+    assert local.set("c", 3) == ["b"]
+    assert local.get("b") is None
+
+
+def test_eviction_prunes_supplier_keys():
+    cache = ResponseCache("t", _Feed(), max_entries=2, enabled=True, clock=_Clock())
+    for sid in ("S1", "S2", "S3"):
+        cache.get_or_compute(sid, "v", lambda: {"sid": sid})
+
+    assert cache._keys == {"S2": {"t:S2:v"}, "S3": {"t:S3:v"}}
+
+
+def test_expired_key_is_pruned():
+    clock = _Clock()
+    cache = ResponseCache("t", _Feed(), ttl_seconds=10, refresh_seconds=1000, enabled=True, clock=clock)
+    cache.get_or_compute("S1", "v", lambda: {"n": 1})
+    clock.now = 11
+
+    body, status = cache.get_or_compute("S1", "v", lambda: None)
+
+    assert (body, status) == (None, "miss")
+    assert "S1" not in cache._keys
+
+
+def test_poll_catches_late_commits():
+    clock = _Clock()
+    feed = _Feed()
+    calls = []
+    cache = ResponseCache("t", feed, refresh_seconds=1, enabled=True, clock=clock)
+    cache.get_or_compute("S1", "v", lambda: {"n": 1})
+    assert cache._watermark == "10"
+    cache.invalidate = calls.append
+
+    # xid 10 is still running; xid 11 has committed a change to S2.
+    feed.rows.append((11, "S2", "2026-01-01 00:00:01"))
+    clock.now = 2
+    cache.get_or_compute("S1", "v", lambda: None)
+    assert calls == [["S2"]]
+    assert cache._watermark == "10"
+
+    # xid 10 commits a change to S1 made before xid 11's; S2 comes back
+    # from the feed again but is not invalidated twice.
+    feed.rows.append((10, "S1", "2026-01-01 00:00:00"))
+    feed.position = "12"
+    clock.now = 4
+    cache.get_or_compute("S1", "v", lambda: None)
+    assert calls == [["S2"], ["S1"]]
+    assert feed.since == ["10", "10"]
+    assert cache._watermark == "12"
@@ -0,0 +1,146 @@
+"""
+Supplier name normalization and resolution (common.suppliers).
+"""
+
+import os
+import re
+import threading
+
+import pytest
+
+from common.suppliers import (
+    LEGAL_SUFFIXES,
+    MAX_NAME_CANDIDATES,
+    SQL_SUPPLIER_BY_NAME,
+    AmbiguousName,
+    Supplier,
+    SupplierResolver,
+    normalize_supplier_name,
+)
+
+SCHEMA_SQL = os.path.join(os.path.dirname(__file__), "..", "..", "db", "schema", "schema.sql")
+
+NAMES = [
+    "Dow Inc.", "DOW, INC", "Dow", "Acme Co., Ltd.", "Siemens AG", "SE", "Nokia Oyj",
+    "Foo S.p.A.", "Bar L.L.C.", "Baz  GmbH & Co. KG", "Incorporated Widgets Inc", "",
+]
+
+
+def _schema_suffixes():
+    sql = open(SCHEMA_SQL, encoding="utf-8").read()
+    body = re.search(r"FUNCTION normalize_supplier_name\(.*?\$\$(.*?)\$\$", sql, re.S).group(1)
+    pattern = "".join(re.findall(r"'([^']*)'", body))
+    return tuple(re.search(r"\( \(([^()]*)\)\)\+\$", pattern).group(1).split("|"))
+
+
+def test_legal_suffixes_match_schema():
+    assert _schema_suffixes() == LEGAL_SUFFIXES
+
+
+@pytest.mark.parametrize("name, norm", [
+    ("Dow Inc.", "dow"), ("DOW, INC", "dow"), ("Acme Co., Ltd.", "acme"),
+    ("Foo S.p.A.", "foo"), ("SE", "se"), (None, ""),
+])
+def test_normalize_supplier_name(name, norm):
+    assert normalize_supplier_name(name) == norm
+
+
+def test_sql_function_matches_python():
+    dsn = os.getenv("DB_DSN")
+    if not dsn:
+        pytest.skip("DB_DSN is not set")
+    psycopg = pytest.importorskip("psycopg")
+    with psycopg.connect(dsn) as conn:
+        for name in NAMES:
+            sql_norm, = conn.execute("SELECT normalize_supplier_name(%s)", (name,)).fetchone()
+            assert sql_norm == normalize_supplier_name(name), name
+
+
+class _Table:
+    """
+    supplier_master stand-in for SupplierResolver's query callable.
+    """
+
+    def __init__(self, rows):
+        self.rows = [Supplier(*r) for r in rows]
+        self.calls = 0
+
+    def __call__(self, sql, params):
+        self.calls += 1
+        if "supplier_id = :sid" in sql:
+            return [tuple(s) for s in self.rows if s.supplier_id == params["sid"]]
+        assert sql == SQL_SUPPLIER_BY_NAME
+        flat = lambda s: re.sub(r"[^0-9a-z]+", " ", s.supplier_name.lower()).strip()
+        rows = [s for s in self.rows if normalize_supplier_name(s.supplier_name) == params["sname_norm"]]
+        rows.sort(key=lambda s: (flat(s) != params["sname_flat"], s.supplier_id))
+        return [tuple(s) for s in rows[:params["max_candidates"]]]
+
+
+def test_name_without_suffix_matching_distinct_companies_is_ambiguous():
+    resolver = SupplierResolver(_Table([("S2", "Acme Ltd", "Retail"), ("S1", "Acme Co", "Retail")]))
+    result = resolver.by_name("ACME")
+    assert isinstance(result, AmbiguousName)
+    assert [c.supplier_id for c in result.candidates] == ["S1", "S2"]
+    assert result.body("ACME") == {
+        "error": "Ambiguous supplier name",
+        "input": "ACME",
+        "candidates": [{"supplier_id": "S1", "supplier_name": "Acme Co"},
+                       {"supplier_id": "S2", "supplier_name": "Acme Ltd"}],
+    }
+
+
+def test_name_with_its_legal_suffix_wins():
+    resolver = SupplierResolver(_Table([("S1", "Acme Co", "Retail"), ("S2", "Acme Ltd", "Retail")]))
+    assert resolver.by_name("acme ltd.").supplier_id == "S2"
+    assert resolver.resolve(supplier_name="Acme, Co").supplier_id == "S1"
+
+
+def test_duplicate_records_of_one_legal_name_are_not_ambiguous():
+    resolver = SupplierResolver(_Table([("S2", "Dow Inc..", "Chemicals"), ("S1", "Dow Inc.", "Chemicals")]))
+    assert resolver.by_name("Dow").supplier_id == "S1"
+
+
+def test_candidates_are_bounded():
+    table = _Table([(f"S{i:02d}", f"Acme {s}", "Retail")
+                    for i, s in enumerate(["Co", "Ltd", "Inc", "Corp", "GmbH", "AG", "SA", "NV",
+                                           "BV", "Oy", "AB", "Pty"])])
+    assert len(SupplierResolver(table).by_name("Acme").candidates) == MAX_NAME_CANDIDATES
+
+
+def test_resolved_names_are_cached_and_counted():
+    table = _Table([("S1", "Acme Co", "Retail"), ("S2", "Acme Ltd", "Retail")])
+    resolver = SupplierResolver(table)
+    assert isinstance(resolver.by_name("Acme"), AmbiguousName)
+    assert isinstance(resolver.by_name("acme"), AmbiguousName)
+    assert resolver.by_name("Acme Co").supplier_id == "S1"
+    assert resolver.by_id("S1").supplier_id == "S1"
+    assert resolver.by_id("S9") is None
+    assert table.calls == 3
+    assert resolver.stats == {"hits": 2, "misses": 3, "size": 3}
+
+
+def test_expired_entries_are_reloaded():
+    now = [0.0]
+    table = _Table([("S1", "Acme Co", "Retail")])
+    resolver = SupplierResolver(table, ttl_seconds=10, clock=lambda: now[0])
+    resolver.by_id("S1")
+    now[0] = 11
+    resolver.by_id("S1")
+    assert table.calls == 2
+
+
+def test_stats_are_exact_under_concurrency():
+    resolver = SupplierResolver(_Table([("S1", "Acme Co", "Retail")]))
+    resolver.by_id("S1")
+
+    def hit():
+        for _ in range(2000):
+            resolver.by_id("S1")
+
+    threads = [threading.Thread(target=hit) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert resolver.stats["hits"] == 8 * 2000
+    assert resolver.stats["misses"] == 1
@@ -0,0 +1,30 @@
+"""
+Trust Score weighting and risk classification (common.trust_score).
+"""
+
+import pytest
+
+from common import trust_score as ts
+
+
+def test_weighted_trust_score():
+    assert ts.weighted_contributions(100, 80, 50) == {
+        "data_integrity": 30.0, "certification": 24.0, "operational": 20.0,
+    }
+    assert ts.trust_score(100, 80, 50) == 74.0
+    assert ts.trust_score(None, 100, None) == 30.0
+
+
+@pytest.mark.parametrize("score, level", [
+    (100, "Low"), (80, "Low"), (79.99, "Medium"), (60, "Medium"), (59.99, "High"), (None, "High"),
+])
+def test_default_risk_levels(score, level):
+    assert ts.risk_level(score) == level
+
+
+def test_risk_thresholds_are_configurable(monkeypatch):
+    monkeypatch.setattr(ts, "RISK_LOW_MIN", 90.0)
+    monkeypatch.setattr(ts, "RISK_MEDIUM_MIN", 70.0)
+    assert ts.risk_level(85) == "Medium"
+    assert ts.risk_level(65) == "High"
+    assert ts.risk_level(90) == "Low"
@@ -2,6 +2,19 @@
 -- 1. SUPPLIER MASTER
 -- =========================================================
 
+-- Supplier name in lookup form: lowercase, punctuation and whitespace runs
+-- collapsed to single spaces, trailing legal suffixes ("Inc.", "Co., Ltd.",
+-- "SE", "S.A.") removed. Must stay in step with
+-- common.suppliers.normalize_supplier_name, which normalizes request input.
+CREATE OR REPLACE FUNCTION normalize_supplier_name(name TEXT) RETURNS TEXT AS $$
+  SELECT regexp_replace(
+    btrim(regexp_replace(lower(name), '[^0-9a-z]+', ' ', 'g')),
+    '( (inc|incorporated|corp|corporation|co|company|ltd|limited|llc|l l c|llp|lp|plc|p l c'
+    '|gmbh|ag|kg|kgaa|se|sa|s a|nv|n v|bv|b v|spa|s p a|srl|s r l|oy|oyj|ab|asa|pte|pty|kk|bhd))+$',
+    ''
+  );
+$$ LANGUAGE SQL IMMUTABLE STRICT;
+
 CREATE TABLE supplier_master (
   supplier_id         VARCHAR(12) PRIMARY KEY,
   supplier_name       VARCHAR(100) NOT NULL,
@@ -10,9 +23,29 @@ CREATE TABLE supplier_master (
   industry            VARCHAR(60)  NOT NULL,
   annual_revenue      BIGINT       NOT NULL,
   employees           INT          NOT NULL,
-  onboarding_date     DATE         NOT NULL
+  onboarding_date     DATE         NOT NULL,
+  updated_at          TIMESTAMP    NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  supplier_name_norm  VARCHAR(100) GENERATED ALWAYS AS (normalize_supplier_name(supplier_name)) STORED
 );
 
+-- updated_at lets warm deduplication Lambdas refresh their cached name
+-- index incrementally instead of re-reading the whole table.
+CREATE INDEX ix_supplier_master_updated_at ON supplier_master (updated_at);
+
+-- Supplier lookups by name (common.suppliers.SQL_SUPPLIER_BY_NAME).
+CREATE INDEX ix_supplier_master_name_norm ON supplier_master (supplier_name_norm);
+
+CREATE OR REPLACE FUNCTION touch_updated_at() RETURNS TRIGGER AS $$
+BEGIN
+  NEW.updated_at := CURRENT_TIMESTAMP;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_supplier_master_touch
+  BEFORE UPDATE ON supplier_master
+  FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+
 
 -- =========================================================
 -- 2. REQUIRED CERTIFICATES MASTER
@@ -46,6 +79,35 @@ CREATE TABLE compliance_certificates (
     FOREIGN KEY (supplier_id) REFERENCES supplier_master(supplier_id)
 );
 
+-- Latest certificate per (supplier, type). Matches the ordering used by
+-- SQL_LATEST_CERTS, the combined compliance query and the bulk scoring job
+-- (COALESCE(expiry_date, DATE '9999-12-31') DESC, issue_date DESC), so those
+-- read rows presorted from the index instead of sorting them. Also serves
+-- the supplier_id foreign key.
+CREATE INDEX ix_certs_supplier_type_latest ON compliance_certificates (
+  supplier_id,
+  certificate_type,
+  (COALESCE(expiry_date, DATE '9999-12-31')) DESC,
+  issue_date DESC
+);
+
+-- Range scans for certificates expiring in the next N days.
+CREATE INDEX ix_certs_expiry ON compliance_certificates (expiry_date)
+  WHERE expiry_date IS NOT NULL;
+
+-- Status of a certificate at the end of day p_as_of, from its dates rather
+-- than the stored valid_status, which is only correct on the day it was
+-- written: past its expiry_date it is Expired, before that a stored
+-- 'Expired' was still Valid. Other statuses (Pending, ...) are kept.
+CREATE OR REPLACE FUNCTION certificate_status_as_of(
+  p_valid_status VARCHAR, p_expiry_date DATE, p_as_of DATE
+) RETURNS VARCHAR AS $$
+  SELECT CASE WHEN p_expiry_date < p_as_of THEN 'Expired'
+              WHEN p_valid_status = 'Expired' THEN 'Valid'
+              ELSE p_valid_status
+         END;
+$$ LANGUAGE sql IMMUTABLE;
+
 
 -- =========================================================
 -- 4. SUPPLIER PERFORMANCE HISTORY
@@ -66,3 +128,357 @@ CREATE TABLE supplier_performance_history (
   CONSTRAINT fk_supplier_perf
     FOREIGN KEY (supplier_id) REFERENCES supplier_master(supplier_id)
 );
+
+-- Per-supplier history, newest first: the performance Lambda's window
+-- filter and notes ordering, and the supplier_id foreign key.
+CREATE INDEX ix_perf_supplier_date ON supplier_performance_history (
+  supplier_id, order_date DESC, order_id DESC
+);
+
+
+-- =========================================================
+-- 5. SUPPLIER DUPLICATE CLUSTERS
+-- =========================================================
+-- Written by backend/jobs/dedup_clusters.py. One row per supplier that has
+-- at least one near-duplicate; cluster_id is the smallest supplier_id in
+-- the cluster.
+
+CREATE TABLE supplier_duplicate_clusters (
+  supplier_id       VARCHAR(12)  PRIMARY KEY,
+  cluster_id        VARCHAR(12)  NOT NULL,
+  supplier_name     VARCHAR(100) NOT NULL,
+  best_match_id     VARCHAR(12)  NOT NULL,
+  similarity_score  INT          NOT NULL,
+  generated_at      TIMESTAMP    NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  CONSTRAINT fk_dup_cluster_supplier
+    FOREIGN KEY (supplier_id) REFERENCES supplier_master(supplier_id)
+);
+
+CREATE INDEX ix_dup_clusters_cluster ON supplier_duplicate_clusters (cluster_id);
+
+
+-- =========================================================
+-- 6. SUPPLIER COMPLIANCE SCORES
+-- =========================================================
+-- Nightly output of backend/jobs/compliance_scores.py, same weighting as
+-- the compliance Lambda.
+
+CREATE TABLE supplier_compliance_scores (
+  supplier_id       VARCHAR(12) PRIMARY KEY,
+  industry          VARCHAR(60) NOT NULL,
+  compliance_score  INT         NOT NULL,
+  required_count    INT         NOT NULL,
+  valid_count       INT         NOT NULL,
+  pending_count     INT         NOT NULL,
+  expired_count     INT         NOT NULL,
+  missing_count     INT         NOT NULL,
+  scored_at         TIMESTAMP   NOT NULL,
+  CONSTRAINT fk_compliance_score_supplier
+    FOREIGN KEY (supplier_id) REFERENCES supplier_master(supplier_id)
+);
+
+
+-- =========================================================
+-- 7. SUPPLIER SCORECARD
+-- =========================================================
+-- One precomputed row per supplier, read by the Lambdas' fast paths.
+-- The triggers below only flag rows as stale when source rows change;
+-- backend/jobs/refresh_scorecards.py recomputes stale rows with the same
+-- scoring code the Lambdas use. compliance_detail / performance_detail hold
+-- the Lambdas' response bodies.
+
+CREATE TABLE supplier_scorecard (
+  supplier_id           VARCHAR(12)  PRIMARY KEY,
+  supplier_name         VARCHAR(100),
+  industry              VARCHAR(60),
+  compliance_score      INT,
+  compliance_detail     JSONB,
+  delivery_score        NUMERIC(6,2),
+  quality_score         NUMERIC(6,2),
+  invoice_score         NUMERIC(6,2),
+  performance_score     NUMERIC(6,2),
+  performance_detail    JSONB,
+  duplicate_cluster_id  VARCHAR(12),
+  duplicate_count       INT          NOT NULL DEFAULT 0,
+  data_integrity_score  INT,
+  trust_score           NUMERIC(6,2),
+  stale                 BOOLEAN      NOT NULL DEFAULT TRUE,
+  stale_since           TIMESTAMP    NOT NULL DEFAULT clock_timestamp(),
+  stale_xid             XID8         NOT NULL DEFAULT pg_current_xact_id(),
+  refreshed_at          TIMESTAMP,
+  CONSTRAINT fk_scorecard_supplier
+    FOREIGN KEY (supplier_id) REFERENCES supplier_master(supplier_id) ON DELETE CASCADE
+);
+
+CREATE INDEX ix_scorecard_stale ON supplier_scorecard (supplier_id) WHERE stale;
+
+-- Change feed for the Lambda response caches (common/response_cache.py):
+-- every write of stale_since also records its transaction in stale_xid, and
+-- the caches read the suppliers changed by transactions that were not yet
+-- committed at their previous poll. Unlike a timestamp watermark this does
+-- not miss long transactions (bulk loads) that commit late.
+CREATE INDEX ix_scorecard_stale_xid ON supplier_scorecard (stale_xid);
+
+-- Portfolio risk ranking (common/portfolio.py): lowest trust scores first,
+-- across all suppliers or within one industry, read straight off the index.
+CREATE INDEX ix_scorecard_trust ON supplier_scorecard (trust_score, supplier_id);
+CREATE INDEX ix_scorecard_industry_trust ON supplier_scorecard (industry, trust_score, supplier_id);
+
+CREATE OR REPLACE FUNCTION mark_scorecard_stale(p_supplier_id VARCHAR) RETURNS VOID AS $$
+BEGIN
+  INSERT INTO supplier_scorecard (supplier_id, stale, stale_since, stale_xid)
+  VALUES (p_supplier_id, TRUE, clock_timestamp(), pg_current_xact_id())
+  ON CONFLICT (supplier_id) DO UPDATE
+    SET stale = TRUE, stale_since = EXCLUDED.stale_since, stale_xid = EXCLUDED.stale_xid;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION scorecard_source_changed() RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM mark_scorecard_stale(OLD.supplier_id);
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM mark_scorecard_stale(NEW.supplier_id);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION scorecard_requirements_changed() RETURNS TRIGGER AS $$
+BEGIN
+  UPDATE supplier_scorecard sc
+     SET stale = TRUE, stale_since = clock_timestamp(), stale_xid = pg_current_xact_id()
+    FROM supplier_master sm
+   WHERE sm.supplier_id = sc.supplier_id
+     AND sm.industry IN (
+       CASE WHEN TG_OP <> 'INSERT' THEN OLD.industry END,
+       CASE WHEN TG_OP <> 'DELETE' THEN NEW.industry END
+     );
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_scorecard_supplier
+  AFTER INSERT OR UPDATE OF supplier_name, industry ON supplier_master
+  FOR EACH ROW EXECUTE FUNCTION scorecard_source_changed();
+
+CREATE TRIGGER trg_scorecard_certificates
+  AFTER INSERT OR UPDATE OR DELETE ON compliance_certificates
+  FOR EACH ROW EXECUTE FUNCTION scorecard_source_changed();
+
+CREATE TRIGGER trg_scorecard_performance
+  AFTER INSERT OR UPDATE OR DELETE ON supplier_performance_history
+  FOR EACH ROW EXECUTE FUNCTION scorecard_source_changed();
+
+CREATE TRIGGER trg_scorecard_requirements
+  AFTER INSERT OR UPDATE OR DELETE ON required_certificates_master
+  FOR EACH ROW EXECUTE FUNCTION scorecard_requirements_changed();
+
+CREATE TRIGGER trg_scorecard_duplicates
+  AFTER INSERT OR UPDATE OR DELETE ON supplier_duplicate_clusters
+  FOR EACH ROW EXECUTE FUNCTION scorecard_source_changed();
+
+
+-- =========================================================
+-- 8. SUPPLIER PERFORMANCE RUNNING AGGREGATES
+-- =========================================================
+-- Running sums per supplier, kept up to date by a trigger on
+-- supplier_performance_history:
+--   supplier_performance_totals   all-time, one row per supplier
+--   supplier_performance_monthly  one row per supplier and month
+--   supplier_performance_daily    one row per supplier and day
+-- delivery_sum adds up the per-order delivery score used by the performance
+-- Lambda (100 if on time, else 100 - 5 per day late, floored at 0).
+-- Quality and invoice keep their own counts because those columns are
+-- nullable and AVG() skips NULLs. A rolling window is answered from daily
+-- buckets for the partial first month plus monthly buckets for the rest.
+
+CREATE TABLE supplier_performance_totals (
+  supplier_id     VARCHAR(12)   PRIMARY KEY,
+  order_count     INT           NOT NULL DEFAULT 0,
+  delivery_sum    NUMERIC(14,2) NOT NULL DEFAULT 0,
+  quality_sum     NUMERIC(14,2) NOT NULL DEFAULT 0,
+  quality_count   INT           NOT NULL DEFAULT 0,
+  invoice_sum     NUMERIC(14,2) NOT NULL DEFAULT 0,
+  invoice_count   INT           NOT NULL DEFAULT 0,
+  incidents_sum   BIGINT        NOT NULL DEFAULT 0
+);
+
+CREATE TABLE supplier_performance_monthly (
+  supplier_id     VARCHAR(12)   NOT NULL,
+  bucket_month    DATE          NOT NULL,
+  order_count     INT           NOT NULL DEFAULT 0,
+  delivery_sum    NUMERIC(14,2) NOT NULL DEFAULT 0,
+  quality_sum     NUMERIC(14,2) NOT NULL DEFAULT 0,
+  quality_count   INT           NOT NULL DEFAULT 0,
+  invoice_sum     NUMERIC(14,2) NOT NULL DEFAULT 0,
+  invoice_count   INT           NOT NULL DEFAULT 0,
+  incidents_sum   BIGINT        NOT NULL DEFAULT 0,
+  PRIMARY KEY (supplier_id, bucket_month)
+);
+
+CREATE TABLE supplier_performance_daily (
+  supplier_id     VARCHAR(12)   NOT NULL,
+  bucket_date     DATE          NOT NULL,
+  order_count     INT           NOT NULL DEFAULT 0,
+  delivery_sum    NUMERIC(14,2) NOT NULL DEFAULT 0,
+  quality_sum     NUMERIC(14,2) NOT NULL DEFAULT 0,
+  quality_count   INT           NOT NULL DEFAULT 0,
+  invoice_sum     NUMERIC(14,2) NOT NULL DEFAULT 0,
+  invoice_count   INT           NOT NULL DEFAULT 0,
+  incidents_sum   BIGINT        NOT NULL DEFAULT 0,
+  PRIMARY KEY (supplier_id, bucket_date)
+);
+
+CREATE OR REPLACE FUNCTION perf_delivery_score(p_on_time BOOLEAN, p_delay INT) RETURNS INT AS $$
+  SELECT CASE WHEN p_on_time THEN 100
+              ELSE GREATEST(0, 100 - LEAST(COALESCE(p_delay, 0) * 5, 100))
+         END;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Add (p_sign = 1) or remove (p_sign = -1) one order from its buckets.
+CREATE OR REPLACE FUNCTION perf_buckets_apply(r supplier_performance_history, p_sign INT) RETURNS VOID AS $$
+DECLARE
+  d  NUMERIC := p_sign * perf_delivery_score(r.on_time, r.delivery_delay_days);
+  q  NUMERIC := p_sign * COALESCE(r.quality_compliance_pct, 0);
+  qc INT     := p_sign * (r.quality_compliance_pct IS NOT NULL)::INT;
+  v  NUMERIC := p_sign * COALESCE(r.invoice_match_pct, 0);
+  vc INT     := p_sign * (r.invoice_match_pct IS NOT NULL)::INT;
+  i  BIGINT  := p_sign * COALESCE(r.incidents, 0);
+BEGIN
+  INSERT INTO supplier_performance_totals AS t
+    (supplier_id, order_count, delivery_sum, quality_sum, quality_count, invoice_sum, invoice_count, incidents_sum)
+  VALUES (r.supplier_id, p_sign, d, q, qc, v, vc, i)
+  ON CONFLICT (supplier_id) DO UPDATE SET
+    order_count = t.order_count + p_sign, delivery_sum = t.delivery_sum + d,
+    quality_sum = t.quality_sum + q, quality_count = t.quality_count + qc,
+    invoice_sum = t.invoice_sum + v, invoice_count = t.invoice_count + vc,
+    incidents_sum = t.incidents_sum + i;
+
+  INSERT INTO supplier_performance_monthly AS t
+    (supplier_id, bucket_month, order_count, delivery_sum, quality_sum, quality_count, invoice_sum, invoice_count, incidents_sum)
+  VALUES (r.supplier_id, date_trunc('month', r.order_date)::DATE, p_sign, d, q, qc, v, vc, i)
+  ON CONFLICT (supplier_id, bucket_month) DO UPDATE SET
+    order_count = t.order_count + p_sign, delivery_sum = t.delivery_sum + d,
+    quality_sum = t.quality_sum + q, quality_count = t.quality_count + qc,
+    invoice_sum = t.invoice_sum + v, invoice_count = t.invoice_count + vc,
+    incidents_sum = t.incidents_sum + i;
+
+  INSERT INTO supplier_performance_daily AS t
+    (supplier_id, bucket_date, order_count, delivery_sum, quality_sum, quality_count, invoice_sum, invoice_count, incidents_sum)
+  VALUES (r.supplier_id, r.order_date, p_sign, d, q, qc, v, vc, i)
+  ON CONFLICT (supplier_id, bucket_date) DO UPDATE SET
+    order_count = t.order_count + p_sign, delivery_sum = t.delivery_sum + d,
+    quality_sum = t.quality_sum + q, quality_count = t.quality_count + qc,
+    invoice_sum = t.invoice_sum + v, invoice_count = t.invoice_count + vc,
+    incidents_sum = t.incidents_sum + i;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION perf_buckets_changed() RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM perf_buckets_apply(OLD, -1);
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM perf_buckets_apply(NEW, 1);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_perf_buckets
+  AFTER INSERT OR UPDATE OR DELETE ON supplier_performance_history
+  FOR EACH ROW EXECUTE FUNCTION perf_buckets_changed();
+
+-- Recompute every bucket from raw rows (backfill / repair).
+CREATE OR REPLACE FUNCTION rebuild_performance_buckets() RETURNS VOID AS $$
+BEGIN
+  DELETE FROM supplier_performance_totals;
+  DELETE FROM supplier_performance_monthly;
+  DELETE FROM supplier_performance_daily;
+
+  INSERT INTO supplier_performance_daily
+  SELECT supplier_id, order_date, COUNT(*),
+         SUM(perf_delivery_score(on_time, delivery_delay_days)),
+         COALESCE(SUM(quality_compliance_pct), 0), COUNT(quality_compliance_pct),
+         COALESCE(SUM(invoice_match_pct), 0), COUNT(invoice_match_pct),
+         COALESCE(SUM(incidents), 0)
+  FROM supplier_performance_history
+  GROUP BY supplier_id, order_date;
+
+  INSERT INTO supplier_performance_monthly
+  SELECT supplier_id, date_trunc('month', bucket_date)::DATE,
+         SUM(order_count), SUM(delivery_sum), SUM(quality_sum), SUM(quality_count),
+         SUM(invoice_sum), SUM(invoice_count), SUM(incidents_sum)
+  FROM supplier_performance_daily
+  GROUP BY supplier_id, date_trunc('month', bucket_date);
+
+  INSERT INTO supplier_performance_totals
+  SELECT supplier_id,
+         SUM(order_count), SUM(delivery_sum), SUM(quality_sum), SUM(quality_count),
+         SUM(invoice_sum), SUM(invoice_count), SUM(incidents_sum)
+  FROM supplier_performance_monthly
+  GROUP BY supplier_id;
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- =========================================================
+-- 9. SUPPLIER SCORE SNAPSHOTS
+-- =========================================================
+-- Append-only history of per-supplier scores, one row per supplier and
+-- snapshot date, written by backend/jobs/score_snapshots.py (daily, and
+-- --backfill for past month ends). A snapshot holds the scores as of the
+-- end of snapshot_date:
+--   compliance   latest certificate per type issued by that day, status
+--                from certificate_status_as_of()
+--   performance  supplier_performance_* buckets up to that day (same window
+--                as the performance Lambda)
+--   trust        common.trust_score weighting, data integrity from the
+--                current supplier_duplicate_clusters (as in supplier_scorecard)
+-- Range partitioned by year of snapshot_date; score_snapshot_partition()
+-- creates a year's partition and the job calls it before writing. Old years
+-- are removed by dropping their partition. Rows are never updated: a job
+-- run for a date that already has a row keeps the existing row.
+
+CREATE TABLE supplier_score_snapshots (
+  supplier_id        VARCHAR(12)  NOT NULL,
+  snapshot_date      DATE         NOT NULL,
+  industry           VARCHAR(60)  NOT NULL,
+  compliance_score   INT          NOT NULL,
+  order_count        INT          NOT NULL,
+  delivery_score     NUMERIC(6,2) NOT NULL,
+  quality_score      NUMERIC(6,2) NOT NULL,
+  invoice_score      NUMERIC(6,2) NOT NULL,
+  performance_score  NUMERIC(6,2) NOT NULL,
+  trust_score        NUMERIC(6,2) NOT NULL,
+  source             VARCHAR(10)  NOT NULL,  -- 'daily' or 'backfill'
+  created_at         TIMESTAMP    NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (supplier_id, snapshot_date),
+  CONSTRAINT fk_snapshot_supplier
+    FOREIGN KEY (supplier_id) REFERENCES supplier_master(supplier_id)
+) PARTITION BY RANGE (snapshot_date);
+
+-- Partition supplier_score_snapshots_<year>, if it does not exist yet.
+CREATE OR REPLACE FUNCTION score_snapshot_partition(p_year INT) RETURNS VOID AS $$
+BEGIN
+  EXECUTE format(
+    'CREATE TABLE IF NOT EXISTS %I PARTITION OF supplier_score_snapshots '
+    'FOR VALUES FROM (%L) TO (%L)',
+    'supplier_score_snapshots_' || p_year,
+    make_date(p_year, 1, 1), make_date(p_year + 1, 1, 1)
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION score_snapshots_append_only() RETURNS TRIGGER AS $$
+BEGIN
+  RAISE EXCEPTION 'supplier_score_snapshots is append-only';
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_score_snapshots_append_only
+  BEFORE UPDATE ON supplier_score_snapshots
+  FOR EACH ROW EXECUTE FUNCTION score_snapshots_append_only();
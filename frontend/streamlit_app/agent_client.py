@@ -0,0 +1,248 @@
+"""
+Async Bedrock Agent client for the Streamlit UI.
+
+    client = AgentClient(boto3.client("bedrock-agent-runtime"), AGENT_ID, AGENT_ALIAS_ID)
+    reports = asyncio.run(client.run_reports(["General Motors", "DuPont de Nemours"], on_chunk))
+
+- Every report gets its own session id, so concurrent reports do not share
+  (and serialize on) one agent session.
+- At most `max_concurrency` reports run at once; each blocking
+  invoke_agent call and its event stream run in a worker thread and hand
+  `chunk` events to the event loop as they arrive, so on_chunk can render
+  partial text while the agent is still answering.
+- Calls are paced by a token bucket (`rate_per_sec`, `burst`) instead of
+  waiting for throttling errors. A throttling error that still comes back
+  before any text was received empties the bucket and is retried up to
+  `retries` times.
+
+- With `with_report` (default), traces are enabled and the `report` text
+  of the trust_score action group's result (rendered by the backend's
+  common.report) is streamed ahead of the agent's answer. The session
+  attribute report_display=trace tells the agent so, and it then only
+  writes the narrative sections; without it the agent's answer contains
+  the whole report.
+
+`client` is anything with a boto3-style invoke_agent(**kwargs) returning
+{"completion": iterable of events}; fake_agent.FakeAgentRuntime is a local
+stand-in.
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+THROTTLE_MARKERS = ("Throttling", "Too Many Requests", "Rate exceeded")
+
+_DONE = object()
+
+
+def report_prompt(supplier: str, report_type: str = "full") -> str:
+    return (
+        f"Run Supplier360 risk analysis for supplier '{supplier}'. "
+        f"Report type = '{report_type}'. "
+        f"Return the complete formatted supplier risk report."
+    )
+
+
+def new_session_id(prefix: str = "supplier360") -> str:
+    return f"{prefix}-{uuid.uuid4().hex[:12]}"
+
+
+def trace_report(trace: Dict[str, Any]) -> Optional[str]:
+    """
+    The rendered `report` of an action-group result in an invoke_agent
+    trace event, or None.
+    """
+    observation = (trace.get("trace") or {}).get("orchestrationTrace", {}).get("observation", {})
+    text = observation.get("actionGroupInvocationOutput", {}).get("text")
+    if not text:
+        return None
+    try:
+        body = json.loads(text)
+    except ValueError:
+        return None
+    report = body.get("report") if isinstance(body, dict) else None
+    return report if isinstance(report, str) else None
+
+
+def is_throttle(exc: BaseException) -> bool:
+    code = (getattr(exc, "response", None) or {}).get("Error", {}).get("Code", "")
+    text = f"{code} {exc}"
+    return "throttl" in code.lower() or any(m in text for m in THROTTLE_MARKERS)
+
+
+class TokenBucket:
+    """
+    `rate` requests per second with bursts of up to `capacity`. Used from a
+    single event loop: the check and the decrement in acquire() run without
+    an await in between.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = float(capacity)
+        self.updated = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> float:
+        """
+        Take one token, sleeping until one is available. Returns the
+        seconds waited.
+        """
+        waited = 0.0
+        while True:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return waited
+            delay = (1 - self.tokens) / self.rate
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def drain(self) -> None:
+        """
+        Drop the stored burst after a throttling error.
+        """
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+
+
+class Report(NamedTuple):
+    supplier: str
+    text: str
+    error: Optional[str]
+    seconds: float
+
+
+class AgentClient:
+
+    def __init__(
+        self,
+        client: Any,
+        agent_id: str,
+        agent_alias_id: str,
+        max_concurrency: int = 4,
+        rate_per_sec: float = 1.0,
+        burst: int = 4,
+        retries: int = 5,
+        with_report: bool = True,
+    ):
+        self.client = client
+        self.agent_id = agent_id
+        self.agent_alias_id = agent_alias_id
+        self.max_concurrency = max_concurrency
+        self.bucket = TokenBucket(rate_per_sec, burst)
+        self.retries = retries
+        self.with_report = with_report
+        # Updated from the event loop only.
+        self.stats = {"calls": 0, "throttled": 0, "wait_seconds": 0.0}
+
+    def _session_state(self) -> Dict[str, Any]:
+        if not self.with_report:
+            return {}
+        return {"sessionState": {"sessionAttributes": {"report_display": "trace"}}}
+
+    def _count(self, key: str, value: float = 1) -> None:
+        self.stats[key] += value
+
+    async def _chunks(self, message: str, session_id: str):
+        """
+        Text of the `chunk` events of one invoke_agent call, as they arrive.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def pump():
+            try:
+                resp = self.client.invoke_agent(
+                    agentId=self.agent_id,
+                    agentAliasId=self.agent_alias_id,
+                    sessionId=session_id,
+                    inputText=message,
+                    enableTrace=self.with_report,
+                    **self._session_state(),
+                )
+                reported = False
+                for event in resp["completion"]:
+                    if "chunk" in event:
+                        text = event["chunk"]["bytes"].decode("utf-8", errors="ignore")
+                        loop.call_soon_threadsafe(queue.put_nowait, text)
+                    elif "trace" in event and not reported:
+                        report = trace_report(event["trace"])
+                        if report:
+                            reported = True
+                            loop.call_soon_threadsafe(queue.put_nowait, report + "\n\n")
+                loop.call_soon_threadsafe(queue.put_nowait, _DONE)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+
+        worker = loop.run_in_executor(None, pump)
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+        await worker
+
+    async def ask(self, message: str, session_id: Optional[str] = None,
+                  on_chunk: Optional[Callable[[str], None]] = None) -> str:
+        """
+        The agent's full reply; on_chunk(text) is called for every chunk.
+        """
+        session_id = session_id or new_session_id()
+        attempt = 1
+        while True:
+            self._count("wait_seconds", await self.bucket.acquire())
+            self._count("calls")
+            parts: List[str] = []
+            try:
+                async for text in self._chunks(message, session_id):
+                    parts.append(text)
+                    if on_chunk:
+                        on_chunk(text)
+                return "".join(parts).strip()
+            except Exception as e:
+                # Text already shown cannot be taken back, so only retry
+                # before the first chunk.
+                if parts or not is_throttle(e) or attempt >= self.retries:
+                    raise
+                self._count("throttled")
+                self.bucket.drain()
+                attempt += 1
+
+    async def run_reports(
+        self,
+        suppliers: Iterable[str],
+        on_chunk: Optional[Callable[[str, str], None]] = None,
+        report_type: str = "full",
+        session_prefix: str = "supplier360",
+    ) -> List[Report]:
+        """
+        One report per supplier, in input order, each in a new session.
+        on_chunk(supplier, text) streams partial text; failures are returned
+        as Report.error.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def one(supplier: str) -> Report:
+            async with semaphore:
+                start = time.perf_counter()
+                callback = (lambda text: on_chunk(supplier, text)) if on_chunk else None
+                try:
+                    text = await self.ask(report_prompt(supplier, report_type),
+                                          new_session_id(session_prefix), callback)
+                except Exception as e:
+                    return Report(supplier, "", str(e), time.perf_counter() - start)
+                return Report(supplier, text.replace("<REDACTED>", ""), None, time.perf_counter() - start)
+
+        return list(await asyncio.gather(*(one(s) for s in suppliers)))
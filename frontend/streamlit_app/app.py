@@ -1,48 +1,62 @@
+import asyncio
+import os
+import time
+
 import streamlit as st
-import boto3, botocore, time, random
+
+from agent_client import AgentClient
 
 # ====== CONFIGURATION ======
 REGION = "us-east-1"
 AGENT_ID = "XZTBPTDN4C"              
 AGENT_ALIAS_ID = "ROHEX5JVZ3"   
+# Reports run at once, and InvokeAgent calls per second (burst) across them
+MAX_CONCURRENCY = int(os.getenv("AGENT_MAX_CONCURRENCY", "4"))
+RATE_PER_SEC = float(os.getenv("AGENT_RATE_PER_SEC", "1"))
+BURST = int(os.getenv("AGENT_BURST", "4"))
+# true = answer from the local fake_agent stand-in instead of Bedrock
+AGENT_FAKE = os.getenv("AGENT_FAKE", "false").lower() == "true"
 # =============================
 
-client = boto3.client("bedrock-agent-runtime", region_name=REGION)
-
-# ---------- BACKOFF ----------
-def _backoff(attempt, base=0.6, factor=2.0, max_delay=10):
-    return min(max_delay, base * (factor ** (attempt - 1))) * (0.5 + random.random()/2)
+@st.cache_resource
+def get_client():
+    if AGENT_FAKE:
+        from fake_agent import FakeAgentRuntime
+        runtime = FakeAgentRuntime()
+    else:
+        import boto3
+        runtime = boto3.client("bedrock-agent-runtime", region_name=REGION)
+    return AgentClient(runtime, AGENT_ID, AGENT_ALIAS_ID, max_concurrency=MAX_CONCURRENCY,
+                       rate_per_sec=RATE_PER_SEC, burst=BURST)
 
 # ---------- CALL AGENT ----------
-def ask_agent(message, session_id="supplier360-session", retries=5):
-    attempt = 1
-
-    while True:
-        try:
-            resp = client.invoke_agent(
-                agentId=AGENT_ID,
-                agentAliasId=AGENT_ALIAS_ID,
-                sessionId=session_id,
-                inputText=message,
-                enableTrace=False,
-            )
-
-            text_parts = []
-            stream = resp["completion"]
-
-            for event in stream:
-                if "chunk" in event:
-                    text_parts.append(event["chunk"]["bytes"].decode("utf-8", errors="ignore"))
-
-            return "".join(text_parts).strip()
-
-        except botocore.exceptions.ClientError as e:
-            msg = str(e)
-            if any(x in msg for x in ["Throttling", "Too Many Requests", "Rate exceeded"]) and attempt < retries:
-                time.sleep(_backoff(attempt))
-                attempt += 1
-                continue
-            raise
+def run_reports(suppliers):
+    """
+    Run one report per supplier concurrently, each streamed into its own
+    chat message as chunks arrive. Returns the final replies.
+    """
+    suppliers = list(dict.fromkeys(suppliers))
+    placeholders, partial = {}, {}
+    for name in suppliers:
+        with st.chat_message(" ", avatar=None):
+            placeholders[name] = st.empty()
+            placeholders[name].markdown(f"_Generating Supplier360 report for {name}…_")
+        partial[name] = ""
+
+    def on_chunk(name, text):
+        partial[name] += text
+        placeholders[name].markdown(partial[name].replace("<REDACTED>", "") + " ▌")
+
+    reports = asyncio.run(get_client().run_reports(
+        suppliers, on_chunk, session_prefix=st.session_state.session_id
+    ))
+
+    replies = []
+    for report in reports:
+        reply = f"⚠️ Error: {report.error}" if report.error else report.text
+        placeholders[report.supplier].write(reply)
+        replies.append(reply)
+    return replies
 
 # ---------- STREAMLIT UI ----------
 st.set_page_config(
@@ -85,22 +99,7 @@ if supplier:
     with st.chat_message("user"):
         st.write(supplier)
 
-    # Build prompt for Supplier360 agent
-    message = (
-        f"Run Supplier360 risk analysis for supplier '{supplier}'. "
-        f"Report type = 'full'. "
-        f"Return the complete formatted supplier risk report."
-    )
-
-    with st.chat_message(" ", avatar=None):
-        with st.spinner(f" Generating Supplier360 report for {supplier}…"):
-            try:
-                reply = ask_agent(message, st.session_state.session_id)
-            except Exception as e:
-                reply = f"⚠️ Error: {e}"
-            reply = reply.replace("<REDACTED>", "")
-            st.write(reply)
-
+    reply, = run_reports([supplier])
     st.session_state.history.append(("assistant", reply))
 
 # Quick demo buttons
@@ -109,18 +108,11 @@ st.write("Quick suppliers:")
 cols = st.columns(4, gap="medium")
 examples = ["General Motors", "Toyota Motor Corporation", "Samsung Electronics", "DuPont de Nemours"]
 
-for i, name in enumerate(examples):
-    if cols[i].button(name, use_container_width=True):
+clicked = [name for i, name in enumerate(examples) if cols[i].button(name, use_container_width=True)]
+if st.button("Run all quick suppliers", use_container_width=True):
+    clicked = examples
+
+if clicked:
+    for name, reply in zip(clicked, run_reports(clicked)):
         st.session_state.history.append(("user", name))
-        with st.chat_message(" ", avatar=None):
-            with st.spinner(f" Fetching Supplier360 report for {name}…"):
-                try:
-                    reply = ask_agent(
-                        f"Run Supplier360 risk analysis for supplier '{name}'. Report type = 'full'. Return the formatted report.",
-                        st.session_state.session_id
-                    )
-                except Exception as e:
-                    reply = f"⚠️ Error: {e}"
-            reply = reply.replace("<REDACTED>", "")
-            st.write(reply)
         st.session_state.history.append(("assistant", reply))
@@ -0,0 +1,129 @@
+"""
+Local stand-in for the boto3 "bedrock-agent-runtime" client.
+
+FakeAgentRuntime.invoke_agent returns a {"completion": ...} event stream
+that yields a canned report in `chunks` pieces, after `first_chunk_seconds`
+and then every `chunk_seconds`, and rejects calls beyond
+`max_calls_per_second` with a throttlingException like the service quota.
+With enableTrace the report's data sections arrive in a trace event, as
+the trust_score action group's `report`; with the session attribute
+report_display=trace only the narrative is streamed as chunks, otherwise
+the whole report is.
+Set AGENT_FAKE=true to run the Streamlit app against it, or compare
+sequential and concurrent report runs from the command line:
+
+    python fake_agent.py --suppliers 8 --concurrency 4 --rate 2
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterator, Optional
+
+from agent_client import AgentClient
+
+
+class FakeThrottlingException(Exception):
+    def __init__(self, message: str = "Rate exceeded"):
+        super().__init__(message)
+        self.response = {"Error": {"Code": "throttlingException", "Message": message}}
+
+
+class FakeAgentRuntime:
+
+    def __init__(self, first_chunk_seconds: float = 0.5, chunk_seconds: float = 0.05,
+                 chunks: int = 20, max_calls_per_second: Optional[int] = None):
+        self.first_chunk_seconds = first_chunk_seconds
+        self.chunk_seconds = chunk_seconds
+        self.chunks = chunks
+        self.max_calls_per_second = max_calls_per_second
+        self.sessions = set()
+        self._calls = deque()
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.throttled = 0
+
+    def _admit(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            while self._calls and now - self._calls[0] >= 1:
+                self._calls.popleft()
+            if self.max_calls_per_second and len(self._calls) >= self.max_calls_per_second:
+                self.throttled += 1
+                raise FakeThrottlingException()
+            self._calls.append(now)
+            self.calls += 1
+
+    def _events(self, text: str, report: Optional[str]) -> Iterator[Dict[str, Any]]:
+        size = -(-len(text) // self.chunks)
+        time.sleep(self.first_chunk_seconds)
+        if report:
+            output = {"text": json.dumps({"trust_score": 87.5, "report": report})}
+            yield {"trace": {"trace": {"orchestrationTrace": {
+                "observation": {"actionGroupInvocationOutput": output}
+            }}}}
+        for i in range(0, len(text), size):
+            if i:
+                time.sleep(self.chunk_seconds)
+            yield {"chunk": {"bytes": text[i:i + size].encode("utf-8")}}
+
+    def invoke_agent(self, agentId: str, agentAliasId: str, sessionId: str, inputText: str,
+                     enableTrace: bool = False, **kwargs) -> Dict[str, Any]:
+        self._admit()
+        with self._lock:
+            self.sessions.add(sessionId)
+        supplier = inputText.split("'")[1] if inputText.count("'") >= 2 else inputText
+        report = (
+            f"Supplier Data Integrity Summary\n\nInput supplier: {supplier}\n\n"
+            f"Certification Summary\n\nCertification Score: 100\n\n"
+            f"Operational Summary\n\nOperational Score: 68.75\n\n"
+            f"Overall Risk Summary\n\nWeighted Trust Score: 87.5\n\n"
+            f"Final risk classification: Low"
+        )
+        narrative = (
+            f"Executive Summary\n\n{supplier} is a low risk supplier.\n\n"
+            f"Recommendations\n\nKeep the current review cycle.\n\n"
+            f"Helpful Links\n\nhttps://en.wikipedia.org/wiki/Supplier_risk_management\n"
+        )
+        # Like the agent: when the caller displays the action group's report
+        # from the trace, the model only writes the narrative.
+        session = (kwargs.get("sessionState") or {}).get("sessionAttributes") or {}
+        text = narrative if session.get("report_display") == "trace" else report + "\n\n" + narrative
+        return {"completion": self._events(text, report if enableTrace else None), "sessionId": sessionId}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--suppliers", type=int, default=8)
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--rate", type=float, default=2.0, help="client token bucket, calls per second")
+    ap.add_argument("--burst", type=int, default=4)
+    ap.add_argument("--quota", type=int, default=3, help="fake service limit, calls per second")
+    args = ap.parse_args()
+
+    suppliers = [f"Supplier {i:03d}" for i in range(args.suppliers)]
+    for concurrency in (1, args.concurrency):
+        runtime = FakeAgentRuntime(max_calls_per_second=args.quota)
+        client = AgentClient(runtime, "fake-agent", "fake-alias", max_concurrency=concurrency,
+                             rate_per_sec=args.rate, burst=args.burst)
+        first = {}
+        start = time.perf_counter()
+
+        def on_chunk(supplier, text):
+            first.setdefault(supplier, time.perf_counter() - start)
+
+        reports = asyncio.run(client.run_reports(suppliers, on_chunk))
+        elapsed = time.perf_counter() - start
+        errors = sum(1 for r in reports if r.error)
+        print(
+            f"concurrency {concurrency:>2} | {len(reports)} reports in {elapsed:6.2f} s | "
+            f"first chunk after {min(first.values()):.2f} s | sessions {len(runtime.sessions)} | "
+            f"throttled {runtime.throttled} | errors {errors}"
+        )
+
+
+if __name__ == "__main__":
+    main()
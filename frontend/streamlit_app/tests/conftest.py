@@ -0,0 +1,13 @@
+"""
+Shared pytest setup. The app directory is the import root, as for
+`streamlit run app.py`.
+
+    cd frontend/streamlit_app && python -m pytest tests
+"""
+
+import os
+import sys
+
+APP_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
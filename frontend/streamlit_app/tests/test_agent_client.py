@@ -0,0 +1,179 @@
+"""
+AgentClient against fake_agent.FakeAgentRuntime: streaming order, the
+concurrency limit and token-bucket pacing.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+import agent_client
+from agent_client import AgentClient, TokenBucket
+from fake_agent import FakeAgentRuntime, FakeThrottlingException
+
+
+def _fast_runtime(**kwargs) -> FakeAgentRuntime:
+    return FakeAgentRuntime(first_chunk_seconds=0.01, chunk_seconds=0.01, chunks=5, **kwargs)
+
+
+def _client(runtime, **kwargs) -> AgentClient:
+    kwargs.setdefault("rate_per_sec", 1000.0)
+    kwargs.setdefault("burst", 1000)
+    return AgentClient(runtime, "fake-agent", "fake-alias", **kwargs)
+
+
+class _CountingRuntime(FakeAgentRuntime):
+    """
+    Records how many event streams are open at once.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.open = 0
+        self.max_open = 0
+        self._open_lock = threading.Lock()
+
+    def invoke_agent(self, **kwargs):
+        resp = super().invoke_agent(**kwargs)
+        with self._open_lock:
+            self.open += 1
+            self.max_open = max(self.max_open, self.open)
+
+        def completion(events):
+            try:
+                yield from events
+            finally:
+                with self._open_lock:
+                    self.open -= 1
+
+        return dict(resp, completion=completion(resp["completion"]))
+
+
+class _ThrottleOnce(FakeAgentRuntime):
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.failed = False
+
+    def invoke_agent(self, **kwargs):
+        if not self.failed:
+            self.failed = True
+            raise FakeThrottlingException()
+        return super().invoke_agent(**kwargs)
+
+
+def test_chunks_stream_in_order_with_report_first():
+    runtime = _fast_runtime()
+    chunks = []
+    reports = asyncio.run(_client(runtime).run_reports(
+        ["Acme"], lambda supplier, text: chunks.append((time.perf_counter(), text))))
+
+    report, = reports
+    assert report.error is None
+    assert report.text == "".join(text for _, text in chunks).strip()
+    assert chunks[0][1].startswith("Supplier Data Integrity Summary")
+    assert "Input supplier: Acme" in chunks[0][1]
+    assert report.text.index("Final risk classification") < report.text.index("Executive Summary")
+    assert report.text.endswith("Supplier_risk_management")
+    assert report.text.count("Supplier Data Integrity Summary") == 1
+    # The narrative arrives in several chunks, spread over time.
+    assert len(chunks) == 1 + runtime.chunks
+    assert chunks[-1][0] - chunks[1][0] >= (runtime.chunks - 1) * runtime.chunk_seconds * 0.9
+
+
+def test_without_report_the_agent_answer_has_the_whole_report():
+    runtime = _fast_runtime()
+    reports = asyncio.run(_client(runtime, with_report=False).run_reports(["Acme"]))
+    assert reports[0].text.startswith("Supplier Data Integrity Summary")
+    assert reports[0].text.count("Supplier Data Integrity Summary") == 1
+    assert "Executive Summary" in reports[0].text
+
+
+def test_reports_keep_input_order_and_get_their_own_sessions():
+    runtime = _fast_runtime()
+    suppliers = [f"Supplier {i}" for i in range(6)]
+    streamed = {}
+    reports = asyncio.run(_client(runtime, max_concurrency=3).run_reports(
+        suppliers, lambda supplier, text: streamed.setdefault(supplier, []).append(text)))
+
+    assert [r.supplier for r in reports] == suppliers
+    for r in reports:
+        assert f"Input supplier: {r.supplier}" in r.text
+        assert r.text == "".join(streamed[r.supplier]).strip()
+    assert len(runtime.sessions) == len(suppliers)
+
+
+@pytest.mark.parametrize("limit", [1, 3])
+def test_concurrency_limit(limit):
+    runtime = _CountingRuntime(first_chunk_seconds=0.05, chunk_seconds=0.01, chunks=3)
+    reports = asyncio.run(_client(runtime, max_concurrency=limit).run_reports(
+        [f"Supplier {i}" for i in range(8)]))
+
+    assert all(r.error is None for r in reports)
+    assert runtime.max_open == limit
+    assert runtime.open == 0
+
+
+def test_token_bucket_paces_after_the_burst(monkeypatch):
+    now = [0.0]
+
+    async def fake_sleep(seconds):
+        now[0] += seconds
+
+    monkeypatch.setattr(agent_client.asyncio, "sleep", fake_sleep)
+    bucket = TokenBucket(rate=2.0, capacity=3, clock=lambda: now[0])
+
+    async def take(n):
+        return [await bucket.acquire() for _ in range(n)]
+
+    waits = asyncio.run(take(5))
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3:] == pytest.approx([0.5, 0.5])
+    assert now[0] == pytest.approx(1.0)
+
+
+def test_token_bucket_drain_drops_the_burst():
+    now = [0.0]
+    bucket = TokenBucket(rate=1.0, capacity=4, clock=lambda: now[0])
+    bucket.drain()
+    assert bucket.tokens == 0
+    now[0] = 2.0
+    bucket._refill()
+    assert bucket.tokens == pytest.approx(2.0)
+
+
+def test_rate_below_the_service_quota_is_never_throttled():
+    runtime = _fast_runtime(max_calls_per_second=5)
+    client = _client(runtime, max_concurrency=6, rate_per_sec=4.0, burst=1)
+    start = time.perf_counter()
+    reports = asyncio.run(client.run_reports([f"Supplier {i}" for i in range(6)]))
+
+    assert all(r.error is None for r in reports)
+    assert runtime.throttled == 0
+    assert client.stats["throttled"] == 0
+    # Six calls at 4/s with no stored burst: five waits of 0.25 s.
+    assert time.perf_counter() - start >= 1.2
+
+
+def test_unpaced_client_is_throttled_by_the_service():
+    runtime = _fast_runtime(max_calls_per_second=2)
+    client = _client(runtime, max_concurrency=6, retries=1)
+    reports = asyncio.run(client.run_reports([f"Supplier {i}" for i in range(6)]))
+
+    assert runtime.throttled == 4
+    assert sum(1 for r in reports if r.error) == 4
+    assert all("Rate exceeded" in r.error for r in reports if r.error)
+
+
+def test_throttling_before_the_first_chunk_is_retried():
+    runtime = _ThrottleOnce(first_chunk_seconds=0.01, chunk_seconds=0.0, chunks=2)
+    client = _client(runtime, rate_per_sec=100.0, burst=4)
+    text = asyncio.run(client.ask("Run Supplier360 risk analysis for supplier 'Acme'."))
+
+    assert "Input supplier: Acme" in text
+    assert client.stats["calls"] == 2
+    assert client.stats["throttled"] == 1
+    # The throttling error emptied the bucket, so the retry waited for a token.
+    assert client.stats["wait_seconds"] > 0